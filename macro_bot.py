@@ -6,16 +6,505 @@ import random
 import time
 import re
 import aiohttp
+import hashlib
 import json
 import subprocess
 import sys
 from datetime import datetime, timedelta
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from dotenv import load_dotenv
 import os
+import logging
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from functools import lru_cache
+from types import MappingProxyType
+from contextlib import asynccontextmanager
+from collections import deque, Counter
+from difflib import SequenceMatcher
 
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
+# 질문형 게시글 판별용 표시어 (본문을 한 번만 훑도록 하나의 정규식으로 묶음, 반각/전각 물음표 모두 포함)
+# "몇시쯤"은 "몇시"에 포함되므로 따로 두지 않음
+_QUESTION_RE = re.compile(r'[?？]|어떻게|뭐가|어떤|언제|어디|누가|왜|몇시')
+# 정리까지 마친 AI 댓글의 최종 금지 단어 ("감사")
+_FINAL_FORBIDDEN_RE = re.compile(r'감사')
+# 댓글이 완전한 문장(어미)으로 끝나는지 확인할 어미 목록 (str.endswith용, 긴 어미 우선)
+_COMMENT_ENDINGS = ('네요', '어요', '해요', '되요', '다요', '세요', '까요', '나요', '지요',
+                    '요', '죠', '다', '어', '해', '되', '까', '나', '세', '지', '야')
+# "~입니다" 체를 "~요" 체로 바꾸는 패턴 (뒤따르는 마침표/느낌표까지 한 번에 처리)
+_IPNIDA_RE = re.compile(r'입니다[.!]?')
+# 연속된 물결표/느낌표 ("~~~" → "~", "!!" → "!")
+_REPEATED_TILDE_BANG_RE = re.compile(r'([~!])\1+')
+# 429 응답에서 할당량 초과 여부 확인 (대소문자 무시, 한 번의 스캔)
+_QUOTA_RE = re.compile(r'quota|exceeded', re.IGNORECASE)
+# 재시도 스트리밍 응답에서 "댓글:" 줄이 끝났는지 확인 (이후 출력은 파싱에 쓰지 않으므로 여기서 수신 중단)
+_STREAM_COMMENT_DONE_RE = re.compile(r'댓글:[^\n]*\S[^\n]*\n')
+# 'ㅎㅎ', 'ㅋㅋ', 기호 등 의미 없는 문자
+_MEANINGLESS_CHARS_RE = re.compile(r'[ㅎㅋ~!?\s\.\,\-_\^\*]+')
+# 짧은 본문이 의미 없는지 판단할 때 세는 문자
+_MEANINGLESS_POST_CHARS = 'ㅎㅋㅠㅜ.'
+# 존댓말 어미 패턴
+_HONORIFIC_ENDING_RE = re.compile(r'(요|세요|네요|어요|해요|되요|다요|까요|나요|지요)$')
+# 길이 제한 시 보존할 어미 패턴
+_TRIM_ENDING_RE = re.compile(r'(요|죠|네요|어요|해요|되요|다요|세요|까요|나요|지요|다|어|해|되|까|나|세|지|야)$')
+# 오타 변형 대상 어미 ("네요"처럼 앞 글자가 있으면 함께 매칭, 없으면 "요"만)
+_TYPO_ENDING_RE = re.compile(r'(네|어|해|되|다|까|나|세|지)?요$')
+# 게시판 목록의 게시글 링크 (게시글 번호 뒤에는 쿼리/앵커만 허용)와 작성 시간 형식
+_FREE_BOARD_POST_RE = re.compile(r'/bbs/free/\d+(?:[?#]|$)')
+_TIME_HHMM_RE = re.compile(r'^\d{1,2}:\d{2}$')
+_DATE_MMDD_RE = re.compile(r'^\d{2}-\d{2}$')
+_DATETIME_YYMMDD_RE = re.compile(r'^\d{2}-\d{2}-\d{2}\s+\d{1,2}:\d{2}')
+# 게시글 HTML의 작성일 영역(class에 if_date 포함)과 "25-11-26 13:22" / "25-11-26" 형식 날짜
+_POST_DATE_AREA_RE = re.compile(r'class="[^"]*\bif_date\b[^"]*"[^>]*>(.*?)</strong', re.S)
+_POST_DATE_TEXT_RE = re.compile(r'(\d{2}-\d{2}-\d{2})(?:\s+(\d{1,2}:\d{2}))?')
+# 상대 시간 표기 ("5분 전", "3시간 전", "2일 전", "1주 전")와 단위별 timedelta 인자
+_RELATIVE_TIME_RE = re.compile(r'(\d+)(분|시간|일|주)\s*전')
+_RELATIVE_TIME_UNITS = {'분': 'minutes', '시간': 'hours', '일': 'days', '주': 'weeks'}
+# 게시글 작성 시간 형식: "25-11-26 13:22", "2025.11.26 13:22:00", "2025/11/26" 등 (연도 2자리/4자리)
+_POST_DATETIME_RE = re.compile(
+    r'^(\d{4}|\d{2})([-./])(\d{1,2})\2(\d{1,2})(?:\s+(\d{1,2}):(\d{2})(?::(\d{2}))?)?$'
+)
+# 정규식으로 처리하지 못한 경우에만 시도하는 형식
+_POST_DATE_FORMATS = (
+    '%y-%m-%d %H:%M',           # oncapan.com 형식: "25-11-26 13:22" (우선순위 1)
+    '%y-%m-%d %H:%M:%S',        # oncapan.com 형식: "25-11-26 13:22:00"
+    '%Y-%m-%d %H:%M:%S',        # 표준 형식: "2025-11-26 13:22:00"
+    '%Y-%m-%d %H:%M',           # 표준 형식: "2025-11-26 13:22"
+    '%Y.%m.%d %H:%M',           # 점 구분: "2025.11.26 13:22"
+    '%Y/%m/%d %H:%M',           # 슬래시 구분: "2025/11/26 13:22"
+    '%y-%m-%d',                 # oncapan.com 날짜만: "25-11-26"
+    '%Y-%m-%d',                 # 표준 날짜만: "2025-11-26"
+)
+# 댓글 스타일 분석용 단어 (한글/영문 2-5글자)
+_STYLE_WORD_RE = re.compile(r'[가-힣]{2,5}|[a-zA-Z]{2,5}')
+
+# 키워드 추출용 패턴/제외 단어 (조사, 접속사, 일반적인 단어)
+_NON_KEYWORD_CHAR_RE = re.compile(r'[^가-힣a-zA-Z0-9\s]')
+# 한글이 한 글자 이상 들어간 2~5글자 단어 (특수문자 제거 후 공백으로 구분된 단어 단위)
+_KEYWORD_CANDIDATE_RE = re.compile(r'(?<!\S)(?=[a-zA-Z0-9]*[가-힣])[가-힣a-zA-Z0-9]{2,5}(?!\S)')
+_KEYWORD_STOP_WORDS = frozenset({
+    '그리고', '그런데', '하지만', '그래서', '그러나', '그런', '이런', '저런',
+    '이것', '그것', '저것', '이거', '그거', '저거',
+    '오늘', '어제', '내일', '지금', '그때', '이때',
+    '있어', '없어', '하는', '하는데', '해서', '하고',
+    '좋아', '나쁘', '많이', '조금', '너무', '정말',
+    '뭐', '어떤', '어떻게', '언제', '어디', '누가', '왜',
+    '것', '거', '게', '건', '걸'
+})
+# 도박 커뮤니티 특수 용어 (겹치는 위치도 찾도록 lookahead로 한 번에 스캔)
+_COMMUNITY_TERMS = (
+    '노돌', '노발', '댓노', '포거래', '텅장', '역배', '정배', '환전', '먹튀', '페이백',
+    '야식쿱', '깡', '픽', '슬롯', '바카라', '포바', '부주력', '몰빵', '똥배', '정형'
+)
+_COMMUNITY_TERMS_RE = re.compile('(?=(' + '|'.join(re.escape(t.lower()) for t in _COMMUNITY_TERMS) + '))')
+# AI가 만든 형식적인 댓글 표현 (하나라도 포함되면 재요청, 대소문자 무시하고 한 번의 스캔으로 확인)
+_FORMAL_COMMENTS = (
+    '좋은 글 감사합니다', '좋은 정보 감사합니다', '유용한 정보네요', '유용한 정보 감사합니다',
+    '잘 읽었습니다', '도움이 되었어요', '도움이 됐어요', '도움이 되었습니다',
+    '감사합니다', '감사해요', '감사', '좋은 글', '유용한 정보',
+)
+_FORMAL_COMMENT_RE = re.compile('|'.join(re.escape(t) for t in _FORMAL_COMMENTS), re.IGNORECASE)
+
+# 댓글 정리 파이프라인 (컴파일된 패턴, 치환 문자열) - 순서대로 적용
+_DUP_ENDING_PIPELINE = [
+    # "요요(요...)" -> "요", "네요요" -> "네요", "죠요(요...)" -> "죠" 를 한 번의 스캔으로 처리
+    (re.compile(r'(요|죠)요+'), r'\1'),
+]
+# 어미 뒤에 추가 어미가 붙는 경우 제거 (예: "노곤하죠여?" -> "노곤하죠?", 여러 번 겹친 경우도 한 번에)
+_STACKED_ENDING_PIPELINE = [
+    (re.compile(r'(죠|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)(?:여|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)+(\?|$)'), r'\1\2'),
+]
+_WHITESPACE_PIPELINE = [
+    (re.compile(r'\s+'), ' '),
+]
+_CLEAN_SYMBOL_PIPELINE = [
+    (re.compile(r'[~]{3,}'), '~'),  # ~~~ 이상은 ~로
+    (re.compile(r'[!]{3,}'), '!'),  # !!! 이상은 !로
+    (re.compile(r'[ㅠ]{3,}'), 'ㅠㅠ'),  # ㅠㅠㅠ 이상은 ㅠㅠ로
+    (re.compile(r'[ㅎㅋ]{2,}'), ''),  # ㅎㅋ 이모티콘 제거
+]
+# 모든 마침표 제거용 변환 표 (정규식 대신 str.translate로 한 번에 삭제)
+_PERIOD_DELETE_TABLE = str.maketrans('', '', '.')
+_CLEAN_ENDING_PIPELINE = [
+    (re.compile(r'(\S+)용$'), r'\1요'),  # 끝에 있는 "용" -> "요"
+    (re.compile(r'(\S+)용\s'), r'\1요 '),  # 중간에 있는 "용" -> "요"
+] + _STACKED_ENDING_PIPELINE + [
+    # 떨어진 "요"를 앞 단어에 붙임 ("화이팅 요" -> "화이팅요"), 이때 생긴 "요요"는 바로 다음 중복 어미 정리에서 처리
+    # ("힘내요 요" -> "힘내요요" -> "힘내요"), "요"로 시작하는 다음 단어("요즘", "요리")는 건드리지 않도록 "요"만으로 된 단어("요", "요요")만 대상
+    (re.compile(r'\s+요(?=요*(?:$|\s|[~!?ㅠㅜ]))'), '요'),
+] + _DUP_ENDING_PIPELINE + _WHITESPACE_PIPELINE
+_FINAL_CLEAN_PIPELINE = _DUP_ENDING_PIPELINE + _STACKED_ENDING_PIPELINE + _WHITESPACE_PIPELINE
+# 정리 규칙이 하나라도 적용될 수 있는지 미리 확인하는 패턴 (일치하지 않으면 정리 생략)
+_NEEDS_FINAL_CLEAN_RE = re.compile(r'[죠요][여요네어해되다야까나세지]|\s{2}|[^\S ]|^\s|\s$')
+_NEEDS_CLEAN_RE = re.compile(
+    r'~~~|!!!|ㅠㅠㅠ|[ㅎㅋ]{2}|\.|\?(?!$)|\S용(?:\s|$)|\s요|' + _NEEDS_FINAL_CLEAN_RE.pattern
+)
+
+
+def _parse_post_datetime(date_text: str):
+    """게시글 작성 시간 문자열을 datetime으로 변환 (형식을 알 수 없으면 None)"""
+    date_text = date_text.strip()
+    match = _POST_DATETIME_RE.match(date_text)
+    if match:
+        year = int(match.group(1))
+        if year < 100:
+            # 2자리 연도(YY)는 2000년대로 간주
+            year += 2000
+        try:
+            return datetime(year, int(match.group(3)), int(match.group(4)),
+                            int(match.group(5) or 0), int(match.group(6) or 0), int(match.group(7) or 0))
+        except ValueError:
+            return None
+    
+    for fmt in _POST_DATE_FORMATS:
+        try:
+            parsed_date = datetime.strptime(date_text, fmt)
+        except ValueError:
+            continue
+        # 2자리 연도(YY)인 경우 2000년대로 변환
+        if fmt.startswith('%y') and parsed_date.year < 2000:
+            parsed_date = parsed_date.replace(year=parsed_date.year + 100)
+        return parsed_date
+    
+    # 상대 시간 파싱 (예: "1시간 전", "2일 전")
+    match = _RELATIVE_TIME_RE.search(date_text)
+    if match:
+        unit = _RELATIVE_TIME_UNITS[match.group(2)]
+        return datetime.now() - timedelta(**{unit: int(match.group(1))})
+    return None
+
+
+def _apply_pipeline(text: str, pipeline: list) -> str:
+    """정리 파이프라인의 패턴을 순서대로 적용"""
+    for pattern, repl in pipeline:
+        text = pattern.sub(repl, text)
+    return text
+
+# 봇 탐지 방지를 위한 User-Agent
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# 본문/댓글 감정 판별용 키워드 (한 번의 정규식 검색으로 확인)
+_NEG_CONTENT_RE = re.compile('|'.join(map(re.escape, [
+    '잃', '망', '눈물', '울', '아쉽', '후회', '슬프', 'ㅠ', 'ㅜ', '손실', '적자', '좌절', '힘들'
+])))
+_POS_COMMENT_RE = re.compile('|'.join(map(re.escape, [
+    '화이팅', '좋아', '대박', '축하', '부럽', '좋네', '좋다', '멋져', '최고', '응원', '파이팅',
+    '와', '헐', '진짜', '개좋', '짱', '허걱', '와우'
+])))
+_NEG_COMMENT_RE = re.compile('|'.join(map(re.escape, ['아쉽', '슬프', '힘들', '후회', '아깝', '위로', '공감'])))
+
+# 기존 댓글이 없을 때 쓰는 기본 댓글 (본문이 손실/수익 내용이면 그에 맞는 목록 사용)
+_BASE_COMMENTS_NEUTRAL = ('힘내', '아쉽', '공감', '위로', '좋아', '응원', '화이팅', '다음엔', '조심', '축하', '부럽', '대박')
+_BASE_COMMENTS_LOSS = ('힘내', '아쉽', '공감', '위로', '다음엔', '조심')
+_BASE_COMMENTS_WIN = ('축하', '부럽', '대박', '좋아', '응원')
+_LOSS_KEYWORDS = ('잃', '후회', '참담', '정신차리', '못하겠')
+_WIN_KEYWORDS = ('땄', '성공', '이득', '좋아')
+
+# 댓글 스타일 분석 시 집계하는 끝말 (모두 한 글자)
+_STYLE_ENDING_CHARS = frozenset('요죠다어해야')
+
+# 댓글 끝에 붙일 특수 기호 표: (존댓말 어미 여부, 감정) -> (후보 목록, 10글자 초과 시 끝부분 덮어쓰기 여부)
+_TONE_SUFFIX_TABLE = {
+    (True, 'neg'): (('ㅠ',), False),
+    (True, 'pos'): (('!',), False),
+    (True, 'neu'): (('~',), False),
+    (False, 'neg'): (('ㅠ', 'ㅠㅠ'), True),
+    (False, 'pos'): (('!',), False),
+    (False, 'neu'): (('~', '~', '!'), True),  # 젊은층은 물결표를 더 선호 (확률 2배)
+}
+
+
+def _append_clamped(text: str, suffix: str, limit: int, overwrite: bool = False) -> str:
+    """길이 제한을 지키며 특수 기호 붙이기 (넘치면 잘라서 붙이고, overwrite면 끝부분을 바꿔 끼움)"""
+    if len(text) + len(suffix) <= limit:
+        return text + suffix
+    if len(text) < limit:
+        return (text + suffix)[:limit]
+    if overwrite:
+        return text[:-len(suffix)] + suffix
+    return text
+
+
+def _trim_keep_ending(comment: str, limit: int = 10, warn: bool = False) -> str:
+    """길이 제한을 넘는 댓글 자르기 (어미와 끝의 특수 기호는 보존, 어미가 없으면 앞에서부터 자르기)"""
+    if len(comment) <= limit:
+        return comment
+    # 어미가 있는지 확인 (요, 네요, 어요, 해요, 되요, 다요, 세요, 까요, 나요, 지요, 죠, 다, 어, 해, 되, 까, 나, 세, 지, 야 등)
+    comment_clean = comment.rstrip('~!?ㅠㅜㅎㅋ').strip()
+    if not comment_clean.endswith(_COMMENT_ENDINGS):
+        if warn:
+            print(f"[경고] 댓글이 완전한 문장으로 끝맺어지지 않습니다: '{comment}' (길이: {len(comment)}자)")
+        return comment[:limit]
+    ending_match = _TRIM_ENDING_RE.search(comment_clean)
+    if not ending_match:
+        return comment
+    ending = ending_match.group(1)
+    special_suffix = comment[len(comment_clean):]  # ~, !, ㅠ 등
+    # 앞부분만 자르기 (어미 + 특수기호 제외), 어미 + 특수기호가 제한을 넘으면 어미만 보존
+    max_body_length = limit - len(ending) - len(special_suffix)
+    if max_body_length > 0:
+        return comment_clean[:-len(ending)][:max_body_length] + ending + special_suffix
+    return ending + special_suffix
+
+
+# 페이지 로드 시 차단할 리소스 (이미지/폰트/동영상, 광고·분석 스크립트)
+_BLOCKED_RESOURCE_GLOB = '**/*.{png,jpg,jpeg,gif,webp,svg,ico,woff,woff2,ttf,otf,mp4,webm}'
+_BLOCKED_TRACKER_RE = re.compile(r'googletagmanager|google-analytics|doubleclick|facebook\.net|hotjar')
+
+
+def _strip_query_fragment(url: str) -> str:
+    """URL에서 쿼리(?)와 앵커(#) 부분 제거 (중간 리스트를 만들지 않고 한 번에 자르기)"""
+    end = len(url)
+    for ch in '?#':
+        i = url.find(ch, 0, end)
+        if i != -1:
+            end = i
+    return url[:end]
+
+
+# OpenAI 채팅 API 주소 (타임아웃/헤더는 공용 세션에서 지정)
+_OPENAI_CHAT_URL = 'https://api.openai.com/v1/chat/completions'
+# 일시적인 오류(요청 한도 429, 서버 오류 5xx, 연결 오류)일 때 지수 백오프로 다시 보내는 횟수/대기 시간
+_OPENAI_MAX_ATTEMPTS = 3
+_OPENAI_RETRY_BASE_DELAY = 0.5
+_OPENAI_RETRY_MAX_DELAY = 8.0
+_OPENAI_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# 동시에 진행할 수 있는 OpenAI 요청 수 상한 (재시도/재생성이 겹쳐도 요청 한도를 넘기지 않도록)
+_OPENAI_MAX_CONCURRENCY = 3
+# OpenAI 세션 타임아웃 (한 번만 생성): 연결 단계는 짧게 끊어서 재시도로 넘기고, 응답 대기는 넉넉하게
+_OPENAI_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_connect=5, sock_read=12)
+# 같은 본문 + 같은 최근 댓글에 대해 만든 AI 댓글을 재사용하는 시간 (초)
+_AI_COMMENT_CACHE_TTL = 6 * 3600
+# 확인한 게시글 작성 시간을 재사용하는 시간 (초, 찾은 경우 / 못 찾은 경우)
+_POST_DATE_CACHE_TTL = 600
+_POST_DATE_MISS_TTL = 30
+# 게시판 목록에서 작성 시간을 모르는 게시글을 HTML로 확인할 때 한 번에 요청하는 개수 (봇 탐지 방지를 위해 조금씩)
+_POST_VERIFY_BATCH = 2
+# 프롬프트에 넣는 본문 앞부분 길이 (글자 수, 첫 요청과 재시도에서 같은 값 사용)
+_POST_EXCERPT_CHARS = 500
+
+
+def _compact_json_dumps(obj) -> str:
+    """OpenAI 요청 본문 직렬화 (한글을 \\uXXXX로 이스케이프하지 않고 공백 없이 만들어 전송량 절감)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+# 재시도용 프롬프트 템플릿 (정적 지시문은 한 번만 만들고 동적 값만 채움)
+_RETRY_PROMPT_TEMPLATE = """다음 게시글 본문을 읽고, 작성자의 감정에 공감하는 댓글을 작성해주세요.
+
+⚠️ 중요: 이 게시판은 도박 관련 사이트의 자유게시판입니다.
+- 도박 얘기뿐만 아니라 일상 수다도 올라오며, 주제와 상관없이 본문 내용과 기존 댓글 흐름에 맞춰 작성합니다
+- 댓글은 페이스북, 네이버 등 일반 커뮤니티와 똑같은 스타일로 작성합니다
+
+🎯 핵심 원칙 (우선순위 순 - 반드시 이 순서로 진행, 생각만 하고 출력하지 말 것):
+1. ⭐⭐⭐ 가장 중요: 기존 댓글들을 먼저 분석하세요! (본문보다 우선!)
+   - 말투(존댓말/반말, 어미 패턴), 스타일, 길이, 감정선을 정확히 파악하고 최대한 비슷하게 작성
+   - 본문 말투가 달라도 기존 댓글 말투를 따름
+2. 본문은 참고용으로만 사용 (핵심 키워드만 선택적으로 활용)
+3. 특수 기호(~, !, ㅠ 등)는 기존 댓글들이 사용할 때만 사용
+4. 마침표(.)와 "용" 어미 절대 사용 금지
+5. 질문형 게시글: 답을 모르면 댓글 작성하지 않음
+6. 반드시 {max_comment_length}글자 이내로 완성 (기본 10글자)
+
+금지어: 좋은글/유용한정보/잘읽었습니다/도움이/감사 ("감사"가 포함된 모든 댓글 금지)
+
+반드시 해야 할 것:
+- 작성자의 톤과 감정에 맞춰 작성 (편한 글 → 캐주얼하게, 형식적인 글 → 형식적으로, 시답잖은 소리 → 그냥 맞춰주기)
+- 기분 좋은 글이면 담담하게 축하하고, 힘든 글이면 현실적인 톤(예: "아 지치네요", "버텨야죠")도 괜찮음
+- 맞춤법을 정확하게, ~요 체와 반말체를 적절히 섞어서 사용
+최종 출력은 댓글 한 줄만 해야 하며, 다른 문장은 포함하면 안 됩니다.
+
+{comments_priority_text}{context_block}{length_instruction}
+
+게시글 본문:
+{post_content}{comments_text}
+
+댓글:"""
+
+
+# AI 시스템 프롬프트 (첫 요청과 재시도 공용, 최대 길이만 채워서 사용)
+_SYSTEM_PROMPT_TEMPLATE = (
+    "당신은 도박 관련 사이트의 자유게시판에서 게시글 작성자의 톤과 내용에 맞춰 친근하지만 자연스러운 댓글을 작성하는 도우미입니다. "
+    "자유게시판이므로 도박 관련 얘기뿐만 아니라 일상 수다도 올라올 수 있습니다. 페이스북, 네이버 등 일반 커뮤니티와 똑같은 스타일로 댓글을 작성해야 합니다. "
+    "가장 중요한 것은: 1) ⭐ 기존 댓글들이 사용하는 핵심 단어/표현을 그대로 사용하세요. 예: 기존 댓글에 \"아이구\", \"에고\"가 있으면 당신도 \"아이고\", \"아이구\" 같은 표현 사용. "
+    "2) 기존 댓글들의 스타일을 우선적으로 분석하고 그에 맞춰 작성하세요. 기존 댓글들이 특수 기호(~, !, ㅠ 등)를 사용한다면 당신도 사용하고, 사용하지 않는다면 사용하지 마세요. "
+    "3) 본문의 말투를 정확히 분석하는 것입니다 (본문이 \"~할까요?\" 같은 존댓말이면 댓글도 \"~요\", \"~네요\" 같은 높임말 사용, 본문이 반말이면 댓글도 반말 사용). "
+    "4) 본문의 핵심 키워드를 추출하여 댓글에 자연스럽게 활용하세요 (예: 본문에 \"야식\"이 있으면 \"야식 좋지요\"처럼 키워드를 포함). "
+    "5) 질문형 게시글에서 답을 모르면 댓글을 작성하지 마세요. "
+    "6) 반드시 {max_comment_length}글자 이내로 완성하고, 맞춤법을 정확하게 사용하세요. "
+    "7) 절대 \"감사합니다\", \"감사해요\", \"감사\" 같은 단어를 사용하지 말고, 형식적인 댓글을 사용하지 마세요. "
+    "8) 기존 댓글들이 말하는 핵심 내용과 키워드를 벗어나지 말고, 말투만 자연스럽게 바꿔 표현하세요. 새로운 정보나 다른 주제를 추가하지 마세요. "
+    "9) ⚠️⚠️⚠️ 반드시 \"이유:\"와 \"댓글:\" 두 줄로 출력하세요. 댓글만 출력하면 안 됩니다! "
+    "10) ⚠️⚠️⚠️ \"이유:\" 필드에는 반드시 논리적인 이유를 작성하세요. 예: \"기존 댓글들이 '아이구', '에고' 같은 공감 표현을 사용하므로 비슷한 공감 표현으로 작성\" 또는 \"기존 댓글들이 '천포', '냠냠' 같은 단어를 사용하므로 동일한 단어를 활용\" 등. 절대 \"이유 없음\"이라고 작성하지 마세요! "
+    "11) ⚠️⚠️⚠️ 댓글은 반드시 완전한 문장으로 끝맺어야 합니다. 예: \"밖에 엄청\" ❌ → \"밖에 엄청 추워요\" ✅, \"한번씩 하시\" ❌ → \"한번씩 하시네요\" ✅. 댓글이 중간에 끊기거나 어눌하게 끝나면 안 됩니다!"
+)
+
+
+# 게시글 제목 선택자 (oncapan.com 구조 반영, 우선순위 순)
+_POST_TITLE_SELECTORS = (
+    'span.bo_v_tit',            # oncapan.com 제목 (우선순위 1)
+    '#bo_v .bo_v_tit',          # oncapan.com 제목 (우선순위 2)
+    '#bo_v_atc .bo_v_tit',      # 그누보드 제목
+    '#bo_v_title .bo_v_tit',    # 그누보드 제목 변형
+    'h2#bo_v_title .bo_v_tit',  # 그누보드 제목 변형 2
+    '.view_title',              # 일반적인 제목
+    '.board_title',             # 게시판 제목
+    'h1',                       # HTML5 h1 태그
+    'h2',                       # HTML5 h2 태그
+    '.title',                   # title 클래스
+    '#title',                   # title ID
+    '[class*="title"]',         # title이 포함된 클래스
+    '[id*="title"]',            # title이 포함된 ID
+    '.subject',                 # subject 클래스
+    '#subject',                 # subject ID
+)
+
+# 게시글 본문 선택자 (oncapan.com 및 일반적인 선택자들, 우선순위 순)
+_POST_CONTENT_SELECTORS = (
+    '#bo_v_con',           # 그누보드 기본 본문 영역
+    '.view_content',       # 일반적인 본문 영역
+    '.board_content',      # 게시판 본문
+    '.wr_content',         # 그누보드 본문
+    '#wr_content',         # 그누보드 본문 ID
+    '.content',             # 일반적인 content 클래스
+    'article',              # HTML5 article 태그
+    '[class*="content"]',  # content가 포함된 클래스
+    '[id*="content"]',      # content가 포함된 ID
+    '[class*="view"]',      # view가 포함된 클래스
+    '[id*="view"]',         # view가 포함된 ID
+)
+
+# 댓글 입력 필드 후보 선택자 (우선순위 순, 설정 선택자는 실행 시 4번째에 삽입)
+_COMMENT_INPUT_SELECTORS = (
+    # 실제 사이트의 정확한 선택자 (최우선)
+    'textarea[name="wr_content"]',
+    'textarea#wr_content',
+    'textarea.wr_content',
+    # 일반적인 댓글 필드 선택자
+    'textarea[name="comment"]',
+    'textarea[id*="comment"]',
+    'textarea[id*="reply"]',
+    'textarea[name*="comment"]',
+    'textarea[name*="reply"]',
+    'textarea[name*="content"]',  # wr_content도 매칭됨
+    'textarea.comment',
+    'textarea#comment',
+    'textarea#reply',
+    'textarea[placeholder*="댓글"]',
+    'textarea[placeholder*="comment"]',
+    'textarea[placeholder*="reply"]',
+    # 폴백 선택자
+    'textarea',
+    'input[name="comment"]',
+    'input[id*="comment"]',
+    'input[type="text"][name*="comment"]',
+    'input[type="text"][id*="comment"]',
+    'div[contenteditable="true"]',  # contenteditable div
+    'div[contenteditable="true"][id*="comment"]',
+    'div[contenteditable="true"][class*="comment"]',
+)
+
+# 댓글 등록 버튼 후보 선택자 (우선순위 순, 설정 선택자는 실행 시 맨 앞에 삽입)
+_SUBMIT_BUTTON_SELECTORS = (
+    '#btn_submit',
+    'input#btn_submit',
+    'button#btn_submit',
+    'input.btn_submit',
+    'button.btn_submit',
+    'input[type="submit"]',
+    'button[type="submit"]',
+    'input[value*="등록"]',
+    'input[value*="댓글"]',
+    'button:has-text("등록")',
+    'button:has-text("댓글")',
+    'input[value="댓글등록"]',
+    'input[value="등록"]',
+    'button[value*="등록"]',
+    'a.btn_submit',
+    'a:has-text("등록")',
+)
+
+# SUBMIT_BUTTON_SELECTOR를 지정하지 않았을 때 쓰는 기본 등록 버튼 선택자 (load_config에서 사용)
+_DEFAULT_SUBMIT_BUTTON_SELECTOR = 'input#btn_submit, #btn_submit, input.btn_submit, button.btn_submit, button[type="submit"], input[type="submit"]'
+
+# 로그인된 상태에서만 보이는 요소 (로그아웃 링크, 그누보드 로그인 후 회원 정보 박스)
+_LOGGED_IN_SELECTOR = 'a[href*="logout"], #ol_after'
+
+# 댓글 작성 시 반복 사용하는 JS 헬퍼 (페이지마다 한 번만 등록하고 window.__kasino로 호출)
+_KASINO_JS_HELPERS = """
+window.__kasino = {
+    // 숨겨진 요소를 강제로 보이게 만들기
+    forceVisible(el) {
+        el.style.display = 'block';
+        el.style.visibility = 'visible';
+        el.style.opacity = '1';
+    },
+    // 입력 필드에 값을 넣고 input/change 이벤트 발생
+    setValue(el, text) {
+        if (el.isContentEditable) {
+            el.innerText = text;
+        } else {
+            el.value = text;
+        }
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    },
+    // 버튼이 disabled면 해제하고 원래 disabled였는지 반환
+    enableButton(btn) {
+        const disabled = !!btn.disabled;
+        if (disabled) btn.disabled = false;
+        return disabled;
+    },
+    // 버튼이 속한 폼을 직접 제출 (폼이 없으면 submit 버튼 클릭)
+    forceSubmit(btn) {
+        btn.disabled = false;
+        const form = btn.closest('form');
+        if (form) {
+            form.submit();
+            return 'form_submitted';
+        } else if (btn.type === 'submit') {
+            btn.click();
+            return 'clicked';
+        }
+        return 'failed';
+    },
+    // 입력 필드가 속한 폼 제출
+    submitForm(input) {
+        const form = input.closest('form');
+        if (form) form.submit();
+    }
+};
+"""
+
+# 디버깅용 댓글 섹션 추출 패턴 (form 태그를 못 찾았을 때만 사용)
+_COMMENT_SECTION_RE = re.compile(r'(?is)<form[^>]*>.*?</form>|<div[^>]*(?:comment|reply|댓글)[^>]*>.*?</div>')
+
+# Playwright 전용 문법(:has-text, text= 등)은 브라우저 CSS로 처리할 수 없어 복합 선택자에서 제외
+_PLAYWRIGHT_ONLY_SELECTOR_RE = re.compile(r':has-text\(|:text\(|>>|^[a-z_-]+=')
+
+
+def _split_selectors(selectors) -> tuple:
+    """선택자 목록을 (CSS 선택자, Playwright 전용 선택자)로 분리 (중복 제거, 순서 유지)"""
+    css, playwright_only = [], []
+    for selector in dict.fromkeys(s for s in selectors if s):
+        (playwright_only if _PLAYWRIGHT_ONLY_SELECTOR_RE.search(selector) else css).append(selector)
+    return css, playwright_only
+
+# 브라우저 실행 확인이 끝났음을 기록하는 파일 (Playwright 버전이 바뀌면 다시 확인)
+_PW_VERIFIED_FILE = '.pw_verified'
+
+
+def _playwright_version() -> str:
+    """설치된 Playwright 패키지 버전 (확인 불가 시 빈 문자열)"""
+    try:
+        from importlib.metadata import version
+        return version('playwright')
+    except Exception:
+        return ''
+
 
 def ensure_playwright_browser():
     """Playwright 브라우저가 설치되어 있는지 확인하고 없으면 자동 설치"""
@@ -26,6 +515,16 @@ def ensure_playwright_browser():
     if is_frozen:
         return False
     
+    # 이전 실행에서 같은 버전으로 브라우저 실행을 확인했으면 다시 띄워보지 않음
+    pw_version = _playwright_version()
+    if pw_version:
+        try:
+            with open(_PW_VERIFIED_FILE, 'r', encoding='utf-8') as f:
+                if f.read().strip() == pw_version:
+                    return True
+        except OSError:
+            pass
+    
     try:
         # 브라우저가 설치되어 있는지 확인
         from playwright.sync_api import sync_playwright
@@ -36,6 +535,12 @@ def ensure_playwright_browser():
                 try:
                     browser = p.chromium.launch(headless=True)
                     browser.close()
+                    if pw_version:
+                        try:
+                            with open(_PW_VERIFIED_FILE, 'w', encoding='utf-8') as f:
+                                f.write(pw_version)
+                        except OSError:
+                            pass
                     return True
                 except Exception as launch_error:
                     # 브라우저 실행 실패 - Python 스크립트인 경우 설치 시도
@@ -58,14 +563,12 @@ def ensure_playwright_browser():
         print("      (이 작업은 몇 분 정도 걸릴 수 있습니다)")
         print()
                 
-        # playwright install chromium 실행
+        # playwright install chromium 실행 (출력은 터미널로 바로 보내 진행 상황을 표시하고 메모리에 쌓지 않음)
         try:
-            result = subprocess.run(
+            subprocess.run(
                 [sys.executable, "-m", "playwright", "install", "chromium"],
                 check=True,
-                timeout=600,  # 10분 타임아웃
-                capture_output=True,
-                text=True
+                timeout=600  # 10분 타임아웃
             )
             
             print("[완료] 브라우저 설치가 완료되었습니다!")
@@ -143,20 +646,52 @@ class MacroBot:
         """
         self.config = config
         self.browser: Browser = None
+        self.context: BrowserContext = None  # 브라우저 재시작 없이 교체 가능한 컨텍스트
         self.page: Page = None
         self.playwright = None
         self.commented_posts_file = 'commented_posts.txt'  # 댓글 작성한 게시글 목록 파일
         self.commented_posts = self.load_commented_posts()  # 이미 댓글 작성한 게시글 목록
+        self._commented_fp = None  # 게시글 목록 파일 핸들 (첫 저장 시 append 모드로 한 번만 열기)
         self.main_page = None  # 원본 Page 객체 (iframe 사용 시 구분)
         self.current_page = 1  # 현재 보고 있는 게시판 페이지
         self.page_direction = 1  # 1: 다음 페이지로, -1: 이전 페이지로 이동
-        self.comment_history = []  # (comment_text, timestamp)
+        self.comment_history = deque()  # (comment_text, timestamp) - 오래된 순 (최대 256개)
+        self._comment_last_used = {}  # comment_text -> 마지막 사용 시각 (O(1) 조회용)
         self.last_comment_time = None
         self.min_repeat_interval = self.config.get('min_repeat_interval_sec', 900)
         self.max_delay_seconds = 10  # 최대 랜덤 대기 제한
+        # 댓글 1개당 누적 랜덤 대기 상한 (0이면 제한 없음), write_comment 실행 중에만 누적하고 그 밖의 대기(게시글 간 대기 등)에는 적용 안 함
+        self.max_comment_delay_seconds = config.get('max_comment_delay', 0)
+        self._delay_spent = None
+        # random_delay 기본값 (매 호출마다 설정 dict를 조회하지 않도록 한 번만 읽어둠)
+        self._delay_min = config.get('delay_min', 1)
+        self._delay_max = config.get('delay_max', 3)
+        # DELAY_MAX를 0 이하로 설정하면 모든 랜덤 대기를 건너뜀 (테스트/점검용)
+        self._zero_delay = self._delay_max <= 0
+        # LOG_LEVEL이 DEBUG일 때만 대기 로그 출력
+        self._verbose = str(config.get('log_level', 'DEBUG')).upper() == 'DEBUG'
+        # 페이지 URL 생성 및 게시판 페이지 여부 확인용: 게시판 주소를 한 번만 분해하고 page 파라미터를 뺀 쿼리를 보관
+        board_parts = urlsplit(config.get('board_url', ''))
+        self._board_url_parts = board_parts
+        self._board_query = [(k, v) for k, v in parse_qsl(board_parts.query, keep_blank_values=True) if k != 'page']
+        self._board_first_page_url = urlunsplit(board_parts._replace(query=urlencode(self._board_query)))
         self._last_post_content = ""  # AI 실패 시 사용할 본문
         self._last_post_title = ""  # AI 실패 시 사용할 제목
         self._last_existing_comments = []  # AI 실패 시 사용할 기존 댓글
+        self._http = None  # OpenAI 호출용 공용 aiohttp 세션 (지연 생성)
+        self._ai_sem = asyncio.Semaphore(_OPENAI_MAX_CONCURRENCY)  # 동시 OpenAI 요청 수 제한
+        self._last_401_log = 0.0  # 401 안내 메시지를 마지막으로 출력한 시각 (도배 방지)
+        self._prepared_context = None  # (게시글 식별 키, 프롬프트 준비 데이터) - 재시도 시 재사용
+        self._retry_messages_cache = None  # (프롬프트 준비 데이터, 재시도 요청 메시지) - 같은 게시글 재시도 시 재사용
+        self._ai_comment_cache = {}  # 본문/최근 댓글 해시 -> (생성 시각, AI 댓글) - 같은 게시글 재방문 시 API 호출 생략
+        self._learned_comment_selector = None  # 이전 게시글에서 성공한 댓글 입력 필드 선택자
+        self._learned_submit_selector = None  # 이전 게시글에서 성공한 등록 버튼 선택자
+        self._learned_selector_misses = {}  # 학습된 선택자별 연속 실패 횟수 (2회 실패 시 폐기)
+        self._json_cache = {}  # 설정 JSON 파일 경로 -> (수정 시각, 파싱 결과) - 파일이 바뀔 때만 다시 읽음
+        self._gambling_prompt_cache = None  # (프롬프트 설정 객체, 도박 용어 프롬프트) - 설정 파일이 바뀌면 다시 생성
+        self._post_date_cache = {}  # 게시글 URL -> (작성 시간 또는 None, 확인 시각) - 같은 게시글 재접속 방지
+        self._site_http = None  # 게시글 HTML을 브라우저 없이 받아올 때 쓰는 세션 (OpenAI 인증 헤더가 없는 별도 세션)
+        self._site_cookie_header = None  # (사이트 origin, Cookie 헤더) - 해당 사이트 쿠키만 옮겨 담음 (로그인/컨텍스트 재생성/세션 만료 시 초기화)
         
         # AI 프롬프트 설정 로드 확인 (우선순위 1)
         prompt_config = self.load_prompt_config()
@@ -176,8 +711,7 @@ class MacroBot:
             else:
                 print("[AI] 학습 데이터 없음 (기본 프롬프트 사용)")
         
-        # 도박 용어 사전 로드 확인 (AI_프롬프트_설정.json에서)
-        prompt_config = self.load_prompt_config()
+        # 도박 용어 사전 로드 확인 (위에서 불러온 AI_프롬프트_설정.json 재사용)
         if prompt_config:
             gambling_terms = prompt_config.get('도박_용어_사전', {})
             if gambling_terms:
@@ -192,34 +726,158 @@ class MacroBot:
         else:
             print("[AI] 도박 용어 사전 없음 (프롬프트 설정 파일 없음)")
     
+    async def _ensure_http_session(self) -> aiohttp.ClientSession:
+        """OpenAI 호출에 재사용할 aiohttp 세션 반환 (없거나 닫혔으면 새로 생성)"""
+        if self._http is None or self._http.closed:
+            api_key = (self.config.get('openai_api_key') or '').strip()
+            self._http = aiohttp.ClientSession(
+                headers={
+                    'Authorization': f'Bearer {api_key}',
+                    'Content-Type': 'application/json'
+                },
+                timeout=_OPENAI_TIMEOUT,
+                connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300, keepalive_timeout=60),
+                json_serialize=_compact_json_dumps
+            )
+        return self._http
+    
+    @asynccontextmanager
+    async def _openai_post(self, data: dict):
+        """OpenAI 채팅 API에 POST하고 응답을 넘겨줌 (429/5xx/연결 오류는 지수 백오프로 재시도)
+        
+        할당량 소진(429 + quota) 응답은 기다려도 풀리지 않으므로 재시도하지 않고 바로 넘김
+        """
+        session = await self._ensure_http_session()
+        for attempt in range(1, _OPENAI_MAX_ATTEMPTS + 1):
+            last_attempt = attempt == _OPENAI_MAX_ATTEMPTS
+            delay = min(_OPENAI_RETRY_BASE_DELAY * (2 ** (attempt - 1)), _OPENAI_RETRY_MAX_DELAY)
+            try:
+                # 요청을 보내고 응답 헤더를 받는 동안만 슬롯을 차지 (본문 처리/백오프 대기 중에는 반납)
+                async with self._ai_sem:
+                    response = await session.post(_OPENAI_CHAT_URL, json=data)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                print(f"[AI] OpenAI 연결 오류, {delay:.1f}초 후 재시도 ({attempt}/{_OPENAI_MAX_ATTEMPTS}): {e}")
+                await asyncio.sleep(delay)
+                continue
+            
+            if response.status in _OPENAI_RETRY_STATUSES and not last_attempt:
+                # 본문은 캐시되므로 호출하는 쪽의 오류 처리에서 다시 읽을 수 있음
+                response_text = await response.text()
+                if not (response.status == 429 and _QUOTA_RE.search(response_text)):
+                    retry_after = response.headers.get('Retry-After', '')
+                    try:
+                        delay = min(max(float(retry_after), delay), _OPENAI_RETRY_MAX_DELAY)
+                    except ValueError:
+                        pass
+                    response.release()
+                    print(f"[AI] OpenAI 일시 오류 ({response.status}), {delay:.1f}초 후 재시도 ({attempt}/{_OPENAI_MAX_ATTEMPTS})")
+                    await asyncio.sleep(delay)
+                    continue
+            break
+        
+        try:
+            yield response
+        finally:
+            response.release()
+    
+    @staticmethod
+    async def _read_openai_stream(response, stop=None) -> str:
+        """stream=True 응답(SSE)의 delta 내용을 이어 붙여 반환 (stop(buf)가 참이면 나머지는 받지 않고 연결 종료)"""
+        parts = []
+        async for raw_line in response.content:
+            line = raw_line.strip()
+            if not line.startswith(b'data:'):
+                continue
+            payload = line[5:].strip()
+            if payload == b'[DONE]':
+                break
+            choices = json.loads(payload).get('choices') or [{}]
+            piece = (choices[0].get('delta') or {}).get('content')
+            if not piece:
+                continue
+            parts.append(piece)
+            if stop is not None and '\n' in piece and stop("".join(parts)):
+                # 남은 토큰 생성을 기다리지 않도록 연결을 바로 끊음
+                response.close()
+                break
+        return "".join(parts)
+    
+    async def _ensure_site_session(self) -> aiohttp.ClientSession:
+        """게시판 HTML 요청에 재사용할 aiohttp 세션 반환 (없거나 닫혔으면 새로 생성)"""
+        if self._site_http is None or self._site_http.closed:
+            self._site_http = aiohttp.ClientSession(
+                headers={'User-Agent': _USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._site_http
+    
+    async def close(self):
+        """공용 HTTP 세션과 게시글 목록 파일 핸들 종료"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+        if self._site_http is not None and not self._site_http.closed:
+            await self._site_http.close()
+        self._site_http = None
+        if self._commented_fp is not None:
+            self._commented_fp.close()
+            self._commented_fp = None
+    
+    def _load_json_cached(self, path: str):
+        """JSON 파일을 수정 시각 기준으로 캐시해서 불러오기 (파일이 없으면 None)"""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._json_cache.pop(path, None)
+            return None
+        cached = self._json_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self._json_cache[path] = (mtime, data)
+        return data
+    
     def load_learning_data(self):
         """학습 데이터 불러오기"""
         try:
-            learning_file = 'ai_learning_data.json'
-            if os.path.exists(learning_file):
-                with open(learning_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return self._load_json_cached('ai_learning_data.json')
         except Exception as e:
             print(f"[경고] 학습 데이터 로드 실패: {e}")
         return None
     
     def load_prompt_config(self):
-        """AI 프롬프트 설정 파일 불러오기"""
+        """AI 프롬프트 설정 파일 불러오기 (파일이 바뀌지 않았으면 캐시 사용)"""
         try:
-            config_file = 'AI_프롬프트_설정.json'
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return self._load_json_cached('AI_프롬프트_설정.json')
         except Exception as e:
             print(f"[경고] AI 프롬프트 설정 로드 실패: {e}")
         return None
     
-    def get_gambling_terms_prompt(self):
-        """도박 용어 사전을 프롬프트 형식으로 변환 (AI_프롬프트_설정.json에서 가져옴)"""
-        prompt_config = self.load_prompt_config()
+    def get_gambling_terms_prompt(self, prompt_config: dict = None):
+        """도박 용어 사전을 프롬프트 형식으로 변환 (AI_프롬프트_설정.json에서 가져옴)
+        
+        이미 불러온 설정 객체를 넘기면 설정 파일을 다시 확인하지 않음
+        """
+        if prompt_config is None:
+            prompt_config = self.load_prompt_config()
         if not prompt_config:
             return ""
         
+        # 설정 파일이 바뀌지 않았으면 (같은 캐시 객체) 이전에 만든 문자열 재사용
+        cached = self._gambling_prompt_cache
+        if cached is not None and cached[0] is prompt_config:
+            return cached[1]
+        prompt = self._build_gambling_terms_prompt(prompt_config)
+        self._gambling_prompt_cache = (prompt_config, prompt)
+        return prompt
+    
+    @staticmethod
+    def _build_gambling_terms_prompt(prompt_config: dict) -> str:
+        """도박 용어 사전 프롬프트 문자열 생성 (get_gambling_terms_prompt의 본체)"""
         gambling_terms = prompt_config.get('도박_용어_사전', {})
         if not gambling_terms:
             return ""
@@ -252,7 +910,7 @@ class MacroBot:
         try:
             if os.path.exists(self.commented_posts_file):
                 with open(self.commented_posts_file, 'r', encoding='utf-8') as f:
-                    posts = set(line.strip() for line in f if line.strip())
+                    posts = {url for url in map(str.strip, f) if url}
                 print(f"[중복방지] 이미 댓글 작성한 게시글 {len(posts)}개 불러옴")
                 return posts
             else:
@@ -268,30 +926,33 @@ class MacroBot:
             # 메모리에 추가
             self.commented_posts.add(post_url)
             
-            # 파일에 추가 (append 모드)
-            with open(self.commented_posts_file, 'a', encoding='utf-8') as f:
-                f.write(f"{post_url}\n")
+            # 파일에 추가 (append 모드 핸들 재사용, 줄 단위 버퍼링이라 중간 종료에도 기록 유지)
+            if self._commented_fp is None:
+                self._commented_fp = open(self.commented_posts_file, 'a', encoding='utf-8', buffering=1)
+            self._commented_fp.write(f"{post_url}\n")
             
             print(f"[중복방지] 게시글 저장: {post_url}")
         except Exception as e:
             print(f"[경고] 게시글 저장 실패: {e}")
 
-    def _cleanup_comment_history(self):
-        """최근 댓글 기록 정리"""
-        now = time.time()
-        self.comment_history = [
-            (text, ts) for text, ts in self.comment_history
-            if now - ts < max(self.min_repeat_interval, 60)
-        ]
+    def _cleanup_comment_history(self, max_entries: int = 256):
+        """최근 댓글 기록 정리 (만료되었거나 개수 제한을 넘은 항목을 앞에서부터 제거)"""
+        cutoff = time.time() - max(self.min_repeat_interval, 60)
+        history = self.comment_history
+        while history and (history[0][1] <= cutoff or len(history) > max_entries):
+            text, ts = history.popleft()
+            # 같은 댓글이 이후에 다시 쓰였으면 최신 시각은 유지
+            if self._comment_last_used.get(text) == ts:
+                del self._comment_last_used[text]
 
     def is_comment_recent(self, comment_text: str):
         """같은 댓글이 최근에 사용됐는지 확인"""
         self._cleanup_comment_history()
         now = time.time()
-        for text, ts in self.comment_history:
-            if text == comment_text and (now - ts) < self.min_repeat_interval:
-                remaining = self.min_repeat_interval - (now - ts)
-                return True, max(0, remaining)
+        ts = self._comment_last_used.get(comment_text)
+        if ts is not None and (now - ts) < self.min_repeat_interval:
+            remaining = self.min_repeat_interval - (now - ts)
+            return True, max(0, remaining)
         return False, 0
 
     def record_comment_usage(self, comment_text: str):
@@ -299,24 +960,35 @@ class MacroBot:
         now = time.time()
         self._cleanup_comment_history()
         self.comment_history.append((comment_text, now))
+        self._comment_last_used[comment_text] = now
         self.last_comment_time = now
 
-    def has_meaningful_content(self, comment_text: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def has_meaningful_content(comment_text: str) -> bool:
         """단순 'ㅎㅎ', 'ㅋㅋ' 등만 있는 댓글을 필터링"""
         if not comment_text:
             return False
         stripped = comment_text.strip()
         if len(stripped) < 2:
             return False
-        cleaned = re.sub(r'[ㅎㅋ~!?\s\.\,\-_\^\*]+', '', stripped)
+        # 첫 글자와 마지막 글자가 모두 한글 음절이면 의미 있는 글자가 2개 이상이므로 정규식 생략
+        if '가' <= stripped[0] <= '힣' and '가' <= stripped[-1] <= '힣':
+            return True
+        cleaned = _MEANINGLESS_CHARS_RE.sub('', stripped)
         return len(cleaned) >= 2
     
     def extract_keywords_from_post(self, post_content: str, post_title: str = None) -> list:
         """본문에서 핵심 키워드 추출 (명사, 주요 단어) - 개선된 버전"""
-        import re
-        
+        # 재시도 시 같은 본문/제목으로 반복 호출되므로 결과를 캐시 (리스트는 복사해서 반환)
+        return list(self._extract_keywords_cached(post_content, post_title))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _extract_keywords_cached(post_content: str, post_title: str = None) -> tuple:
+        """extract_keywords_from_post의 캐시용 본체 (튜플 반환)"""
         if not post_content:
-            return []
+            return ()
         
         # 본문과 제목 합치기
         full_text = post_content
@@ -324,49 +996,19 @@ class MacroBot:
             full_text = f"{post_title} {post_content}"
         
         # 특수문자 제거 (한글, 영문, 숫자만)
-        cleaned = re.sub(r'[^가-힣a-zA-Z0-9\s]', ' ', full_text)
-        
-        # 단어 추출
-        words = cleaned.split()
-        keywords = []
-        
-        # 제외할 단어들 (조사, 접속사, 일반적인 단어)
-        stop_words = {
-            '그리고', '그런데', '하지만', '그래서', '그러나', '그런', '이런', '저런',
-            '이것', '그것', '저것', '이거', '그거', '저거',
-            '오늘', '어제', '내일', '지금', '그때', '이때',
-            '있어', '없어', '하는', '하는데', '해서', '하고',
-            '좋아', '나쁘', '많이', '조금', '너무', '정말',
-            '뭐', '어떤', '어떻게', '언제', '어디', '누가', '왜',
-            '것', '거', '게', '건', '걸'
-        }
+        cleaned = _NON_KEYWORD_CHAR_RE.sub(' ', full_text)
         
-        # 명사/주요 단어 추출 (2~5글자, 의미 있는 단어만)
-        for word in words:
-            word = word.strip()
-            # 길이 체크 (2~5글자)
-            if len(word) < 2 or len(word) > 5:
-                continue
-            
-            # 한글이 포함된 단어만
-            if not re.search(r'[가-힣]', word):
-                continue
-            
-            # 제외 단어 필터링
-            if word in stop_words:
-                continue
-            
-            # 숫자만 있는 단어 제외
-            if re.match(r'^[0-9]+$', word):
-                continue
-            
-            keywords.append(word)
+        # 명사/주요 단어 추출 (2~5글자, 한글 포함은 정규식에서 한 번에 걸러냄, 제외 단어 아닌 것만)
+        # 한글이 포함된 단어는 숫자로만 이루어질 수 없으므로 숫자 검사는 생략
+        keywords = [
+            word for word in _KEYWORD_CANDIDATE_RE.findall(cleaned)
+            if word not in _KEYWORD_STOP_WORDS
+        ]
         
         # 중복 제거 및 빈도순 정렬
-        from collections import Counter
         keyword_counts = Counter(keywords)
         # 빈도가 높은 순으로 정렬 (최대 7개로 증가)
-        top_keywords = [word for word, count in keyword_counts.most_common(7)]
+        top_keywords = tuple(word for word, count in keyword_counts.most_common(7))
         
         return top_keywords
     
@@ -375,89 +1017,29 @@ class MacroBot:
         if not comment_text or not post_content:
             return False
         
-        import re
-        
         # 기본 원칙: AI가 생성한 댓글은 기본적으로 허용 (AI가 이미 본문을 분석했으므로)
-        # 정말 명백하게 무관한 경우만 거부
-        
-        # 댓글과 본문/제목을 정리
-        comment_clean = re.sub(r'[~!?ㅎㅋㅠㅜ\s\.\,\-]+', '', comment_text)
-        post_clean = re.sub(r'[~!?ㅎㅋㅠㅜ\s\.\,\-]+', '', post_content)
-        title_clean = re.sub(r'[~!?ㅎㅋㅠㅜ\s\.\,\-]+', '', post_title) if post_title else ""
-        
-        # 1. 본문이 너무 짧거나 의미 없으면 허용
-        if len(post_clean) < 5:
-            return True  # 짧은 본문도 허용
-        
-        # 2. 본문이 의미 없는 경우 (예: "ㅎㅎ", "...", "ㅋㅋ" 등) 허용
-        meaningless_patterns = ['ㅎ', 'ㅋ', 'ㅠ', 'ㅜ', '...', '..', '.']
-        meaningless_count = sum(post_clean.count(p) for p in meaningless_patterns)
-        meaningless_ratio = meaningless_count / max(len(post_clean), 1)
-        if meaningless_ratio > 0.5:  # 50% 이상이 의미 없는 문자
-            return True  # 의미 없는 본문도 허용
-        
-        # 3. 일반적인 공감 댓글은 자유게시판 특성상 허용
-        # 자유게시판에서는 본문과 직접적인 키워드 매칭이 없어도 감정적으로 공감하는 댓글이 자연스러움
-        common_empathy_comments = ['힘내', '아쉽', '공감', '위로', '좋아', '응원', '화이팅', 
-                                   '축하', '부럽', '대박', '지치네요', '다음엔', '조심']
-        comment_normalized = comment_clean.replace('요', '').replace('네', '').replace('어', '').replace('다', '').replace('해', '').replace('용', '')
-        if comment_normalized in common_empathy_comments:
-            return True  # 일반적인 공감 댓글은 허용
-        
-        # 4. 공통 키워드가 있으면 관련성 있음 (참고용, 없어도 OK)
-        def extract_keywords(text, min_len=2, max_len=3):
-            """텍스트에서 2~3글자 키워드 추출 (간단하게)"""
-            keywords = set()
-            for i in range(len(text) - min_len + 1):
-                for length in range(min_len, min(max_len + 1, len(text) - i + 1)):
-                    keyword = text[i:i+length]
-                    if len(keyword) >= min_len:
-                        keywords.add(keyword)
-            return keywords
-        
-        post_keywords = extract_keywords(post_clean)
-        title_keywords = extract_keywords(title_clean) if title_clean else set()
-        comment_keywords = extract_keywords(comment_clean)
-        
-        common_with_post = comment_keywords & post_keywords
-        common_with_title = comment_keywords & title_keywords if title_keywords else set()
-        
-        if len(common_with_post) > 0 or len(common_with_title) > 0:
-            return True  # 공통 키워드가 있으면 확실히 관련 있음
-        
-        # 5. 본문/제목의 핵심 단어가 댓글에 포함되어 있는지 확인 (부분 일치)
-        post_important_words = [post_clean[i:i+3] for i in range(len(post_clean)-2)]
-        title_important_words = [title_clean[i:i+3] for i in range(len(title_clean)-2)] if title_clean else []
-        
-        for word in post_important_words + title_important_words:
-            if word in comment_clean:
-                return True
-        
-        # 6. 기본적으로 허용 (AI가 생성한 댓글이므로 본문을 분석했을 것으로 가정)
-        # 정말 명백하게 무관한 경우만 거부하는데, 현재는 그런 경우를 찾기 어려우므로 기본적으로 허용
-        return True  # 기본적으로 허용 (자유게시판 특성상 감정적 공감 댓글도 자연스러움)
+        # 자유게시판 특성상 키워드가 겹치지 않는 감정적 공감 댓글도 자연스러움
+        # (이전의 짧은 본문/공감 댓글/공통 키워드/부분 일치 검사는 모든 경우에 허용을 반환했으므로
+        #  n-gram 비교 없이 바로 허용)
+        return True
 
     def _is_negative_content(self, text: str) -> bool:
         """본문이 부정적인지 단순 판별"""
         if not text:
             return False
-        negative_keywords = ['잃', '망', '눈물', '울', '아쉽', '후회', '슬프', 'ㅠ', 'ㅜ', '손실', '적자', '좌절', '힘들']
-        return any(keyword in text for keyword in negative_keywords)
+        return bool(_NEG_CONTENT_RE.search(text))
     
     def _is_positive_comment(self, comment_text: str) -> bool:
         """댓글이 긍정적인지 판별 (젊은층 표현 포함)"""
         if not comment_text:
             return False
-        positive_keywords = ['화이팅', '좋아', '대박', '축하', '부럽', '좋네', '좋다', '멋져', '최고', '응원', '파이팅', 
-                            '와', '헐', '진짜', '개좋', '짱', '허걱', '와우']
-        return any(keyword in comment_text for keyword in positive_keywords)
+        return bool(_POS_COMMENT_RE.search(comment_text))
     
     def _is_negative_comment(self, comment_text: str) -> bool:
         """댓글이 부정적인지 판별"""
         if not comment_text:
             return False
-        negative_keywords = ['아쉽', '슬프', '힘들', '후회', '아깝', '위로', '공감']
-        return any(keyword in comment_text for keyword in negative_keywords)
+        return bool(_NEG_COMMENT_RE.search(comment_text))
 
     def enhance_tone_variation(self, comment_text: str, post_content: str = '', existing_comments: list = None) -> str:
         """물결/느낌표/ㅠㅠ 등을 다양하게 섞되 과한 특수문자 사용은 제한 (기존 댓글 스타일 반영)"""
@@ -470,14 +1052,8 @@ class MacroBot:
         if existing_comments and len(existing_comments) > 0:
             style = self.analyze_comment_style(existing_comments)
         
-        # 이미 어미가 있는지 확인 (요, 죠, 네요, 어요, 해요, 되요, 다요, 야요, 까요, 나요, 세요 등)
-        # 물음표는 어미가 아니므로 제외하고 체크
+        # 존댓말 어미 확인용 (물음표는 어미가 아니므로 제외하고 체크)
         comment_without_question = comment.rstrip('?')
-        # 정규식으로 어미 확인 (반말 어미 포함: 야, 다, 어, 해, 되, 까, 나, 세, 지, 네 등)
-        has_ending = bool(re.search(r'(요|죠|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요|네|어|해|되|다|야|까|나|세|지)$', comment_without_question))
-        # "야"로 끝나는 경우 명시적으로 체크 (정규식이 놓칠 수 있으므로)
-        if not has_ending and comment_without_question.endswith('야'):
-            has_ending = True
         
         # 특수 문자 개수 제한 (젊은층 톤을 위해 조금 더 허용)
         special_chars = ['~', '!', 'ㅠ', 'ㅜ']
@@ -511,71 +1087,38 @@ class MacroBot:
                     should_add_emoji = False
             
             if should_add_emoji and random.random() < emoji_probability:
-                # 존댓말 어미로 끝나는 경우 (요, 세요, 네요, 어요, 해요 등)
-                if re.search(r'(요|세요|네요|어요|해요|되요|다요|까요|나요|지요)$', comment_without_question):
-                    # 기존 댓글 스타일에 맞춰 특수 기호 선택
-                    if style:
-                        # 기존 댓글에서 많이 사용하는 특수 기호 우선
-                        if style['has_ㅠ'] and self._is_negative_comment(comment):
-                            candidate = 'ㅠ'
-                        elif style['has_exclamation'] and self._is_positive_comment(comment):
-                            candidate = '!'
-                        elif style['has_tilde']:
-                            candidate = '~'
-                        # 기존 댓글 스타일이 없으면 내용에 따라 결정
-                        elif self._is_negative_comment(comment):
-                            candidate = 'ㅠ'
-                        elif self._is_positive_comment(comment):
-                            candidate = '!'
-                        else:
-                            candidate = '~'
+                # 존댓말 어미로 끝나는 경우 (요, 세요, 네요, 어요, 해요 등)에만 추가
+                honorific = True
+                sentiment = None
+                if _HONORIFIC_ENDING_RE.search(comment_without_question):
+                    is_negative = self._is_negative_comment(comment)
+                    is_positive = self._is_positive_comment(comment)
+                    # 기존 댓글에서 많이 사용하는 특수 기호 우선, 없으면 내용에 따라 결정
+                    if style and style['has_ㅠ'] and is_negative:
+                        sentiment = 'neg'
+                    elif style and style['has_exclamation'] and is_positive:
+                        sentiment = 'pos'
+                    elif style and style['has_tilde']:
+                        sentiment = 'neu'
                     else:
-                        # 기존 댓글 스타일 정보가 없으면 내용에 따라 결정
-                        if self._is_negative_comment(comment):
-                            candidate = 'ㅠ'
-                        elif self._is_positive_comment(comment):
-                            candidate = '!'
-                        else:
-                            candidate = '~'
-                    
-                    if len(comment) + len(candidate) <= 10:
-                        comment += candidate
-                    elif len(comment) < 10:
-                        comment = (comment + candidate)[:10]
+                        sentiment = 'neg' if is_negative else 'pos' if is_positive else 'neu'
             # 존댓말 어미가 아닌 경우
             else:
-                # 부정적인 내용이면 ㅠ 추가
+                honorific = False
+                # 부정적인 내용이면 ㅠ, 긍정적인 댓글이면 !, 그 외에는 물결표/느낌표 (젊은층 톤)
                 if self._is_negative_content(post_content or comment) or self._is_negative_comment(comment):
-                    candidate = random.choice(['ㅠ', 'ㅠㅠ'])
-                    if len(comment) + len(candidate) <= 10:
-                        comment += candidate
-                    elif len(comment) < 10:
-                        comment = (comment + candidate)[:10]
-                    else:
-                        comment = comment[:-len(candidate)] + candidate
-                # 긍정적인 댓글이면 ! 추가
+                    sentiment = 'neg'
                 elif self._is_positive_comment(comment):
-                    candidate = '!'
-                    if len(comment) + len(candidate) <= 10:
-                        comment += candidate
-                    elif len(comment) < 10:
-                        comment = (comment + candidate)[:10]
-                # 그 외의 경우 물결표나 느낌표 추가 (젊은층 톤)
+                    sentiment = 'pos'
                 else:
-                    # 젊은층은 물결표를 더 선호
-                    candidate = random.choice(['~', '~', '!'])  # 물결표 확률 2배
-                    if len(comment) + len(candidate) <= 10:
-                        comment += candidate
-                    elif len(comment) < 10:
-                        comment = (comment + candidate)[:10]
-                    else:
-                        comment = comment[:-len(candidate)] + candidate
+                    sentiment = 'neu'
+            
+            if sentiment:
+                candidates, overwrite = _TONE_SUFFIX_TABLE[(honorific, sentiment)]
+                comment = _append_clamped(comment, random.choice(candidates), 10, overwrite)
         
         # 중복된 물결/느낌표 정리
-        while '~~' in comment:
-            comment = comment.replace('~~', '~')
-        while '!!' in comment:
-            comment = comment.replace('!!', '!')
+        comment = _REPEATED_TILDE_BANG_RE.sub(r'\1', comment)
         
         # 이미 특수 기호가 있는 경우에도 젊은층 톤을 위해 다양화 (확률 증가)
         if comment.endswith('~') and random.random() < 0.3:
@@ -588,35 +1131,9 @@ class MacroBot:
         # 의도적인 오타 추가 (사람처럼 보이게, 25% 확률)
         comment = self.add_natural_typos(comment)
         
-        # ⚠️ 길이 제한: 완전한 문장인지 확인 후 자르기
-        # 어미가 있는 완전한 문장은 보존하되, 10글자 초과 시 어미를 유지한 채 앞부분만 조정
-        if len(comment) > 10:
-            # 어미가 있는지 확인 (요, 네요, 어요, 해요, 되요, 다요, 세요, 까요, 나요, 지요, 죠, 다, 어, 해, 되, 까, 나, 세, 지, 야 등)
-            comment_clean = comment.rstrip('~!?ㅠㅜㅎㅋ').strip()
-            has_ending = bool(re.search(r'(요|죠|네요|어요|해요|되요|다요|세요|까요|나요|지요|다|어|해|되|까|나|세|지|야)$', comment_clean))
-            
-            if has_ending:
-                # 어미가 있으면 어미를 보존하면서 앞부분만 자르기
-                # 어미 부분 찾기
-                ending_match = re.search(r'(요|죠|네요|어요|해요|되요|다요|세요|까요|나요|지요|다|어|해|되|까|나|세|지|야)$', comment_clean)
-                if ending_match:
-                    ending = ending_match.group(1)
-                    # 특수 기호도 보존
-                    special_suffix = comment[len(comment_clean):]  # ~, !, ㅠ 등
-                    # 앞부분만 자르기 (어미 + 특수기호 제외)
-                    max_body_length = 10 - len(ending) - len(special_suffix)
-                    if max_body_length > 0:
-                        body = comment_clean[:-len(ending)]
-                        comment = body[:max_body_length] + ending + special_suffix
-                    else:
-                        # 어미 + 특수기호가 10글자를 넘으면 어미만 보존
-                        comment = ending + special_suffix
-            else:
-                # 어미가 없으면 그냥 10글자로 자르기 (하지만 이 경우는 AI가 잘못 생성한 것이므로 경고)
-                print(f"[경고] 댓글이 완전한 문장으로 끝맺어지지 않습니다: '{comment}' (길이: {len(comment)}자)")
-                comment = comment[:10]
-        
-        return comment
+        # ⚠️ 길이 제한: 어미가 있는 완전한 문장은 어미를 유지한 채 앞부분만 조정
+        # 어미가 없으면 AI가 잘못 생성한 것이므로 경고 후 10글자로 자르기
+        return _trim_keep_ending(comment, 10, warn=True)
     
     def add_natural_typos(self, comment: str) -> str:
         """의도적인 오타를 추가해서 더 자연스럽게 (젊은층이 자주 쓰는 오타 패턴)"""
@@ -629,29 +1146,11 @@ class MacroBot:
         
         original_comment = comment
         
-        # 젊은층이 자주 쓰는 오타 패턴들 (우선순위 순)
-        # 긴 패턴부터 먼저 체크해야 함 (예: "네요"가 "요"보다 먼저)
-        if re.search(r'네요$', comment):
-            comment = re.sub(r'네요$', random.choice(['네욘', '네용', '네요']), comment)
-        elif re.search(r'어요$', comment):
-            comment = re.sub(r'어요$', random.choice(['어욘', '어용', '어요']), comment)
-        elif re.search(r'해요$', comment):
-            comment = re.sub(r'해요$', random.choice(['해욘', '해용', '해요']), comment)
-        elif re.search(r'되요$', comment):
-            comment = re.sub(r'되요$', random.choice(['되욘', '되용', '되요']), comment)
-        elif re.search(r'다요$', comment):
-            comment = re.sub(r'다요$', random.choice(['다욘', '다용', '다요']), comment)
-        elif re.search(r'까요$', comment):
-            comment = re.sub(r'까요$', random.choice(['까욘', '까용', '까요']), comment)
-        elif re.search(r'나요$', comment):
-            comment = re.sub(r'나요$', random.choice(['나욘', '나용', '나요']), comment)
-        elif re.search(r'세요$', comment):
-            comment = re.sub(r'세요$', random.choice(['세욘', '세용', '세요']), comment)
-        elif re.search(r'지요$', comment):
-            comment = re.sub(r'지요$', random.choice(['지욘', '지용', '지요']), comment)
-        elif re.search(r'요$', comment):
-            # "요"로 끝나는 경우 (다른 패턴에 해당하지 않는 경우)
-            comment = re.sub(r'요$', random.choice(['욘', '용', '요']), comment)
+        # 젊은층이 자주 쓰는 오타 패턴들 (어미 앞 글자까지 함께 매칭해서 "네요"가 "요"보다 우선)
+        typo_match = _TYPO_ENDING_RE.search(comment)
+        if typo_match:
+            # 네요 → 네욘/네용/네요, 요 → 욘/용/요
+            comment = comment[:typo_match.start()] + (typo_match.group(1) or '') + random.choice(['욘', '용', '요'])
         
         # 단어 내부 오타 (가끔, 이미 어미 오타를 적용하지 않은 경우만)
         if comment == original_comment:
@@ -735,14 +1234,21 @@ class MacroBot:
         if not base_url.startswith(('http://', 'https://')):
             raise ValueError(f"[오류] 게시판 URL 형식이 잘못되었습니다. http:// 또는 https://로 시작해야 합니다.\n현재 값: {base_url}\n.env 파일의 BOARD_URL을 확인하세요.")
         
-        # 기존 page 파라미터 제거
-        clean_url = re.sub(r'([?&])page=\d+', r'\1', base_url).rstrip('?&')
-        
+        # page 파라미터를 제거한 주소/쿼리는 __init__에서 미리 계산해 둠
         if page_number == 1:
-            return clean_url
+            return self._board_first_page_url
         
-        separator = '&' if '?' in clean_url else '?'
-        return f"{clean_url}{separator}page={page_number}"
+        query = urlencode(self._board_query + [('page', page_number)])
+        return urlunsplit(self._board_url_parts._replace(query=query))
+
+    def _is_board_url(self, url: str) -> bool:
+        """현재 URL이 게시판 주소에 속하는지 확인 (page 파라미터와 쿼리 순서는 무시)"""
+        parts = urlsplit(url)
+        board_parts = self._board_url_parts
+        if parts.netloc != board_parts.netloc or not parts.path.startswith(board_parts.path):
+            return False
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        return all(item in query for item in self._board_query)
 
     async def navigate_to_board_page(self, page_number: int):
         """지정한 게시판 페이지로 이동"""
@@ -754,12 +1260,12 @@ class MacroBot:
         if page_to_use:
             # Frame이면 원본 page로 복원
             if hasattr(page_to_use, 'goto'):
-                await page_to_use.goto(target_url, wait_until='networkidle')
+                await self._goto_board(page_to_use, target_url)
                 self.page = page_to_use  # 원본 page로 복원
             else:
                 # Frame인 경우 부모 page 사용
                 if self.main_page:
-                    await self.main_page.goto(target_url, wait_until='networkidle')
+                    await self._goto_board(self.main_page, target_url)
                     self.page = self.main_page
                 else:
                     raise Exception("페이지 객체를 찾을 수 없습니다.")
@@ -804,7 +1310,7 @@ class MacroBot:
             is_frozen = getattr(sys, 'frozen', False)
             launch_options = {
                 'headless': headless,
-                'slow_mo': 500  # 동작을 천천히 (디버깅용)
+                'slow_mo': self.config.get('slow_mo', 0)  # 동작 사이 지연(ms), 디버깅할 때만 설정
             }
             
             if is_frozen:
@@ -839,13 +1345,19 @@ class MacroBot:
                         print("[경고] 브라우저 경로를 자동으로 찾지 못했습니다.")
                         print("[경고] Playwright가 기본 경로에서 브라우저를 찾으려고 시도합니다.")
             
-            self.browser = await self.playwright.chromium.launch(**launch_options)
-            self.page = await self.browser.new_page()
-            self.main_page = self.page  # 원본 page 저장
-            # 봇 탐지 방지를 위한 User-Agent 설정
-            await self.page.set_extra_http_headers({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
+            profile_dir = self.config.get('browser_profile_dir')
+            if profile_dir:
+                # 프로필 폴더에 쿠키/로그인 상태를 저장해서 다음 실행 때 로그인 생략
+                self.browser = None
+                self.context = await self.playwright.chromium.launch_persistent_context(
+                    os.path.abspath(profile_dir), user_agent=_USER_AGENT, **launch_options
+                )
+                await self._prepare_context()
+                self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+                self.main_page = self.page  # 원본 page 저장
+            else:
+                self.browser = await self.playwright.chromium.launch(**launch_options)
+                await self._open_context()
         except Exception as e:
             error_msg = str(e).lower()
             if "executable doesn't exist" in error_msg or "browser not found" in error_msg or "chromium" in error_msg:
@@ -869,27 +1381,74 @@ class MacroBot:
             else:
                 raise
 
-    async def reset_browser(self, headless: bool = False):
-        """브라우저를 완전히 재시작"""
-        print("[브라우저] 브라우저를 재시작합니다.")
-        try:
-            if self.page and not self.page.is_closed():
-                await self.page.close()
-        except Exception as e:
-            print(f"[브라우저] 페이지 종료 중 오류: {e}")
+    async def _open_context(self):
+        """새 브라우저 컨텍스트와 페이지 생성 (쿠키/세션이 분리된 깨끗한 상태)"""
+        # 봇 탐지 방지를 위한 User-Agent 설정
+        # 저장된 로그인 상태(쿠키/로컬 스토리지) 파일이 있으면 불러와서 로그인 생략
+        state_file = self.config.get('storage_state_file')
+        storage_state = state_file if state_file and os.path.exists(state_file) else None
+        self.context = await self.browser.new_context(user_agent=_USER_AGENT, storage_state=storage_state)
+        await self._prepare_context()
+        self.page = await self.context.new_page()
+        self.main_page = self.page  # 원본 page 저장
+    
+    async def _prepare_context(self):
+        """컨텍스트 공통 설정 (JS 헬퍼 등록, 불필요한 리소스 차단)"""
+        # 댓글 작성용 JS 헬퍼를 모든 문서(iframe 포함)에 미리 등록
+        await self.context.add_init_script(_KASINO_JS_HELPERS)
+        if self.config.get('block_resources', True):
+            # 이미지/폰트/동영상과 광고·분석 스크립트는 읽지 않으므로 받지 않음 (페이지 로드 시간 단축)
+            # CSS는 요소 표시 여부 판단에 쓰이므로 차단하지 않음
+            await self.context.route(_BLOCKED_RESOURCE_GLOB, lambda route: route.abort())
+            await self.context.route(_BLOCKED_TRACKER_RE, lambda route: route.abort())
+    
+    async def _save_storage_state(self):
+        """로그인 상태(쿠키/로컬 스토리지)를 파일에 저장해서 다음 실행 때 재사용"""
+        state_file = self.config.get('storage_state_file')
+        if not state_file or not self.context or self.config.get('browser_profile_dir'):
+            return
         try:
-            if self.browser:
-                await self.browser.close()
+            await self.context.storage_state(path=state_file)
+            print(f"[로그인] 로그인 상태 저장: {state_file}")
         except Exception as e:
-            print(f"[브라우저] 브라우저 종료 중 오류: {e}")
+            print(f"[경고] 로그인 상태 저장 실패: {e}")
+    
+    async def reset_browser(self, headless: bool = False):
+        """브라우저 초기화 (브라우저가 살아 있으면 컨텍스트만 새로 만들고, 아니면 완전히 재시작)"""
+        print("[브라우저] 브라우저를 재시작합니다.")
         try:
-            if self.playwright:
-                await self.playwright.stop()
+            if self.context:
+                await self.context.close()
         except Exception as e:
-            print(f"[브라우저] Playwright 종료 중 오류: {e}")
+            print(f"[브라우저] 컨텍스트 종료 중 오류: {e}")
         finally:
-            self.playwright = None
-        await self.init_browser(headless=headless)
+            self.context = None
+            # 새 컨텍스트는 쿠키가 다르므로 HTML 요청용 쿠키도 다시 가져옴
+            self._site_cookie_header = None
+        
+        browser_alive = False
+        try:
+            browser_alive = bool(self.browser) and self.browser.is_connected()
+        except Exception:
+            browser_alive = False
+        
+        if browser_alive:
+            # 브라우저 프로세스는 그대로 두고 새 컨텍스트만 생성 (실행 비용 절약)
+            await self._open_context()
+        else:
+            try:
+                if self.browser:
+                    await self.browser.close()
+            except Exception as e:
+                print(f"[브라우저] 브라우저 종료 중 오류: {e}")
+            try:
+                if self.playwright:
+                    await self.playwright.stop()
+            except Exception as e:
+                print(f"[브라우저] Playwright 종료 중 오류: {e}")
+            finally:
+                self.playwright = None
+            await self.init_browser(headless=headless)
         if not await self.login():
             raise RuntimeError("브라우저 재시작 후 로그인에 실패했습니다.")
         self.current_page = 1
@@ -899,7 +1458,26 @@ class MacroBot:
     async def login(self):
         """사이트에 로그인"""
         print(f"[로그인] {self.config['login_url']} 접속 중...")
-        await self.page.goto(self.config['login_url'], wait_until='networkidle')
+        # 로그인 후 쿠키가 바뀌므로 HTML 요청용 쿠키는 다음 요청 때 다시 가져옴
+        self._site_cookie_header = None
+        # 아래에서 입력 필드를 직접 기다리므로 DOM 로드까지만 대기
+        await self.page.goto(self.config['login_url'], wait_until='domcontentloaded')
+        
+        # 저장된 프로필/로그인 상태를 쓰는 경우 로그인된 상태에서만 보이는 요소(로그아웃 링크 등)가 나타나면 로그인 생략
+        # (DOM 로드 직후에는 로그인 폼이 아직 그려지지 않았을 수 있어 비밀번호 필드가 없다는 것만으로는 판단하지 않음)
+        if self.config.get('browser_profile_dir'):
+            saved_login = "저장된 브라우저 프로필"
+        elif self.config.get('storage_state_file'):
+            saved_login = f"저장된 로그인 상태 파일({self.config['storage_state_file']})"
+        else:
+            saved_login = None
+        if saved_login:
+            try:
+                await self.page.wait_for_selector(_LOGGED_IN_SELECTOR, timeout=3000, state='attached')
+                print(f"[로그인] {saved_login}로 이미 로그인되어 있습니다. 로그인을 생략합니다.")
+                return True
+            except Exception:
+                print(f"[로그인] {saved_login}로 로그인된 상태를 확인하지 못했습니다. 다시 로그인합니다.")
         
         # 랜덤 대기 (봇 탐지 방지)
         await self.random_delay(1, 3)
@@ -936,13 +1514,13 @@ class MacroBot:
             
             if not found_selector:
                 # 모든 선택자 실패 시 페이지 HTML 확인
-                print("[디버깅] 페이지의 모든 input 요소 확인 중...")
+                log.debug("[디버깅] 페이지의 모든 input 요소 확인 중...")
                 inputs = await self.page.query_selector_all('input')
-                print(f"[디버깅] 발견된 input 요소 수: {len(inputs)}")
+                log.debug(f"[디버깅] 발견된 input 요소 수: {len(inputs)}")
                 for i, inp in enumerate(inputs[:5]):  # 처음 5개만
                     try:
                         input_info = await inp.evaluate('el => ({type: el.type, name: el.name, id: el.id, class: el.className})')
-                        print(f"[디버깅] Input {i+1}: {input_info}")
+                        log.debug(f"[디버깅] Input {i+1}: {input_info}")
                     except:
                         pass
                 raise Exception(f"사용자명 입력 필드를 찾을 수 없습니다. 시도한 선택자: {possible_selectors}")
@@ -953,9 +1531,12 @@ class MacroBot:
             await self.page.click(username_selector)
             await self.random_delay(0.3, 0.5)
             
-            # 기존 내용 지우고 입력
-            await self.page.fill(username_selector, '')
-            await self.page.type(username_selector, self.config['username'], delay=100)
+            # 기존 내용 지우고 입력 (humanize_typing이 아니면 fill로 한 번에)
+            if self.config.get('humanize_typing', False):
+                await self.page.fill(username_selector, '')
+                await self.page.type(username_selector, self.config['username'], delay=100)
+            else:
+                await self.page.fill(username_selector, self.config['username'])
             print(f"[로그인] 사용자명 입력 완료: {self.config['username']}")
             await self.random_delay(0.5, 1.0)
             
@@ -995,9 +1576,12 @@ class MacroBot:
             await self.page.click(password_selector)
             await self.random_delay(0.3, 0.5)
             
-            # 기존 내용 지우고 입력
-            await self.page.fill(password_selector, '')
-            await self.page.type(password_selector, self.config['password'], delay=100)
+            # 기존 내용 지우고 입력 (humanize_typing이 아니면 fill로 한 번에)
+            if self.config.get('humanize_typing', False):
+                await self.page.fill(password_selector, '')
+                await self.page.type(password_selector, self.config['password'], delay=100)
+            else:
+                await self.page.fill(password_selector, self.config['password'])
             print("[로그인] 비밀번호 입력 완료")
             await self.random_delay(0.5, 1.0)
             
@@ -1041,13 +1625,13 @@ class MacroBot:
             await self.random_delay(2, 4)
             
             print("[로그인] 로그인 완료")
+            await self._save_storage_state()
             return True
             
         except Exception as e:
             print(f"[오류] 로그인 실패: {e}")
             # 스크린샷 저장 (디버깅용)
-            await self.page.screenshot(path='login_error.png')
-            print("[디버깅] 오류 스크린샷 저장: login_error.png")
+            await self._save_debug_screenshot('login_error')
             return False
     
     async def get_post_links(self) -> list:
@@ -1059,29 +1643,30 @@ class MacroBot:
         # 게시글 링크 선택자 (실제 사이트에 맞게 수정 필요)
         post_link_selector = self.config.get('post_link_selector', 'a.post-link')
         
+        base_url = self.config['url'].rstrip('/')
+        
+        def to_full_url(href):
+            # 상대 경로를 절대 경로로 변환
+            if not href:
+                return None
+            if href.startswith('/'):
+                return f"{base_url}{href}"
+            if href.startswith('http'):
+                return href
+            return None
+        
         try:
-            # 게시글 링크들 가져오기
-            links = await self.page.query_selector_all(post_link_selector)
-            post_urls = []
-            
-            for link in links:
-                href = await link.get_attribute('href')
-                if href:
-                    # 상대 경로를 절대 경로로 변환
-                    if href.startswith('/'):
-                        base_url = self.config['url']
-                        full_url = f"{base_url.rstrip('/')}{href}"
-                    elif href.startswith('http'):
-                        full_url = href
-                    else:
-                        continue
-                    
-                    post_urls.append(full_url)
+            # 게시글 링크들의 href를 한 번의 evaluate로 가져오기
+            hrefs = await self.page.eval_on_selector_all(
+                post_link_selector, "els => els.map(el => el.getAttribute('href'))"
+            )
+            max_posts = self.config.get('max_posts', 10)
+            # 중복 제거 (순서 유지)
+            post_urls = dict.fromkeys(url for url in map(to_full_url, hrefs) if url)
             
-            # 중복 제거
-            post_urls = list(set(post_urls))
+            post_urls = list(post_urls)
             print(f"[게시판] {len(post_urls)}개의 게시글을 찾았습니다.")
-            return post_urls[:self.config.get('max_posts', 10)]  # 최대 개수 제한
+            return post_urls[:max_posts]  # 최대 개수 제한
             
         except Exception as e:
             print(f"[오류] 게시글 링크 가져오기 실패: {e}")
@@ -1104,7 +1689,7 @@ class MacroBot:
                         const el = document.querySelector(sel);
                         if (el) {
                             // 텍스트 내용에서 날짜/시간 추출
-                            const text = el.textContent || el.innerText;
+                            const text = el.textContent;
                             if (text) {
                                 // "25-11-26 13:22" 형식 추출 (oncapan.com 형식)
                                 const dateMatch = text.match(/\\d{2}-\\d{2}-\\d{2}\\s+\\d{1,2}:\\d{2}/);
@@ -1139,7 +1724,7 @@ class MacroBot:
                                 return el.getAttribute('datetime');
                             }
                             // 텍스트 내용 확인
-                            const text = el.textContent || el.innerText;
+                            const text = el.textContent;
                             if (text && text.trim()) {
                                 return text.trim();
                             }
@@ -1147,7 +1732,7 @@ class MacroBot:
                     }
                     
                     // 모든 시간 관련 텍스트 찾기
-                    const allText = document.body.innerText || document.body.textContent;
+                    const allText = document.body.textContent;  // innerText는 레이아웃 계산을 일으키므로 사용하지 않음
                     const datePattern = /\\d{2}-\\d{2}-\\d{2}\\s+\\d{1,2}:\\d{2}/;  // oncapan.com 형식 우선
                     const match = allText.match(datePattern);
                     if (match) {
@@ -1168,38 +1753,57 @@ class MacroBot:
             if not date_text:
                 return None
             
-            # 날짜 파싱 (oncapan.com 형식 우선)
-            date_formats = [
-                '%y-%m-%d %H:%M',           # oncapan.com 형식: "25-11-26 13:22" (우선순위 1)
-                '%y-%m-%d %H:%M:%S',        # oncapan.com 형식: "25-11-26 13:22:00"
-                '%Y-%m-%d %H:%M:%S',        # 표준 형식: "2025-11-26 13:22:00"
-                '%Y-%m-%d %H:%M',           # 표준 형식: "2025-11-26 13:22"
-                '%Y.%m.%d %H:%M',           # 점 구분: "2025.11.26 13:22"
-                '%Y/%m/%d %H:%M',           # 슬래시 구분: "2025/11/26 13:22"
-                '%y-%m-%d',                 # oncapan.com 날짜만: "25-11-26"
-                '%Y-%m-%d',                 # 표준 날짜만: "2025-11-26"
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    parsed_date = datetime.strptime(date_text, fmt)
-                    # 2자리 연도(YY)인 경우 2000년대로 변환
-                    if fmt.startswith('%y'):
-                        current_year = datetime.now().year
-                        parsed_year = parsed_date.year
-                        # 1900년대면 2000년대로 변환
-                        if parsed_year < 2000:
-                            parsed_date = parsed_date.replace(year=parsed_year + 100)
-                    return parsed_date
-                except:
-                    continue
-            
-            return None
+            # 날짜 파싱 (정규식으로 형태를 먼저 확인해서 예외 없이 변환, 상대 시간도 처리)
+            return _parse_post_datetime(date_text)
             
         except Exception as e:
             print(f"[경고] 현재 페이지에서 게시글 작성 시간을 가져오는 중 오류: {e}")
             return None
     
+    async def _fetch_html(self, url: str):
+        """브라우저를 거치지 않고 로그인 쿠키를 붙여 페이지 HTML만 받기 (실패하면 None)"""
+        try:
+            parts = urlsplit(url)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            cached = self._site_cookie_header
+            if (cached is None or cached[0] != origin) and self.context:
+                # 로그인된 브라우저의 쿠키 중 요청할 사이트에 보낼 쿠키만 옮겨 담음 (광고/분석 등 다른 도메인 쿠키 제외)
+                cookies = await self.context.cookies(url)
+                cached = (origin, '; '.join(f"{c['name']}={c['value']}" for c in cookies))
+                self._site_cookie_header = cached
+            session = await self._ensure_site_session()
+            headers = {'Cookie': cached[1]} if cached and cached[1] else None
+            async with session.get(url, headers=headers) as response:
+                # 세션이 만료되어 로그인 페이지로 보내졌으면 다음 요청 때 쿠키를 다시 가져옴
+                login_url = self.config.get('login_url', '')
+                if response.status in (401, 403) or (login_url and str(response.url).startswith(login_url)):
+                    self._site_cookie_header = None
+                    return None
+                if response.status != 200:
+                    return None
+                return await response.text()
+        except Exception as e:
+            log.debug(f"[디버깅] HTML 요청 실패 ({url}): {e}")
+            return None
+    
+    async def _fetch_post_date_http(self, post_url: str):
+        """브라우저 이동 없이 게시글 HTML만 받아서 작성 시간 추출 (실패하거나 못 찾으면 None)"""
+        page_html = await self._fetch_html(post_url)
+        if not page_html:
+            return None
+        
+        # oncapan.com 작성일 (strong.if_date) 영역에서 "25-11-26 13:22" 또는 "25-11-26" 형식 추출
+        area = _POST_DATE_AREA_RE.search(page_html)
+        if not area:
+            return None
+        match = _POST_DATE_TEXT_RE.search(area.group(1))
+        if not match:
+            return None
+        try:
+            return datetime.strptime(f"{match.group(1)} {match.group(2) or '00:00'}", '%y-%m-%d %H:%M')
+        except ValueError:
+            return None
+    
     async def get_post_date(self, post_url: str = None) -> datetime:
         """게시글의 작성 시간 가져오기 (현재 페이지 또는 지정된 URL)"""
         try:
@@ -1207,158 +1811,66 @@ class MacroBot:
             if not post_url:
                 return await self.get_post_date_from_current_page()
             
-            # 게시글 페이지 접속
-            await self.page.goto(post_url, wait_until='networkidle')
-            await self.random_delay(1, 2)
+            # 최근에 확인한 게시글이면 다시 접속하지 않음 (찾은 시간은 10분, 못 찾은 경우는 30초 동안 유지)
+            cached = self._post_date_cache.get(_strip_query_fragment(post_url))
+            if cached is not None:
+                cached_date, cached_at = cached
+                ttl = _POST_DATE_CACHE_TTL if cached_date else _POST_DATE_MISS_TTL
+                if time.time() - cached_at < ttl:
+                    return cached_date
+            
+            # 먼저 HTML만 받아서 확인하고, 못 찾으면 게시글 페이지에 접속해서 확인
+            post_date = await self._fetch_post_date_http(post_url)
+            if post_date is None:
+                # 게시글 페이지 접속 (작성 시간 글자만 필요하므로 DOM 로드까지만 대기)
+                await self.page.goto(post_url, wait_until='domcontentloaded')
+                await self.random_delay(1, 2)
+                
+                # 현재 페이지에서 작성 시간 가져오기
+                post_date = await self.get_post_date_from_current_page()
+            self._store_post_date(post_url, post_date)
+            return post_date
             
-            # 현재 페이지에서 작성 시간 가져오기
-            return await self.get_post_date_from_current_page()
-            
-            # 작성 시간을 찾는 여러 방법 시도 (oncapan.com 구조 반영)
-            date_text = await self.page.evaluate("""
-                () => {
-                    // oncapan.com 작성 시간 선택자 (우선순위 1)
-                    const oncapanSelectors = [
-                        'strong.if_date',           // oncapan.com 작성일
-                        '.if_date',                 // oncapan.com 작성일 (변형)
-                        'strong[class*="date"]',    // 날짜 관련 strong 태그
-                    ];
-                    
-                    for (const sel of oncapanSelectors) {
-                        const el = document.querySelector(sel);
-                        if (el) {
-                            // 텍스트 내용에서 날짜/시간 추출
-                            const text = el.textContent || el.innerText;
-                            if (text) {
-                                // "25-11-26 13:22" 형식 추출 (oncapan.com 형식)
-                                const dateMatch = text.match(/\\d{2}-\\d{2}-\\d{2}\\s+\\d{1,2}:\\d{2}/);
-                                if (dateMatch) {
-                                    return dateMatch[0];
-                                }
-                                // "25-11-26" 형식 (시간 없음)
-                                const dateMatch2 = text.match(/\\d{2}-\\d{2}-\\d{2}/);
-                                if (dateMatch2) {
-                                    return dateMatch2[0] + ' 00:00';  // 시간이 없으면 00:00으로 설정
-                                }
-                            }
-                        }
-                    }
-                    
-                    // 일반적인 작성 시간 선택자들
-                    const selectors = [
-                        '.date',
-                        '.datetime',
-                        '.write_date',
-                        '[class*="date"]',
-                        '[class*="time"]',
-                        'time',
-                        '[datetime]'
-                    ];
-                    
-                    for (const sel of selectors) {
-                        const el = document.querySelector(sel);
-                        if (el) {
-                            // datetime 속성 확인
-                            if (el.getAttribute('datetime')) {
-                                return el.getAttribute('datetime');
-                            }
-                            // 텍스트 내용 확인
-                            const text = el.textContent || el.innerText;
-                            if (text && text.trim()) {
-                                return text.trim();
-                            }
-                        }
-                    }
-                    
-                    // 모든 시간 관련 텍스트 찾기
-                    const allText = document.body.innerText || document.body.textContent;
-                    const datePattern = /\\d{2}-\\d{2}-\\d{2}\\s+\\d{1,2}:\\d{2}/;  // oncapan.com 형식 우선
-                    const match = allText.match(datePattern);
-                    if (match) {
-                        return match[0];
-                    }
-                    
-                    // 다른 형식도 시도
-                    const datePattern2 = /\\d{4}[.-/]\\d{1,2}[.-/]\\d{1,2}/;
-                    const match2 = allText.match(datePattern2);
-                    if (match2) {
-                        return match2[0];
-                    }
-                    
-                    return null;
-                }
-            """)
-            
-            if not date_text:
-                return None
-            
-            # 날짜 파싱 시도 (oncapan.com 형식 포함)
-            date_formats = [
-                '%y-%m-%d %H:%M',           # oncapan.com 형식: "25-11-25 22:06" (우선순위 1)
-                '%y-%m-%d %H:%M:%S',        # oncapan.com 형식: "25-11-25 22:06:00"
-                '%Y-%m-%d %H:%M:%S',        # 표준 형식: "2025-11-25 22:06:00"
-                '%Y-%m-%d %H:%M',           # 표준 형식: "2025-11-25 22:06"
-                '%Y.%m.%d %H:%M',           # 점 구분: "2025.11.25 22:06"
-                '%Y/%m/%d %H:%M',           # 슬래시 구분: "2025/11/25 22:06"
-                '%y-%m-%d',                 # oncapan.com 날짜만: "25-11-25"
-                '%Y-%m-%d',                 # 표준 날짜만: "2025-11-25"
-                '%Y.%m.%d',                 # 점 구분 날짜만: "2025.11.25"
-                '%Y/%m/%d',                 # 슬래시 구분 날짜만: "2025/11/25"
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    parsed_date = datetime.strptime(date_text, fmt)
-                    # 2자리 연도(YY)인 경우 2000년대로 변환
-                    if fmt.startswith('%y'):
-                        # 현재 연도 기준으로 가까운 연도 선택
-                        current_year = datetime.now().year
-                        parsed_year = parsed_date.year
-                        # 1900년대면 2000년대로 변환
-                        if parsed_year < 2000:
-                            parsed_date = parsed_date.replace(year=parsed_year + 100)
-                        # 현재 연도보다 크면 과거 연도로 간주 (예: 25년이면 2025년)
-                        elif parsed_year > current_year:
-                            # 이미 올바른 연도일 수 있음
-                            pass
-                    return parsed_date
-                except:
-                    continue
-            
-            # 상대 시간 파싱 (예: "1시간 전", "2일 전")
-            relative_patterns = [
-                (r'(\d+)분\s*전', 'minutes'),
-                (r'(\d+)시간\s*전', 'hours'),
-                (r'(\d+)일\s*전', 'days'),
-                (r'(\d+)주\s*전', 'weeks'),
-            ]
-            
-            for pattern, unit in relative_patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    value = int(match.group(1))
-                    if unit == 'minutes':
-                        return datetime.now() - timedelta(minutes=value)
-                    elif unit == 'hours':
-                        return datetime.now() - timedelta(hours=value)
-                    elif unit == 'days':
-                        return datetime.now() - timedelta(days=value)
-                    elif unit == 'weeks':
-                        return datetime.now() - timedelta(weeks=value)
-            
-            return None
-            
-        except Exception as e:
-            print(f"[경고] 게시글 작성 시간을 가져오는 중 오류: {e}")
-            return None
-    
-    async def is_post_within_24h(self, post_url: str) -> bool:
-        """게시글이 24시간 이내인지 확인"""
-        # 현재 URL 저장 (게시판 복귀용)
-        current_url_before = self.page.url
-        
-        try:
-            post_date = await self.get_post_date(post_url)
+        except Exception as e:
+            print(f"[경고] 게시글 작성 시간을 가져오는 중 오류: {e}")
+            return None
+    
+    def _store_post_date(self, post_url: str, post_date):
+        """게시글 작성 시간을 캐시에 저장하면서 유효 시간이 지난 항목 정리"""
+        now = time.time()
+        cache = self._post_date_cache
+        expired = [k for k, (cached_date, cached_at) in cache.items()
+                   if now - cached_at >= (_POST_DATE_CACHE_TTL if cached_date else _POST_DATE_MISS_TTL)]
+        for key in expired:
+            del cache[key]
+        cache[_strip_query_fragment(post_url)] = (post_date, now)
+    
+    async def _find_expired_posts(self, urls: list, concurrency: int = 4) -> set:
+        """게시글들의 작성 시간을 동시에 확인해서 24시간이 지난 게시글 URL 반환 (확인 못 한 게시글은 제외하지 않음)"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(url):
+            async with semaphore:
+                return await self._fetch_post_date_http(url)
+        
+        dates = await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+        now = datetime.now()
+        expired = set()
+        for url, post_date in zip(urls, dates):
+            if isinstance(post_date, datetime):
+                self._store_post_date(url, post_date)
+                if (now - post_date).total_seconds() > 24 * 3600:
+                    print(f"[필터링] 24시간 초과 게시글 제외: {url} (시간: {post_date:%y-%m-%d %H:%M})")
+                    expired.add(url)
+        return expired
+    
+    async def is_post_within_24h(self, post_url: str) -> bool:
+        """게시글이 24시간 이내인지 확인"""
+        # 현재 URL 저장 (게시판 복귀용)
+        current_url_before = self.page.url
+        
+        try:
+            post_date = await self.get_post_date(post_url)
             
             if not post_date:
                 print("[경고] 게시글 작성 시간을 확인할 수 없습니다. 댓글을 작성합니다.")
@@ -1434,17 +1946,19 @@ class MacroBot:
             posts_data = await self.page.evaluate("""
                 () => {
                     const posts = [];
-                    // 게시글 목록 li 태그 찾기
-                    const listItems = document.querySelectorAll('.list_01 li, #bo_list li, li.bo_notice, li:not(.bo_notice)');
+                    const seen = new Set();
+                    // 페이지의 모든 li 대신 게시글 링크만 찾고, 링크가 속한 li에서 시간 정보 확인
+                    // (같은 게시글은 한 번만 반환해서 전달하는 데이터 크기를 줄임)
+                    const links = document.querySelectorAll('li a[href*="/bbs/free/"]');
                     
-                    for (const li of listItems) {
-                        // 게시글 링크 찾기
-                        const link = li.querySelector('a[href*="/bbs/free/"]');
-                        if (!link) continue;
-                        
+                    for (const link of links) {
                         const href = link.href;
                         // 게시글 ID 패턴 확인
-                        if (!/\\/bbs\\/free\\/\\d+/.test(href)) continue;
+                        if (!/\\/bbs\\/free\\/\\d+(?:[?#]|$)/.test(href)) continue;
+                        const cleanHref = href.split(/[?#]/, 1)[0];  // 쿼리 파라미터/앵커 제거
+                        if (seen.has(cleanHref)) continue;
+                        seen.add(cleanHref);
+                        const li = link.closest('li');
                         
                         // 시간 정보 찾기 (여러 패턴 시도)
                         let timeText = null;
@@ -1462,7 +1976,7 @@ class MacroBot:
                         
                         // 방법 2: li 내부의 모든 텍스트에서 시간 패턴 찾기
                         if (!timeText) {
-                            const liText = li.textContent || li.innerText;
+                            const liText = li.textContent;
                             // "16:25" 형식 찾기
                             const timeMatch = liText.match(/\\d{1,2}:\\d{2}/);
                             if (timeMatch) {
@@ -1477,7 +1991,7 @@ class MacroBot:
                         }
                         
                         posts.push({
-                            href: href.split('?')[0].split('#')[0],  // 쿼리 파라미터 제거
+                            href: cleanHref,
                             timeText: timeText
                         });
                     }
@@ -1488,26 +2002,27 @@ class MacroBot:
             
             print(f"[게시판] JavaScript로 {len(posts_data)}개의 게시글을 발견했습니다.")
             
-            # 게시글 링크와 시간 정보를 함께 저장
+            # 게시글 링크와 시간 정보를 함께 저장 (중복/처리한 게시글 제외를 한 번에 처리)
             posts_with_time = []
+            seen = set()
             for post_data in posts_data:
                 href = post_data.get('href', '')
                 time_text = post_data.get('timeText', '')
                 
-                if not href:
+                # 게시글 링크 패턴은 JavaScript에서 이미 확인했으므로 중복/처리 여부만 확인
+                if not href or href in seen or href in processed_urls:
                     continue
                 
-                # 게시글 링크 패턴 확인
-                if re.search(r'/bbs/free/\d+', href):
-                    if href not in processed_urls:
-                        posts_with_time.append({
-                            'url': href,
-                            'time': time_text
-                        })
+                seen.add(href)
+                posts_with_time.append({
+                    'url': href,
+                    'time': time_text
+                })
             
             # 시간 정보로 24시간 이내 게시글 필터링
             now = datetime.now()
             all_urls = []
+            unverified_urls = set()  # 목록에서 시간을 확인하지 못한 게시글 (아래에서 한 번에 확인)
             
             for post_info in posts_with_time:
                 url = post_info['url']
@@ -1516,6 +2031,7 @@ class MacroBot:
                 if not time_text:
                     # 시간 정보가 없으면 일단 추가 (나중에 게시글 페이지에서 확인)
                     all_urls.append(url)
+                    unverified_urls.add(url)
                     continue
                 
                 # 시간 파싱
@@ -1523,7 +2039,7 @@ class MacroBot:
                 
                 try:
                     # 형식 1: "16:25" (오늘 시간)
-                    if re.match(r'^\d{1,2}:\d{2}$', time_text):
+                    if _TIME_HHMM_RE.match(time_text):
                         hour, minute = map(int, time_text.split(':'))
                         post_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
                         
@@ -1538,7 +2054,7 @@ class MacroBot:
                         is_within_24h = time_diff.total_seconds() <= 24 * 3600
                     
                     # 형식 2: "11-21" (월-일 형식)
-                    elif re.match(r'^\d{2}-\d{2}$', time_text):
+                    elif _DATE_MMDD_RE.match(time_text):
                         month, day = map(int, time_text.split('-'))
                         current_year = now.year
                         post_time = datetime(current_year, month, day, 0, 0, 0)
@@ -1551,7 +2067,7 @@ class MacroBot:
                         is_within_24h = time_diff.total_seconds() <= 24 * 3600
                     
                     # 형식 3: "25-11-26 13:22" (oncapan.com 형식)
-                    elif re.match(r'^\d{2}-\d{2}-\d{2}\s+\d{1,2}:\d{2}', time_text):
+                    elif _DATETIME_YYMMDD_RE.match(time_text):
                         try:
                             post_time = datetime.strptime(time_text, '%y-%m-%d %H:%M')
                             # 2자리 연도 처리
@@ -1562,6 +2078,7 @@ class MacroBot:
                         except:
                             # 파싱 실패 시 추가 (나중에 확인)
                             all_urls.append(url)
+                            unverified_urls.add(url)
                             continue
                     
                     if is_within_24h:
@@ -1574,9 +2091,7 @@ class MacroBot:
                     # 시간 파싱 실패 시 일단 추가 (나중에 게시글 페이지에서 확인)
                     print(f"[경고] 시간 파싱 실패 ({time_text}): {e}, 게시글 페이지에서 재확인 예정")
                     all_urls.append(url)
-            
-            # 중복 제거 (순서 유지)
-            all_urls = list(dict.fromkeys(all_urls))
+                    unverified_urls.add(url)
             
             if not all_urls:
                 # 방법 2: CSS 선택자로 다시 시도
@@ -1602,37 +2117,34 @@ class MacroBot:
                             continue
                         
                         # 게시글 링크 패턴 확인
-                        if post_pattern.search(full_url):
-                            clean_url = full_url.split('?')[0].split('#')[0]
-                            if clean_url not in processed_urls:
+                        if _FREE_BOARD_POST_RE.search(full_url):
+                            clean_url = _strip_query_fragment(full_url)
+                            if clean_url not in seen and clean_url not in processed_urls:
+                                seen.add(clean_url)
                                 all_urls.append(clean_url)
-                    
-                    # 중복 제거
-                    all_urls = list(dict.fromkeys(all_urls))
                 except Exception as e:
                     print(f"[게시판] CSS 선택자 시도 실패: {e}")
             
             if not all_urls:
                 # 디버깅: 페이지 정보 출력
                 print("[게시판] 게시글 링크를 찾을 수 없습니다.")
-                print("[디버깅] 페이지 분석 중...")
+                log.debug("[디버깅] 페이지 분석 중...")
                 
                 # 페이지 제목 확인
                 page_title = await self.page.title()
-                print(f"[디버깅] 페이지 제목: {page_title}")
+                log.debug(f"[디버깅] 페이지 제목: {page_title}")
                 
                 # 현재 URL 확인
-                print(f"[디버깅] 현재 URL: {self.page.url}")
+                log.debug(f"[디버깅] 현재 URL: {self.page.url}")
                 
                 # 발견된 게시글 샘플 출력
                 sample_posts = [post['href'] for post in posts_data[:20] if post.get('href')]
-                print(f"[디버깅] 발견된 게시글 샘플 (처음 10개):")
+                log.debug(f"[디버깅] 발견된 게시글 샘플 (처음 10개):")
                 for i, post_url in enumerate(sample_posts[:10], 1):
-                    print(f"  {i}. {post_url}")
+                    log.debug(f"  {i}. {post_url}")
                 
                 # 스크린샷 저장
-                await self.page.screenshot(path='board_debug.png')
-                print("[디버깅] 스크린샷 저장: board_debug.png")
+                await self._save_debug_screenshot('board_debug')
                 
                 return None
             
@@ -1641,8 +2153,6 @@ class MacroBot:
             # 순서 선택 (기본값: 랜덤)
             order = self.config.get('post_order', 'random')
             
-            # 24시간 이내 게시글만 필터링
-            valid_urls = []
             # 랜덤 모드일 때는 더 많은 게시글을 확인 (전체 범위에서 랜덤 선택)
             if order == 'random':
                 max_check = min(50, len(all_urls))  # 랜덤 모드: 최대 50개 확인
@@ -1651,130 +2161,234 @@ class MacroBot:
             
             print(f"[게시판] {max_check}개의 게시글을 확인 중... (모드: {order})")
             
+            # 이미 댓글을 작성했거나 이번 실행에서 처리한 게시글은 작성 시간을 확인하기 전에 먼저 제외
+            candidates = []
             for url in all_urls[:max_check]:
-                # 이미 댓글을 작성한 게시글은 건너뛰기
                 if url in self.commented_posts:
                     print(f"[중복방지] 이미 댓글 작성한 게시글 건너뛰기: {url}")
-                    continue
-                
-                # 이번 실행에서 이미 처리한 게시글은 건너뛰기
-                if url in processed_urls:
+                elif url in processed_urls:
                     print(f"[중복방지] 이번 실행에서 이미 처리한 게시글 건너뛰기: {url}")
-                    continue
-                
-                # 목록 페이지에서 이미 24시간 이내 게시글만 필터링했으므로
-                # 여기서는 중복 확인만 수행
-                valid_urls.append(url)
-                
-                # 최신순 모드에서는 첫 번째 유효한 게시글을 찾으면 중단
-                if order == 'latest':
+                else:
+                    candidates.append(url)
+            
+            # 선택 순서대로 후보를 정렬 (랜덤은 섞어서 앞에서부터 확인하면 후보 중 균등하게 하나를 고르는 것과 같음)
+            if order == 'random':
+                ordered = random.sample(candidates, len(candidates))
+            elif order == 'oldest':
+                ordered = candidates[::-1]
+            else:
+                ordered = candidates
+            
+            # 목록에서 시간을 확인하지 못한 게시글만 HTML로 확인하되, 한 번에 조금씩 간격을 두고 확인하다가 유효한 게시글을 찾으면 중단
+            selected_url = None
+            verified_once = False
+            for i in range(0, len(ordered), _POST_VERIFY_BATCH):
+                batch = ordered[i:i + _POST_VERIFY_BATCH]
+                to_verify = [url for url in batch if url in unverified_urls]
+                expired = set()
+                if to_verify:
+                    if verified_once:
+                        await self.random_delay(1, 2)
+                    expired = await self._find_expired_posts(to_verify, concurrency=_POST_VERIFY_BATCH)
+                    verified_once = True
+                selected_url = next((url for url in batch if url not in expired), None)
+                if selected_url:
                     break
             
-            if not valid_urls:
+            if not selected_url:
                 print("[게시판] 24시간 이내 게시글이 없습니다.")
                 return None
             
-            # 게시글 선택
             if order == 'random':
-                selected_url = random.choice(valid_urls)
-                print(f"[게시판] 랜덤으로 게시글 선택: {selected_url} (후보 {len(valid_urls)}개 중)")
+                print(f"[게시판] 랜덤으로 게시글 선택: {selected_url} (후보 {len(candidates)}개 중)")
             elif order == 'oldest':
-                # 가장 오래된 게시글 선택 (리스트의 마지막)
-                selected_url = valid_urls[-1]
-                print(f"[게시판] 오래된 순으로 게시글 선택: {selected_url} (후보 {len(valid_urls)}개 중)")
+                print(f"[게시판] 오래된 순으로 게시글 선택: {selected_url} (후보 {len(candidates)}개 중)")
             else:  # latest
-                selected_url = valid_urls[0]
                 print(f"[게시판] 최신순으로 게시글 선택: {selected_url}")
             
             return selected_url
             
         except Exception as e:
-            print(f"[오류] 다음 게시글 링크 가져오기 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"[오류] 다음 게시글 링크 가져오기 실패: {e}")
             # 스크린샷 저장
-            try:
-                await self.page.screenshot(path='error_debug.png')
-                print("[디버깅] 오류 스크린샷 저장: error_debug.png")
-            except:
-                pass
+            await self._save_debug_screenshot('error_debug')
             return None
     
     # Gemini 함수 제거됨 - OpenAI만 사용
     
-    async def get_post_title(self) -> str:
-        """게시글 제목 가져오기"""
+    async def _save_debug_screenshot(self, name: str):
+        """디버깅용 스크린샷 저장 (LOG_LEVEL이 DEBUG일 때만, 보이는 화면만 JPEG로 저장)"""
+        if not self._verbose:
+            return
+        path = f'{name}.jpg'
         try:
-            # 게시글 제목 선택자들 (oncapan.com 구조 반영)
-            title_selectors = [
-                'span.bo_v_tit',            # oncapan.com 제목 (우선순위 1)
-                '#bo_v .bo_v_tit',          # oncapan.com 제목 (우선순위 2)
-                '#bo_v_atc .bo_v_tit',      # 그누보드 제목
-                '#bo_v_title .bo_v_tit',    # 그누보드 제목 변형
-                'h2#bo_v_title .bo_v_tit',  # 그누보드 제목 변형 2
-                '.view_title',              # 일반적인 제목
-                '.board_title',             # 게시판 제목
-                'h1',                       # HTML5 h1 태그
-                'h2',                       # HTML5 h2 태그
-                '.title',                   # title 클래스
-                '#title',                   # title ID
-                '[class*="title"]',         # title이 포함된 클래스
-                '[id*="title"]',            # title이 포함된 ID
-                '.subject',                 # subject 클래스
-                '#subject',                 # subject ID
-            ]
-            
-            title_text = ""
-            
-            for selector in title_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        title_text = await element.inner_text()
-                        if title_text and len(title_text.strip()) > 0:
-                            title_text = title_text.strip()
-                            print(f"[제목] ✅ 제목 찾음: {title_text[:50]}...")
-                            break
-                except Exception:
-                    continue
-            
-            # JavaScript로 직접 제목 찾기 (oncapan.com 구조 반영)
-            if not title_text:
-                title_text = await self.page.evaluate("""
-                    () => {
-                        const selectors = [
-                            'span.bo_v_tit',           // oncapan.com 제목 (우선순위 1)
-                            '#bo_v .bo_v_tit',         // oncapan.com 제목 (우선순위 2)
-                            '#bo_v_atc .bo_v_tit',     // 그누보드 제목
-                            '#bo_v_title .bo_v_tit',   // 그누보드 제목 변형
-                            'h2#bo_v_title .bo_v_tit', // 그누보드 제목 변형 2
-                            '.view_title',
-                            '.board_title',
-                            'h1',
-                            'h2',
-                            '.title',
-                            '#title',
-                            '[class*="title"]',
-                            '[id*="title"]',
-                            '.subject',
-                            '#subject'
-                        ];
-                        
+            await self.page.screenshot(path=path, type='jpeg', quality=60, full_page=False)
+            log.debug(f"[디버깅] 스크린샷 저장: {path}")
+        except Exception as e:
+            log.debug(f"[디버깅] 스크린샷 저장 실패 ({path}): {e}")
+    
+    async def _query_first_text(self, selectors: list, min_length: int = 0, body_fallback: bool = False) -> dict:
+        """선택자 목록 중 텍스트가 있는 첫 요소를 한 번의 evaluate로 찾기"""
+        return (await self._query_first_texts([(selectors, min_length, body_fallback)]))[0]
+    
+    async def _query_first_texts(self, queries: list) -> list:
+        """여러 (선택자 목록, 최소 길이, body 대체 여부) 조회를 한 번의 evaluate로 처리해 결과 목록 반환"""
+        return await self.page.evaluate("""
+            (queries) => queries.map(([selectors, minLength, bodyFallback]) => {
+                for (const sel of selectors) {
+                    let el = null;
+                    try {
+                        el = document.querySelector(sel);
+                    } catch (e) {
+                        continue;
+                    }
+                    if (el) {
+                        const text = (el.innerText || el.textContent || '').trim();
+                        if (text.length > minLength) {
+                            return {text: text, selector: sel};
+                        }
+                    }
+                }
+                if (bodyFallback && document.body) {
+                    // 본문이 없으면 body에서 긴 텍스트 찾기
+                    const bodyText = (document.body.innerText || document.body.textContent || '').trim();
+                    if (bodyText.length > minLength) {
+                        return {text: bodyText, selector: null};
+                    }
+                }
+                return {text: '', selector: null};
+            })
+        """, [[list(selectors), min_length, body_fallback] for selectors, min_length, body_fallback in queries])
+    
+    async def _wait_for_any_selector(self, selectors, timeout: int = 2000, state: str = 'visible', page=None):
+        """후보 선택자들을 하나의 복합 선택자로 한 번만 기다린 뒤 우선순위가 가장 높은 선택자 반환"""
+        page = page or self.page
+        css_selectors, playwright_only = _split_selectors(selectors)
+        
+        if css_selectors:
+            try:
+                await page.wait_for_selector(', '.join(css_selectors), timeout=timeout, state=state)
+                # 문서 순서가 아닌 목록 우선순위대로 실제 매칭된 선택자 찾기
+                matched = await page.evaluate("""
+                    ([selectors, visibleOnly]) => {
+                        const isVisible = (el) => el.getClientRects().length > 0 &&
+                            getComputedStyle(el).visibility !== 'hidden';
                         for (const sel of selectors) {
-                            const el = document.querySelector(sel);
-                            if (el) {
-                                const text = (el.innerText || el.textContent || '').trim();
-                                if (text && text.length > 0) {
-                                    return text;
-                                }
+                            let els = [];
+                            try {
+                                els = document.querySelectorAll(sel);
+                            } catch (e) {
+                                continue;
+                            }
+                            for (const el of els) {
+                                if (!visibleOnly || isVisible(el)) return sel;
                             }
                         }
-                        return '';
+                        return null;
                     }
-                """)
-                
-                if title_text:
-                    print(f"[제목] ✅ JavaScript로 제목 찾음: {title_text[:50]}...")
+                """, [css_selectors, state == 'visible'])
+                if matched:
+                    return matched
+            except Exception:
+                pass
+        
+        # Playwright 전용 선택자는 개별로 짧게 시도
+        for selector in playwright_only:
+            try:
+                await page.wait_for_selector(selector, timeout=500, state=state)
+                return selector
+            except Exception:
+                continue
+        return None
+    
+    async def _try_learned_selector(self, attr: str):
+        """이전 게시글에서 성공한 선택자를 짧은 타임아웃으로 먼저 시도"""
+        selector = getattr(self, attr)
+        if not selector:
+            return None
+        try:
+            await self.page.wait_for_selector(selector, timeout=500, state='visible')
+            self._learned_selector_misses[attr] = 0
+            return selector
+        except Exception:
+            misses = self._learned_selector_misses.get(attr, 0) + 1
+            if misses >= 2:
+                print(f"[댓글] 학습된 선택자가 연속으로 실패하여 폐기합니다: {selector}")
+                setattr(self, attr, None)
+                misses = 0
+            self._learned_selector_misses[attr] = misses
+            return None
+    
+    async def _get_page_html(self, limit: int = 200000) -> str:
+        """page.content() 대신 앞부분만 잘라서 가져오기 (디버깅 저장용, 선택자 판단에는 사용하지 않음)"""
+        return await self.page.evaluate(
+            "(limit) => document.documentElement.outerHTML.slice(0, limit)", limit
+        )
+    
+    async def _filter_selectors_by_dom(self, selectors) -> list:
+        """현재 DOM에서 일치하는 요소가 없는 선택자를 미리 제외 (한 번의 evaluate, 잘린 HTML 대신 실제 DOM 기준)
+        
+        브라우저 CSS로 해석할 수 없는 Playwright 전용 선택자는 판단하지 않고 유지
+        """
+        selectors = list(selectors)
+        keep = await self.page.evaluate("""
+            (selectors) => selectors.map(sel => {
+                try {
+                    return document.querySelector(sel) !== null;
+                } catch (e) {
+                    return true;
+                }
+            })
+        """, selectors)
+        candidates = [sel for sel, ok in zip(selectors, keep) if ok]
+        return candidates or selectors
+    
+    async def _print_debug_elements(self, groups: dict, limit: int = 10):
+        """디버깅용 요소 정보를 그룹별로 한 번의 evaluate로 수집해 출력 (그룹당 처음 limit개)"""
+        try:
+            results = await self.page.evaluate("""
+                ([groups, limit]) => {
+                    const out = {};
+                    for (const [label, selector] of Object.entries(groups)) {
+                        const els = Array.from(document.querySelectorAll(selector));
+                        out[label] = {
+                            count: els.length,
+                            items: els.slice(0, limit).map(el => ({
+                                tag: el.tagName, type: el.type, name: el.name, id: el.id,
+                                value: el.value, class: el.className, placeholder: el.placeholder,
+                                text: (el.textContent || '').substring(0, 20),
+                                visible: el.offsetParent !== null
+                            }))
+                        };
+                    }
+                    return out;
+                }
+            """, [groups, limit])
+        except Exception as debug_error:
+            log.debug(f"[디버깅] 요소 정보 수집 실패: {debug_error}")
+            return
+        for label, info in results.items():
+            log.debug(f"[디버깅] 발견된 {label} 요소 수: {info['count']}")
+            for i, item in enumerate(info['items']):
+                log.debug(f"[디버깅] {label} {i+1}: {item}")
+    
+    async def get_post_title_and_content(self) -> tuple:
+        """게시글 제목과 본문을 한 번의 evaluate로 함께 읽어서 (제목, 본문) 반환"""
+        found_title, found_content = await self._query_first_texts([
+            (_POST_TITLE_SELECTORS, 0, False),
+            (_POST_CONTENT_SELECTORS, 10, True),
+        ])
+        return await self.get_post_title(found_title), await self.get_post_content(found_content)
+    
+    async def get_post_title(self, found: dict = None) -> str:
+        """게시글 제목 가져오기 (found: 이미 조회한 결과가 있으면 재사용)"""
+        try:
+            # 선택자 목록을 한 번의 evaluate로 순회 (선택자마다 왕복하지 않도록)
+            if found is None:
+                found = await self._query_first_text(_POST_TITLE_SELECTORS)
+            title_text = found.get('text') or ""
+            if title_text:
+                print(f"[제목] ✅ 제목 찾음: {title_text[:50]}... (선택자: {found.get('selector')})")
             
             return title_text.strip() if title_text else ""
             
@@ -1782,88 +2396,21 @@ class MacroBot:
             print(f"[경고] 게시글 제목을 가져오는 중 오류: {e}")
             return ""
     
-    async def get_post_content(self) -> str:
-        """게시글 본문 내용 가져오기"""
+    async def get_post_content(self, found: dict = None) -> str:
+        """게시글 본문 내용 가져오기 (found: 이미 조회한 결과가 있으면 재사용)"""
         try:
             print("[본문] 본문 추출 시작...")
             
-            # 게시글 본문 선택자 (oncapan.com 및 일반적인 선택자들)
-            content_selectors = [
-                '#bo_v_con',           # 그누보드 기본 본문 영역
-                '.view_content',       # 일반적인 본문 영역
-                '.board_content',      # 게시판 본문
-                '.wr_content',         # 그누보드 본문
-                '#wr_content',         # 그누보드 본문 ID
-                '.content',             # 일반적인 content 클래스
-                'article',              # HTML5 article 태그
-                '[class*="content"]',  # content가 포함된 클래스
-                '[id*="content"]',      # content가 포함된 ID
-                '[class*="view"]',      # view가 포함된 클래스
-                '[id*="view"]',         # view가 포함된 ID
-            ]
-            
-            content_text = ""
-            used_selector = None
-            
-            for selector in content_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        content_text = await element.inner_text()
-                        if content_text and len(content_text.strip()) > 10:
-                            used_selector = selector
-                            print(f"[본문] ✅ 선택자 성공: {selector}")
-                            print(f"[본문] 읽은 본문 길이: {len(content_text)}자")
-                            print(f"[본문] 본문 미리보기: {content_text[:100]}...")
-                            break
-                except Exception as e:
-                    print(f"[본문] 선택자 {selector} 시도 실패: {e}")
-                    continue
+            # 선택자 목록을 한 번의 evaluate로 순회하고, 실패 시 body 텍스트 사용
+            if found is None:
+                found = await self._query_first_text(_POST_CONTENT_SELECTORS, min_length=10, body_fallback=True)
+            content_text = found.get('text') or ""
+            used_selector = found.get('selector')
             
-            # JavaScript로 직접 본문 찾기 (CSS 선택자 실패 시)
-            if not content_text or len(content_text.strip()) < 10:
-                print("[본문] CSS 선택자 실패, JavaScript로 본문 찾기 시도...")
-                content_text = await self.page.evaluate("""
-                    () => {
-                        // 그누보드 및 일반적인 본문 영역 찾기
-                        const selectors = [
-                            '#bo_v_con',
-                            '.view_content',
-                            '.board_content',
-                            '.wr_content',
-                            '#wr_content',
-                            'article',
-                            '[class*="content"]',
-                            '[id*="content"]',
-                            '[class*="view"]',
-                            '[id*="view"]'
-                        ];
-                        
-                        for (const sel of selectors) {
-                            const el = document.querySelector(sel);
-                            if (el) {
-                                const text = el.innerText || el.textContent;
-                                if (text && text.trim().length > 10) {
-                                    console.log('본문 찾음:', sel, '길이:', text.trim().length);
-                                    return text.trim();
-                                }
-                            }
-                        }
-                        
-                        // 본문이 없으면 body에서 긴 텍스트 찾기
-                        const bodyText = document.body.innerText || document.body.textContent;
-                        if (bodyText && bodyText.trim().length > 10) {
-                            console.log('Body에서 본문 추출, 길이:', bodyText.trim().length);
-                            return bodyText.trim();
-                        }
-                        return '';
-                    }
-                """)
-                
-                if content_text and len(content_text.strip()) > 10:
-                    print(f"[본문] ✅ JavaScript로 본문 찾기 성공")
-                    print(f"[본문] 읽은 본문 길이: {len(content_text)}자")
-                    print(f"[본문] 본문 미리보기: {content_text[:100]}...")
+            if content_text:
+                print(f"[본문] ✅ 본문 찾기 성공 (선택자: {used_selector or 'body'})")
+                print(f"[본문] 읽은 본문 길이: {len(content_text)}자")
+                print(f"[본문] 본문 미리보기: {content_text[:100]}...")
             
             # 본문 정리 (너무 길면 앞부분만)
             if content_text:
@@ -1886,7 +2433,7 @@ class MacroBot:
                         return {
                             title: document.title,
                             url: window.location.href,
-                            bodyTextLength: (document.body.innerText || document.body.textContent || '').trim().length,
+                            bodyTextLength: (document.body.textContent || '').trim().length,
                             hasBoVCon: !!document.querySelector('#bo_v_con'),
                             hasViewContent: !!document.querySelector('.view_content'),
                             hasWrContent: !!document.querySelector('.wr_content, #wr_content')
@@ -1898,13 +2445,19 @@ class MacroBot:
             return content_text
             
         except Exception as e:
-            print(f"[경고] 게시글 본문을 가져오는 중 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"[경고] 게시글 본문을 가져오는 중 오류: {e}")
             return ""
     
     def analyze_post_emotion(self, post_content: str, post_title: str = "") -> dict:
         """게시글 감정/상황 분석 (단순 휴리스틱)"""
+        result = self._analyze_post_emotion_cached(post_content, post_title)
+        # 캐시된 dict가 변경되지 않도록 복사해서 반환
+        return dict(result, raw_scores=dict(result['raw_scores']))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _analyze_post_emotion_cached(post_content: str, post_title: str = "") -> dict:
+        """analyze_post_emotion의 캐시용 본체"""
         combined_text = f"{post_title}\n{post_content}".lower()
         
         emotion_keywords = {
@@ -1941,7 +2494,9 @@ class MacroBot:
             'raw_scores': scores
         }
     
-    def classify_post_type(self, post_content: str, post_title: str = "") -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def classify_post_type(post_content: str, post_title: str = "") -> str:
         """게시글 유형 분류"""
         combined_text = f"{post_title}\n{post_content}"
         lower_text = combined_text.lower()
@@ -2001,6 +2556,12 @@ class MacroBot:
         """게시글 작성 시간 기반 맥락"""
         if not post_date:
             return {}
+        return dict(self._temporal_context_cached(post_date))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _temporal_context_cached(post_date: datetime) -> dict:
+        """get_temporal_context의 캐시용 본체"""
         
         hour = post_date.hour
         if 0 <= hour < 5:
@@ -2038,8 +2599,6 @@ class MacroBot:
     
     def analyze_comment_flow(self, existing_comments: list) -> dict:
         """댓글 흐름/중복도 분석"""
-        from difflib import SequenceMatcher
-        
         recent = [c for c in (existing_comments or []) if c and len(c.strip()) >= 2][-5:]
         if not recent:
             return {
@@ -2067,11 +2626,13 @@ class MacroBot:
         if not comment or not existing_comments:
             return False
         
-        from difflib import SequenceMatcher
         recent = [c for c in existing_comments if c and len(c.strip()) >= 2][-8:]
         for prev in recent:
-            ratio = SequenceMatcher(None, comment, prev).ratio()
-            if ratio >= threshold:
+            matcher = SequenceMatcher(None, comment, prev)
+            # real_quick_ratio/quick_ratio는 ratio의 상한값이므로 먼저 확인해 비싼 계산을 건너뜀
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            if matcher.ratio() >= threshold:
                 return True
         return False
     
@@ -2079,32 +2640,28 @@ class MacroBot:
         """도박 커뮤니티 특수 용어 감지"""
         if not text:
             return []
-        
-        terms = [
-            '노돌', '노발', '댓노', '포거래', '텅장', '역배', '정배', '환전', '먹튀', '페이백',
-            '야식쿱', '깡', '픽', '슬롯', '바카라', '포바', '부주력', '몰빵', '똥배', '정형'
-        ]
-        found = []
-        lower_text = text.lower()
-        for term in terms:
-            if term.lower() in lower_text:
-                found.append(term)
-        return found[:5]
+        return list(self._community_terms_cached(text))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _community_terms_cached(text: str) -> tuple:
+        """extract_community_terms의 캐시용 본체 (튜플 반환)"""
+        # 한 번의 정규식 스캔으로 등장한 용어를 모두 찾고, 용어 목록 순서대로 정렬
+        hits = set(_COMMUNITY_TERMS_RE.findall(text.lower()))
+        found = [term for term in _COMMUNITY_TERMS if term in hits]
+        return tuple(found[:5])
     
     def extract_common_words_from_comments(self, existing_comments: list) -> list:
         """기존 댓글들에서 자주 사용되는 핵심 단어/표현 추출"""
         if not existing_comments or len(existing_comments) == 0:
             return []
         
-        import re
-        from collections import Counter
-        
         # 모든 댓글을 합쳐서 단어 추출
         all_text = " ".join(existing_comments[:10])
         
         # 특수 기호 제거하지 않고 단어 추출 (한글, 영문, 숫자, 특수기호 포함)
         # 2-5글자 단어 추출
-        words = re.findall(r'[가-힣]{2,5}|[a-zA-Z]{2,5}', all_text)
+        words = _STYLE_WORD_RE.findall(all_text)
         
         # 빈도수 계산
         word_counts = Counter(words)
@@ -2126,7 +2683,6 @@ class MacroBot:
                                      prompt: str, ai_response: str, reason: str, final_comment: str):
         """AI 댓글 생성 과정을 메모장 파일에 기록"""
         try:
-            from datetime import datetime
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             log_file = 'AI_댓글_생성_로그.txt'
@@ -2172,7 +2728,6 @@ class MacroBot:
                                 ai_original_comment: str, final_comment: str, changes: list):
         """최종 댓글 작성 직전에 기록 (후처리 후 실제 작성되는 댓글)"""
         try:
-            from datetime import datetime
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             log_file = 'AI_댓글_생성_로그.txt'
@@ -2257,6 +2812,15 @@ class MacroBot:
     
     def analyze_comment_style(self, existing_comments: list) -> dict:
         """기존 댓글들의 말투 스타일 분석 (더 정확하게)"""
+        # 같은 게시글의 댓글로 여러 번 호출되므로 분석 대상(최대 15개)을 키로 캐시
+        style = self._analyze_comment_style_cached(tuple(existing_comments[:15]) if existing_comments else ())
+        # 캐시된 dict가 변경되지 않도록 복사해서 반환
+        return dict(style, common_endings=list(style['common_endings']))
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _analyze_comment_style_cached(existing_comments: tuple) -> dict:
+        """analyze_comment_style의 캐시용 본체"""
         if not existing_comments or len(existing_comments) == 0:
             return {
                 'ending': '',  # 기본값 없음 (강제하지 않음)
@@ -2295,43 +2859,15 @@ class MacroBot:
                 has_ㅠ_count += 1
                 has_emoji_count += 1
             
-            # 끝말 분석 (더 정확하게)
-            comment_clean = comment.rstrip('~!?ㅠㅜㅎㅋ')
-            if comment_clean.endswith('요'):
-                endings.append('요')
-            elif comment_clean.endswith('네요'):
-                endings.append('네요')
-            elif comment_clean.endswith('어요'):
-                endings.append('어요')
-            elif comment_clean.endswith('해요'):
-                endings.append('해요')
-            elif comment_clean.endswith('되요'):
-                endings.append('되요')
-            elif comment_clean.endswith('다요'):
-                endings.append('다요')
-            elif comment_clean.endswith('세요'):
-                endings.append('세요')
-            elif comment_clean.endswith('까요'):
-                endings.append('까요')
-            elif comment_clean.endswith('나요'):
-                endings.append('나요')
-            elif comment_clean.endswith('지요'):
-                endings.append('지요')
-            elif comment_clean.endswith('죠'):
-                endings.append('죠')
-            elif comment_clean.endswith('다'):
-                endings.append('다')
-            elif comment_clean.endswith('어'):
-                endings.append('어')
-            elif comment_clean.endswith('해'):
-                endings.append('해')
-            elif comment_clean.endswith('야'):
-                endings.append('야')
+            # 끝말 분석: '요'가 가장 먼저 검사되므로 네요/어요/세요 등도 모두 '요'로 집계됨
+            # → 마지막 한 글자만 보면 되므로 집합 조회 한 번으로 처리
+            last_char = comment.rstrip('~!?ㅠㅜㅎㅋ')[-1:]
+            if last_char in _STYLE_ENDING_CHARS:
+                endings.append(last_char)
             # 끝말이 없는 경우도 허용 (예: "냠냠꾼!", "천포 냠냠~~")
             # 기본값을 강제하지 않음
         
         # 가장 많이 사용된 끝말들 (상위 3개)
-        from collections import Counter
         ending_counts = Counter(endings)
         common_endings = [ending for ending, count in ending_counts.most_common(3)]
         
@@ -2385,27 +2921,8 @@ class MacroBot:
         if comment_candidates:
             # 기존 댓글과 비슷하되 중복되지 않게 선택
             selected = random.choice(comment_candidates)
-            # 길이 제한 - 완전한 문장인지 확인 후 자르기
-            if len(selected) > 10:
-                # 어미가 있는지 확인
-                selected_clean = selected.rstrip('~!?ㅠㅜㅎㅋ').strip()
-                has_ending = bool(re.search(r'(요|죠|네요|어요|해요|되요|다요|세요|까요|나요|지요|다|어|해|되|까|나|세|지|야)$', selected_clean))
-                
-                if has_ending:
-                    # 어미가 있으면 어미를 보존하면서 앞부분만 자르기
-                    ending_match = re.search(r'(요|죠|네요|어요|해요|되요|다요|세요|까요|나요|지요|다|어|해|되|까|나|세|지|야)$', selected_clean)
-                    if ending_match:
-                        ending = ending_match.group(1)
-                        special_suffix = selected[len(selected_clean):]
-                        max_body_length = 10 - len(ending) - len(special_suffix)
-                        if max_body_length > 0:
-                            body = selected_clean[:-len(ending)]
-                            selected = body[:max_body_length] + ending + special_suffix
-                        else:
-                            selected = ending + special_suffix
-                else:
-                    # 어미가 없으면 그냥 10글자로 자르기
-                    selected = selected[:10]
+            # 길이 제한 - 완전한 문장이면 어미를 보존하면서 자르기
+            selected = _trim_keep_ending(selected, 10)
             
             # 기존 댓글 스타일에 맞춰 특수 기호 추가
             comment = self.enhance_tone_variation(selected, post_content, existing_comments)
@@ -2415,17 +2932,14 @@ class MacroBot:
             return comment
         
         # 기존 댓글에서 추출 실패 시 기본 댓글 사용 (끝말 강제 추가하지 않음)
-        base_comments = [
-            '힘내', '아쉽', '공감', '위로', '좋아', '응원', '화이팅',
-            '다음엔', '조심', '축하', '부럽', '대박'
-        ]
+        base_comments = _BASE_COMMENTS_NEUTRAL
         
         # 본문 내용에 맞는 키워드 추출
         if post_content:
-            if any(word in post_content for word in ['잃', '후회', '참담', '정신차리', '못하겠']):
-                base_comments = ['힘내', '아쉽', '공감', '위로', '다음엔', '조심']
-            elif any(word in post_content for word in ['땄', '성공', '이득', '좋아']):
-                base_comments = ['축하', '부럽', '대박', '좋아', '응원']
+            if any(word in post_content for word in _LOSS_KEYWORDS):
+                base_comments = _BASE_COMMENTS_LOSS
+            elif any(word in post_content for word in _WIN_KEYWORDS):
+                base_comments = _BASE_COMMENTS_WIN
         
         # 랜덤 선택
         comment = random.choice(base_comments)
@@ -2438,27 +2952,8 @@ class MacroBot:
             elif style['has_exclamation'] and random.random() < 0.5:
                 comment += '!'
         
-        # 길이 제한 (10글자) - 완전한 문장인지 확인 후 자르기
-        if len(comment) > 10:
-            # 어미가 있는지 확인
-            comment_clean = comment.rstrip('~!?ㅠㅜㅎㅋ').strip()
-            has_ending = bool(re.search(r'(요|죠|네요|어요|해요|되요|다요|세요|까요|나요|지요|다|어|해|되|까|나|세|지|야)$', comment_clean))
-            
-            if has_ending:
-                # 어미가 있으면 어미를 보존하면서 앞부분만 자르기
-                ending_match = re.search(r'(요|죠|네요|어요|해요|되요|다요|세요|까요|나요|지요|다|어|해|되|까|나|세|지|야)$', comment_clean)
-                if ending_match:
-                    ending = ending_match.group(1)
-                    special_suffix = comment[len(comment_clean):]
-                    max_body_length = 10 - len(ending) - len(special_suffix)
-                    if max_body_length > 0:
-                        body = comment_clean[:-len(ending)]
-                        comment = body[:max_body_length] + ending + special_suffix
-                    else:
-                        comment = ending + special_suffix
-            else:
-                # 어미가 없으면 그냥 10글자로 자르기
-                comment = comment[:10]
+        # 길이 제한 (10글자) - 완전한 문장이면 어미를 보존하면서 자르기
+        comment = _trim_keep_ending(comment, 10)
         
         if not self.has_meaningful_content(comment):
             comment = '지치네요'
@@ -2474,74 +2969,60 @@ class MacroBot:
         
         return comment
     
-    async def get_existing_comments(self) -> list:
-        """기존 댓글들 가져오기"""
+    async def get_existing_comments(self, count_only: bool = False):
+        """기존 댓글들 가져오기 (count_only=True면 댓글 목록 대신 개수만 반환)"""
         try:
             comments = []
             
             # JavaScript로 댓글 찾기 (정확한 구조 기반)
             comments_data = await self.page.evaluate("""
-                () => {
-                    let allComments = [];
+                (countOnly) => {
+                    // 세 가지 방법에 필요한 요소를 한 번의 DOM 탐색으로 모두 찾고 (문서 순서 유지)
+                    // 앞 방법에서 댓글을 찾지 못한 경우에만 다음 방법의 결과를 사용
+                    const byArticle = [];   // 방법 1: article[id^="c_"] (oncapan.com 구조, 가장 정확)
+                    const byTextarea = [];  // 방법 2: textarea[id^="save_comment_"] (백업 방법)
+                    const byContents = [];  // 방법 3: .cmt_contents (백업 방법)
+                    const nodes = document.querySelectorAll('article[id^="c_"], textarea[id^="save_comment_"], .cmt_contents');
                     
-                    // 방법 1: article[id^="c_"] 태그로 댓글 찾기 (oncapan.com 구조, 가장 정확)
-                    const commentArticles = document.querySelectorAll('article[id^="c_"]');
-                    commentArticles.forEach(article => {
-                        // 우선순위 1: textarea[id^="save_comment_"]에서 댓글 텍스트 가져오기 (oncapan.com)
-                        const textarea = article.querySelector('textarea[id^="save_comment_"]');
-                        if (textarea) {
-                            const text = (textarea.value || textarea.textContent || '').trim();
-                            if (text && text.length > 0) {
-                                allComments.push(text);
-                                return; // 찾았으면 다음 댓글로
+                    for (const node of nodes) {
+                        if (node.matches('article[id^="c_"]')) {
+                            // 우선순위 1: textarea[id^="save_comment_"]에서 댓글 텍스트 가져오기 (oncapan.com)
+                            const textarea = node.querySelector('textarea[id^="save_comment_"]');
+                            if (textarea) {
+                                const text = (textarea.value || textarea.textContent || '').trim();
+                                if (text) {
+                                    byArticle.push(text);
+                                    continue; // 찾았으면 다음 댓글로
+                                }
                             }
-                        }
-                        
-                        // 우선순위 2: .cmt_contents > p 태그에서 텍스트 가져오기 (oncapan.com)
-                        const cmtContents = article.querySelector('.cmt_contents');
-                        if (cmtContents) {
-                            // p 태그 내부 텍스트 우선
-                            const pTag = cmtContents.querySelector('p');
-                            if (pTag) {
-                                const text = (pTag.innerText || pTag.textContent || '').trim();
-                                if (text && text.length > 0) {
-                                    allComments.push(text);
-                                    return;
+                            
+                            // 우선순위 2: .cmt_contents > p 태그에서 텍스트 가져오기 (oncapan.com)
+                            const cmtContents = node.querySelector('.cmt_contents');
+                            if (cmtContents) {
+                                // p 태그 내부 텍스트 우선, 없으면 .cmt_contents 전체 텍스트
+                                const pTag = cmtContents.querySelector('p');
+                                const pText = pTag ? (pTag.innerText || pTag.textContent || '').trim() : '';
+                                const text = pText || (cmtContents.innerText || cmtContents.textContent || '').trim();
+                                if (text) {
+                                    byArticle.push(text);
                                 }
                             }
-                            // p 태그가 없으면 .cmt_contents 전체 텍스트
-                            const text = (cmtContents.innerText || cmtContents.textContent || '').trim();
-                            if (text && text.length > 0) {
-                                allComments.push(text);
+                        } else if (node.tagName === 'TEXTAREA') {
+                            const text = (node.value || node.textContent || '').trim();
+                            if (text) {
+                                byTextarea.push(text);
                             }
-                        }
-                    });
-                    
-                    // 방법 2: textarea[id^="save_comment_"] 직접 찾기 (백업 방법)
-                    if (allComments.length === 0) {
-                        const saveCommentTextareas = document.querySelectorAll('textarea[id^="save_comment_"]');
-                        saveCommentTextareas.forEach(textarea => {
-                            const text = (textarea.value || textarea.textContent || '').trim();
-                            if (text && text.length > 0) {
-                                allComments.push(text);
+                        } else {
+                            const text = (node.innerText || node.textContent || '').trim();
+                            // 댓글 입력 필드나 버튼 텍스트 제외
+                            if (text && !text.includes('댓글 입력') && !text.includes('댓글등록') &&
+                                !text.includes('작성') && !text.includes('등록')) {
+                                byContents.push(text);
                             }
-                        });
+                        }
                     }
                     
-                    // 방법 3: .cmt_contents 클래스로 찾기 (백업 방법)
-                    if (allComments.length === 0) {
-                        const cmtContents = document.querySelectorAll('.cmt_contents');
-                        cmtContents.forEach(el => {
-                            const text = (el.innerText || el.textContent || '').trim();
-                            if (text && text.length > 0) {
-                                // 댓글 입력 필드나 버튼 텍스트 제외
-                                if (!text.includes('댓글 입력') && !text.includes('댓글등록') && 
-                                    !text.includes('작성') && !text.includes('등록')) {
-                                    allComments.push(text);
-                                }
-                            }
-                        });
-                    }
+                    const allComments = byArticle.length ? byArticle : (byTextarea.length ? byTextarea : byContents);
                     
                     // 필터링: 의미 있는 댓글만 (너무 짧거나 의미 없는 것 제외)
                     const filtered = allComments.filter(c => {
@@ -2555,9 +3036,13 @@ class MacroBot:
                                !trimmed.includes('등록');
                     });
                     
-                    return filtered;
+                    return countOnly ? filtered.length : filtered;
                 }
-            """)
+            """, count_only)
+            
+            if count_only:
+                # 목록 반환 시와 같은 기준(최대 20개)으로 개수 비교
+                return min(comments_data or 0, 20)
             
             if comments_data:
                 comments = [c for c in comments_data if c and len(c.strip()) > 0]
@@ -2569,69 +3054,60 @@ class MacroBot:
             
             # 디버깅: 댓글을 찾지 못한 경우 페이지 구조 분석
             if not comments or len(comments) == 0:
-                print("[디버깅] 댓글을 찾지 못했습니다. 페이지 구조를 분석합니다...")
+                log.debug("[디버깅] 댓글을 찾지 못했습니다. 페이지 구조를 분석합니다...")
                 page_structure = await self.page.evaluate("""
                     () => {
-                        const info = {
+                        // ID/클래스는 라이브 HTMLCollection을 앞에서부터 훑다가 상한을 채우면 중단
+                        const allIds = [], allClasses = [];
+                        const all = document.getElementsByTagName('*');
+                        for (let i = 0; i < all.length && (allIds.length < 20 || allClasses.length < 30); i++) {
+                            const el = all[i];
+                            if (el.id && allIds.length < 20) allIds.push(el.id);
+                            if (el.className && allClasses.length < 30) allClasses.push(el.className);
+                        }
+                        const forms = Array.from(document.getElementsByTagName('form'), f => ({
+                            id: f.id, class: f.className, action: f.action
+                        }));
+                        const textareas = Array.from(document.getElementsByTagName('textarea'), t => ({
+                            id: t.id, class: t.className, placeholder: t.placeholder
+                        }));
+                        const buttons = Array.from(document.querySelectorAll('button, input[type="submit"]'), b => ({
+                            id: b.id, class: b.className, value: b.value || b.textContent
+                        }));
+                        return {
                             title: document.title,
                             url: window.location.href,
                             bodyClasses: document.body.className,
                             bodyId: document.body.id,
-                            allIds: Array.from(document.querySelectorAll('[id]')).map(el => el.id).slice(0, 20),
-                            allClasses: Array.from(document.querySelectorAll('[class]')).map(el => el.className).slice(0, 30),
-                            forms: Array.from(document.querySelectorAll('form')).map(f => ({
-                                id: f.id,
-                                class: f.className,
-                                action: f.action
-                            })),
-                            textareas: Array.from(document.querySelectorAll('textarea')).map(t => ({
-                                id: t.id,
-                                class: t.className,
-                                placeholder: t.placeholder
-                            })),
-                            buttons: Array.from(document.querySelectorAll('button, input[type="submit"]')).map(b => ({
-                                id: b.id,
-                                class: b.className,
-                                value: b.value || b.textContent
-                            }))
+                            allIds, allClasses, forms, textareas, buttons
                         };
-                        return info;
                     }
                 """)
-                print(f"[디버깅] 페이지 제목: {page_structure.get('title', 'N/A')}")
-                print(f"[디버깅] 페이지 URL: {page_structure.get('url', 'N/A')}")
-                print(f"[디버깅] 발견된 ID들 (처음 10개): {page_structure.get('allIds', [])[:10]}")
-                print(f"[디버깅] 발견된 클래스들 (처음 15개): {page_structure.get('allClasses', [])[:15]}")
-                print(f"[디버깅] 발견된 폼들: {page_structure.get('forms', [])}")
-                print(f"[디버깅] 발견된 textarea들: {page_structure.get('textareas', [])}")
-                print(f"[디버깅] 발견된 버튼들: {page_structure.get('buttons', [])}")
-                print("[디버깅] 위 정보를 개발자에게 알려주시면 댓글 위치를 정확히 찾을 수 있습니다.")
+                log.debug(f"[디버깅] 페이지 제목: {page_structure.get('title', 'N/A')}")
+                log.debug(f"[디버깅] 페이지 URL: {page_structure.get('url', 'N/A')}")
+                log.debug(f"[디버깅] 발견된 ID들 (처음 10개): {page_structure.get('allIds', [])[:10]}")
+                log.debug(f"[디버깅] 발견된 클래스들 (처음 15개): {page_structure.get('allClasses', [])[:15]}")
+                log.debug(f"[디버깅] 발견된 폼들: {page_structure.get('forms', [])}")
+                log.debug(f"[디버깅] 발견된 textarea들: {page_structure.get('textareas', [])}")
+                log.debug(f"[디버깅] 발견된 버튼들: {page_structure.get('buttons', [])}")
+                log.debug("[디버깅] 위 정보를 개발자에게 알려주시면 댓글 위치를 정확히 찾을 수 있습니다.")
             
             return comments[:20]  # 최대 20개까지 사용
             
         except Exception as e:
-            print(f"[경고] 기존 댓글을 가져오는 중 오류: {e}")
-            import traceback
-            print(f"[경고] 상세 오류: {traceback.format_exc()}")
-            return []
+            log.exception(f"[경고] 기존 댓글을 가져오는 중 오류: {e}")
+            return 0 if count_only else []
     
-    def clean_comment(self, comment: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def clean_comment(comment: str) -> str:
         """댓글에서 중복 어미, 마침표, 불필요한 문자 제거 (특수 기호는 보존)"""
-        import re
-        
-        if not comment:
+        if not comment or not _NEEDS_CLEAN_RE.search(comment):
             return comment
         
-        # 1. 특수 기호는 제거하지 않음 (젊은층 톤을 위해 보존)
-        # 과도한 특수 기호만 정리 (3개 이상 연속된 경우만 제거)
-        comment = re.sub(r'[~]{3,}', '~', comment)  # ~~~ 이상은 ~로
-        comment = re.sub(r'[!]{3,}', '!', comment)  # !!! 이상은 !로
-        comment = re.sub(r'[ㅠ]{3,}', 'ㅠㅠ', comment)  # ㅠㅠㅠ 이상은 ㅠㅠ로
-        # ㅎㅋ 같은 이모티콘은 제거 (너무 많으면 부자연스러움)
-        comment = re.sub(r'[ㅎㅋ]{2,}', '', comment)
-        
-        # 2. 마침표 제거
-        comment = re.sub(r'\.+', '', comment)  # 모든 마침표 제거
+        # 1~2. 과도한 특수 기호 정리 (3개 이상 연속된 경우만), ㅎㅋ 이모티콘/마침표 제거
+        comment = _apply_pipeline(comment, _CLEAN_SYMBOL_PIPELINE)
+        comment = comment.translate(_PERIOD_DELETE_TABLE)
         
         # 3. 물음표 위치 정리: 물음표가 중간에 있으면 끝으로 이동
         # 예: "일어나셨?어요" -> "일어나셨어요?"
@@ -2640,72 +3116,71 @@ class MacroBot:
             if not comment.endswith('?'):
                 comment = comment.replace('?', '') + '?'
         
-        # 4. "용" 어미 제거 (예: "힘내용" -> "힘내요", "좋아용" -> "좋아요")
-        comment = re.sub(r'(\S+)용$', r'\1요', comment)  # 끝에 있는 "용" -> "요"
-        comment = re.sub(r'(\S+)용\s', r'\1요 ', comment)  # 중간에 있는 "용" -> "요"
-        
-        # 5. 어미 뒤에 추가 어미가 붙는 경우 제거
-        # 예: "노곤하죠여?" -> "노곤하죠?"
-        # 예: "노곤하죠요?" -> "노곤하죠?"
-        # 예: "일어나셨어요?" -> "일어나셨어요?" (정상)
-        comment = re.sub(r'(죠|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요|세요)(여|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)(\?|$)', r'\1\3', comment)
-        comment = re.sub(r'(죠|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)(여|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)$', r'\1', comment)
-        
-        # 6. 중복 어미 제거: "요요", "네요요", "어요요" 등 (모든 위치에서)
-        comment = re.sub(r'요요+', '요', comment)  # "요요" -> "요", "요요요" -> "요"
-        comment = re.sub(r'네요요+', '네요', comment)  # "네요요" -> "네요"
-        comment = re.sub(r'어요요+', '어요', comment)  # "어요요" -> "어요"
-        comment = re.sub(r'해요요+', '해요', comment)  # "해요요" -> "해요"
-        comment = re.sub(r'되요요+', '되요', comment)  # "되요요" -> "되요"
-        comment = re.sub(r'다요요+', '다요', comment)  # "다요요" -> "다요"
-        comment = re.sub(r'야요요+', '야요', comment)  # "야요요" -> "야요"
-        comment = re.sub(r'죠요+', '죠', comment)  # "죠요" -> "죠"
-        comment = re.sub(r'죠요요+', '죠', comment)  # "죠요요" -> "죠"
-        
-        # 7. 댓글 끝에 "요"가 중복되거나 어색하게 붙는 경우 정리
-        # 예: "화이팅요요" -> "화이팅요" (위에서 처리)
-        # 예: "힘내요 요" -> "힘내요"
-        comment = re.sub(r'(\S+)요\s*요', r'\1요', comment)  # "힘내요 요" -> "힘내요"
-        comment = re.sub(r'(\S+)\s*요$', r'\1요', comment)  # "화이팅 요" -> "화이팅요"
-        
-        # 8. 불필요한 공백 제거 (예: "화이팅  요" -> "화이팅요")
-        comment = re.sub(r'\s+([요])', r'\1', comment)
-        
-        # 9. 연속된 공백 제거
-        comment = re.sub(r'\s+', ' ', comment)
+        # 4~9. "용" 어미, 겹친 어미, 중복 어미, 어색한 "요", 공백 정리
+        comment = _apply_pipeline(comment, _CLEAN_ENDING_PIPELINE)
         comment = comment.strip()
         
         return comment
     
-    def clean_comment_final_only(self, comment: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def clean_comment_final_only(comment: str) -> str:
         """최종 정리: 중복 어미만 제거하고 특수 기호는 완전히 보존"""
-        import re
-        
-        if not comment:
+        if not comment or not _NEEDS_FINAL_CLEAN_RE.search(comment):
             return comment
         
-        # 특수 기호는 절대 건드리지 않음
-        # 중복 어미만 제거
-        comment = re.sub(r'요요+', '요', comment)
-        comment = re.sub(r'네요요+', '네요', comment)
-        comment = re.sub(r'어요요+', '어요', comment)
-        comment = re.sub(r'해요요+', '해요', comment)
-        comment = re.sub(r'되요요+', '되요', comment)
-        comment = re.sub(r'다요요+', '다요', comment)
-        comment = re.sub(r'야요요+', '야요', comment)
-        comment = re.sub(r'죠요+', '죠', comment)
-        comment = re.sub(r'죠요요+', '죠', comment)
-        
-        # 어미 뒤에 추가 어미가 붙는 경우 제거
-        comment = re.sub(r'(죠|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)(여|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)(\?|$)', r'\1\3', comment)
-        comment = re.sub(r'(죠|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)(여|요|네요|어요|해요|되요|다요|야요|까요|나요|세요|지요)$', r'\1', comment)
-        
-        # 공백 정리만
-        comment = re.sub(r'\s+', ' ', comment)
+        # 특수 기호는 절대 건드리지 않음 (중복 어미, 겹친 어미, 공백만 정리)
+        comment = _apply_pipeline(comment, _FINAL_CLEAN_PIPELINE)
         comment = comment.strip()
         
         return comment
     
+    def _prepare_prompt_context(self, post_title: str, post_content: str, existing_comments: list) -> dict:
+        """게시글 분석 결과를 한 번만 계산해서 첫 요청과 재시도에서 같이 사용"""
+        post_date = getattr(self, '_last_post_date', None)
+        key = (post_title or "", post_content or "", tuple(existing_comments or []), post_date)
+        if self._prepared_context and self._prepared_context[0] == key:
+            return self._prepared_context[1]
+        
+        title = post_title or ""
+        content = post_content or ""
+        comments = existing_comments or []
+        
+        post_emotion = self.analyze_post_emotion(content, title)
+        post_type = self.classify_post_type(content, title)
+        temporal_context = self.get_temporal_context(post_date)
+        max_comment_length = self.get_optimal_comment_length(comments)
+        community_terms = self.extract_community_terms(f"{title}\n{content}")
+        
+        # 프롬프트에 넣는 최근 댓글 (최대 8개)은 한 번만 잘라서 개수와 번호 목록에 같이 사용
+        recent_comments = comments[:8]
+        prepared = {
+            'max_comment_length': max_comment_length,
+            'context_block': self.build_post_context_text(post_emotion, post_type, temporal_context, max_comment_length, community_terms),
+            'keywords': self.extract_keywords_from_post(content, post_title),
+            'is_question': _QUESTION_RE.search(content) is not None,
+            'recent_comment_count': len(recent_comments),
+            'numbered_comments': "\n".join(f"{i}. {c}" for i, c in enumerate(recent_comments, 1)),
+            'post_excerpt': content[:_POST_EXCERPT_CHARS],
+        }
+        self._prepared_context = (key, prepared)
+        return prepared
+    
+    @staticmethod
+    def _ai_comment_cache_key(post_url: str, post_title: str, post_excerpt: str, existing_comments: list) -> str:
+        """AI 댓글 캐시 키 (게시글 주소 + 제목 + 본문 앞부분 + 최근 댓글 8개의 SHA-256)"""
+        # 본문/댓글에 나올 수 없는 NUL 문자로 구분 (구분자가 댓글에 섞여 서로 다른 입력이 같은 키가 되지 않도록)
+        raw = "\0".join([post_url, post_title or '', post_excerpt, *(existing_comments or [])[:8]])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _store_ai_comment(self, cache_key: str, comment: str):
+        """AI 댓글을 캐시에 저장하면서 유효 시간이 지난 항목 정리"""
+        now = time.time()
+        cache = self._ai_comment_cache
+        for key in [k for k, (created, _) in cache.items() if now - created >= _AI_COMMENT_CACHE_TTL]:
+            del cache[key]
+        cache[cache_key] = (now, comment)
+    
     async def generate_ai_comment(self, post_content: str, existing_comments: list = None, post_title: str = None) -> str:
         """AI를 사용해서 게시글 제목, 본문과 기존 댓글을 고려하여 관련된 댓글 생성"""
         # 기존 댓글과 본문 정보 저장 (AI 실패 시 사용)
@@ -2737,17 +3212,24 @@ class MacroBot:
             print("[경고] 게시글 본문이 너무 짧습니다. 기존 댓글 스타일로 댓글 생성...")
             return self.generate_style_matched_comment(existing_comments or [], post_content)
         
+        # 프롬프트에 넣을 본문 앞부분 (여러 프롬프트 분기에서 같이 사용)
+        post_excerpt = post_content[:_POST_EXCERPT_CHARS]
+        
+        # 같은 게시글의 같은 본문/댓글 상태로 이미 만든 댓글이 있으면 (예: 등록 실패 후 재방문) API 호출 없이 재사용
+        post_url = self.page.url if self.page else ''
+        cache_key = self._ai_comment_cache_key(post_url, post_title, post_excerpt, existing_comments)
+        cached = self._ai_comment_cache.get(cache_key)
+        if cached is not None and time.time() - cached[0] < _AI_COMMENT_CACHE_TTL:
+            print(f"[AI] 같은 본문/댓글에 대해 만든 댓글 재사용: {cached[1]}")
+            return cached[1]
+        
         print(f"[AI] 게시글 본문 분석 중... (길이: {len(post_content)}자)")
         print(f"[AI] 본문 내용: {post_content[:100]}...")
         
-        # 게시글 감정/유형 분석
-        post_emotion = self.analyze_post_emotion(post_content, post_title)
-        post_type = self.classify_post_type(post_content, post_title)
-        post_date = getattr(self, '_last_post_date', None)
-        temporal_context = self.get_temporal_context(post_date)
-        max_comment_length = self.get_optimal_comment_length(existing_comments)
-        community_terms = self.extract_community_terms(f"{post_title or ''}\n{post_content or ''}")
-        post_context_text = self.build_post_context_text(post_emotion, post_type, temporal_context, max_comment_length, community_terms)
+        # 게시글 감정/유형 분석 (write_comment에서 미리 계산한 결과 재사용)
+        prepared = self._prepare_prompt_context(post_title, post_content, existing_comments)
+        max_comment_length = prepared['max_comment_length']
+        post_context_text = prepared['context_block']
         
         if existing_comments:
             print(f"[AI] 기존 댓글 {len(existing_comments)}개 확인: {existing_comments[:3]}...")
@@ -2758,68 +3240,70 @@ class MacroBot:
                 # 기존 댓글 스타일 분석
                 style = self.analyze_comment_style(existing_comments)
                 
-                numbered_comments = "\n".join(
-                    [f"{idx + 1}. {c}" for idx, c in enumerate(existing_comments[:8])]
-                )
+                numbered_comments = prepared['numbered_comments']
                 # 기존 댓글들의 핵심 단어/표현 추출
                 common_words = self.extract_common_words_from_comments(existing_comments)
                 
-                comments_text = f"\n\n⭐⭐⭐ 가장 중요: 현재 댓글 흐름 (최근 {min(len(existing_comments), 8)}개):\n{numbered_comments}\n\n"
+                comments_parts = [f"\n\n⭐⭐⭐ 가장 중요: 현재 댓글 흐름 (최근 {prepared['recent_comment_count']}개):\n{numbered_comments}\n\n"]
                 
                 if common_words:
-                    comments_text += f"🔑 기존 댓글들이 자주 사용하는 핵심 단어/표현:\n"
+                    comments_parts.append(f"🔑 기존 댓글들이 자주 사용하는 핵심 단어/표현:\n")
                     for word in common_words[:5]:
-                        comments_text += f"- \"{word}\"\n"
-                    comments_text += f"\n⚠️⚠️⚠️⚠️⚠️ 가장 중요: 반드시 위 단어/표현들을 사용하여 댓글을 작성하세요!\n"
-                    comments_text += f"⚠️⚠️⚠️ 절대 새로운 단어를 만들어내지 마세요! 위에 나온 단어만 사용하세요!\n"
-                    comments_text += f"⚠️⚠️⚠️ 기존 댓글에 \"맛피자\", \"바리맨\", \"꾼스\" 같은 단어가 있으면 당신도 반드시 그 단어를 사용하세요!\n"
-                    comments_text += f"예: 기존 댓글에 \"천포\", \"냠냠\"이 있으면 당신도 반드시 \"천포\", \"냠냠\" 같은 단어 사용\n"
-                    comments_text += f"예: 기존 댓글에 \"맛피자\", \"바리맨\"이 있으면 당신도 반드시 \"맛피자\", \"바리맨\" 같은 단어 사용\n"
-                    comments_text += f"예: 기존 댓글에 \"아이구\", \"에고\"가 있으면 당신도 \"아이고\", \"아이구\" 같은 표현 사용\n"
-                    comments_text += f"예: 기존 댓글에 \"맛담\"이 있으면 당신도 \"맛담\" 관련 표현 사용\n"
-                    comments_text += f"⚠️⚠️⚠️ 위 단어들을 사용하지 않고 일반적인 표현(예: \"피자 가 될 것 같아요\")을 사용하면 안 됩니다!\n\n"
+                        comments_parts.append(f"- \"{word}\"\n")
+                    comments_parts.append(f"\n⚠️⚠️⚠️⚠️⚠️ 가장 중요: 반드시 위 단어/표현들을 사용하여 댓글을 작성하세요!\n")
+                    comments_parts.append(f"⚠️⚠️⚠️ 절대 새로운 단어를 만들어내지 마세요! 위에 나온 단어만 사용하세요!\n")
+                    comments_parts.append(f"⚠️⚠️⚠️ 기존 댓글에 \"맛피자\", \"바리맨\", \"꾼스\" 같은 단어가 있으면 당신도 반드시 그 단어를 사용하세요!\n")
+                    comments_parts.append(f"예: 기존 댓글에 \"천포\", \"냠냠\"이 있으면 당신도 반드시 \"천포\", \"냠냠\" 같은 단어 사용\n")
+                    comments_parts.append(f"예: 기존 댓글에 \"맛피자\", \"바리맨\"이 있으면 당신도 반드시 \"맛피자\", \"바리맨\" 같은 단어 사용\n")
+                    comments_parts.append(f"예: 기존 댓글에 \"아이구\", \"에고\"가 있으면 당신도 \"아이고\", \"아이구\" 같은 표현 사용\n")
+                    comments_parts.append(f"예: 기존 댓글에 \"맛담\"이 있으면 당신도 \"맛담\" 관련 표현 사용\n")
+                    comments_parts.append(f"⚠️⚠️⚠️ 위 단어들을 사용하지 않고 일반적인 표현(예: \"피자 가 될 것 같아요\")을 사용하면 안 됩니다!\n\n")
                 
-                comments_text += "⚠️⚠️⚠️ 반드시 위 댓글들을 우선적으로 분석하세요:\n"
-                comments_text += "1. ⭐⭐⭐ 가장 중요: 위 댓글들이 사용하는 핵심 단어/표현을 파악하고 반드시 그대로 사용하세요\n"
-                comments_text += "   - 예: 위 댓글에 \"맛피자\", \"바리맨\", \"꾼스\"가 있으면 당신도 반드시 그 단어들을 사용\n"
-                comments_text += "   - 예: 위 댓글에 \"천포\", \"냠냠\"이 있으면 당신도 반드시 \"천포\", \"냠냠\" 사용\n"
-                comments_text += "   - ⚠️ 절대 일반적인 표현(예: \"피자 가 될 것 같아요\")을 사용하지 마세요!\n"
-                comments_text += "2. 위 댓글들의 말투 패턴을 정확히 파악 (존댓말/반말, 어미 패턴)\n"
-                comments_text += "3. 위 댓글들의 스타일과 길이를 분석\n"
-                comments_text += "4. 위 댓글들의 감정선과 톤을 파악\n"
-                comments_text += "5. 위 댓글들과 최대한 비슷한 스타일로 댓글을 작성하세요\n"
-                comments_text += "6. 본문보다 위 기존 댓글 스타일에 더 중점을 두세요\n"
-                comments_text += "7. ✅ 가장 중요: 위 댓글들이 말하는 핵심 내용/키워드를 그대로 유지하고, 말투만 자연스럽게 바꿔 표현하세요.\n"
-                comments_text += "8. 새로운 주장이나 정보를 추가하지 말고, 기존 댓글과 같은 메시지를 짧게 변형하세요.\n"
-                comments_text += "9. ⚠️⚠️⚠️ 반드시 10글자 이내로 완전한 문장을 작성하세요. 어미(요, 네요, 어요, 해요, 되요, 다요, 세요, 까요, 나요, 지요, 죠, 다, 어, 해, 되, 까, 나, 세, 지, 야 등)로 끝나야 합니다!\n\n"
+                comments_parts.append("⚠️⚠️⚠️ 반드시 위 댓글들을 우선적으로 분석하세요:\n")
+                comments_parts.append("1. ⭐⭐⭐ 가장 중요: 위 댓글들이 사용하는 핵심 단어/표현을 파악하고 반드시 그대로 사용하세요\n")
+                comments_parts.append("   - 예: 위 댓글에 \"맛피자\", \"바리맨\", \"꾼스\"가 있으면 당신도 반드시 그 단어들을 사용\n")
+                comments_parts.append("   - 예: 위 댓글에 \"천포\", \"냠냠\"이 있으면 당신도 반드시 \"천포\", \"냠냠\" 사용\n")
+                comments_parts.append("   - ⚠️ 절대 일반적인 표현(예: \"피자 가 될 것 같아요\")을 사용하지 마세요!\n")
+                comments_parts.append("2. 위 댓글들의 말투 패턴을 정확히 파악 (존댓말/반말, 어미 패턴)\n")
+                comments_parts.append("3. 위 댓글들의 스타일과 길이를 분석\n")
+                comments_parts.append("4. 위 댓글들의 감정선과 톤을 파악\n")
+                comments_parts.append("5. 위 댓글들과 최대한 비슷한 스타일로 댓글을 작성하세요\n")
+                comments_parts.append("6. 본문보다 위 기존 댓글 스타일에 더 중점을 두세요\n")
+                comments_parts.append("7. ✅ 가장 중요: 위 댓글들이 말하는 핵심 내용/키워드를 그대로 유지하고, 말투만 자연스럽게 바꿔 표현하세요.\n")
+                comments_parts.append("8. 새로운 주장이나 정보를 추가하지 말고, 기존 댓글과 같은 메시지를 짧게 변형하세요.\n")
+                comments_parts.append("9. ⚠️⚠️⚠️ 반드시 10글자 이내로 완전한 문장을 작성하세요. 어미(요, 네요, 어요, 해요, 되요, 다요, 세요, 까요, 나요, 지요, 죠, 다, 어, 해, 되, 까, 나, 세, 지, 야 등)로 끝나야 합니다!\n\n")
                 
                 # 분석된 스타일 정보 추가
-                comments_text += f"📊 기존 댓글 스타일 분석 결과:\n"
-                comments_text += f"- 가장 많이 사용된 어미: {style['ending']}\n"
-                comments_text += f"- 자주 사용되는 어미들: {', '.join(style['common_endings'][:3])}\n"
-                comments_text += f"- 평균 댓글 길이: 약 {style['avg_length']}자\n"
+                comments_parts.append(f"📊 기존 댓글 스타일 분석 결과:\n")
+                comments_parts.append(f"- 가장 많이 사용된 어미: {style['ending']}\n")
+                comments_parts.append(f"- 자주 사용되는 어미들: {', '.join(style['common_endings'][:3])}\n")
+                comments_parts.append(f"- 평균 댓글 길이: 약 {style['avg_length']}자\n")
                 if style['has_emoji']:
-                    comments_text += f"- 특수 기호 사용: {style['emoji_usage_rate']*100:.0f}%의 댓글이 특수 기호 사용 (~, !, ㅠ 등)\n"
+                    comments_parts.append(f"- 특수 기호 사용: {style['emoji_usage_rate']*100:.0f}%의 댓글이 특수 기호 사용 (~, !, ㅠ 등)\n")
                     if style['has_tilde']:
-                        comments_text += f"  → 물결표(~) 사용 빈도 높음\n"
+                        comments_parts.append(f"  → 물결표(~) 사용 빈도 높음\n")
                     if style['has_exclamation']:
-                        comments_text += f"  → 느낌표(!) 사용 빈도 높음\n"
+                        comments_parts.append(f"  → 느낌표(!) 사용 빈도 높음\n")
                     if style['has_ㅠ']:
-                        comments_text += f"  → ㅠ 사용 빈도 높음\n"
-                    comments_text += f"- ⚠️ 중요: 위 기존 댓글들이 특수 기호를 사용한다면, 당신도 비슷한 스타일로 작성하세요.\n"
+                        comments_parts.append(f"  → ㅠ 사용 빈도 높음\n")
+                    comments_parts.append(f"- ⚠️ 중요: 위 기존 댓글들이 특수 기호를 사용한다면, 당신도 비슷한 스타일로 작성하세요.\n")
                 else:
-                    comments_text += f"- 특수 기호 사용: 거의 사용하지 않음 ({style['emoji_usage_rate']*100:.0f}%)\n"
-                comments_text += f"- ⚠️ 중요: 위 기존 댓글들이 특수 기호를 사용하지 않으므로, 당신도 특수 기호 없이 작성하세요.\n"
+                    comments_parts.append(f"- 특수 기호 사용: 거의 사용하지 않음 ({style['emoji_usage_rate']*100:.0f}%)\n")
+                comments_parts.append(f"- ⚠️ 중요: 위 기존 댓글들이 특수 기호를 사용하지 않으므로, 당신도 특수 기호 없이 작성하세요.\n")
                 
                 comment_flow = self.analyze_comment_flow(existing_comments)
                 if comment_flow.get('needs_diversity'):
-                    comments_text += "- 최근 댓글들이 서로 비슷하니 다른 표현이나 관점을 사용하세요.\n"
-                    comments_text += "- 같은 단어/어미 반복을 피하고 새로운 단어를 사용하세요.\n"
+                    comments_parts.append("- 최근 댓글들이 서로 비슷하니 다른 표현이나 관점을 사용하세요.\n")
+                    comments_parts.append("- 같은 단어/어미 반복을 피하고 새로운 단어를 사용하세요.\n")
+                comments_text = "".join(comments_parts)
             else:
                 comments_text = "\n\n현재 댓글 흐름: (댓글 없음)"
             
+            # AI 프롬프트 설정은 한 번만 불러와서 도박 용어 사전과 Few-shot 예시에 함께 사용
+            prompt_config = self.load_prompt_config()
+            
             # 도박 용어 사전 가져오기
-            gambling_terms_text = self.get_gambling_terms_prompt()
+            gambling_terms_text = self.get_gambling_terms_prompt(prompt_config)
             if gambling_terms_text:
                 print("[AI] 도박 용어 사전 로드 완료")
             
@@ -2828,36 +3312,36 @@ class MacroBot:
             bad_examples_text = ""
             base_prompt_section = ""
             
-            prompt_config = self.load_prompt_config()
-            
             # 1순위: AI_프롬프트_설정.json 파일 사용
             if prompt_config:
                 # 좋은 댓글 예시 추가 (기존 댓글 스타일 반영 필수)
                 good_examples = prompt_config.get('좋은_댓글_예시', [])
                 if good_examples:
-                    few_shot_text = "\n\n📚 좋은 댓글 예시 (반드시 기존 댓글 스타일과 비슷하게 작성하세요):\n"
-                    few_shot_text += "⚠️ 중요: 아래 예시들은 모두 기존 댓글들의 스타일을 따라 작성된 것입니다.\n"
-                    few_shot_text += "당신도 반드시 현재 게시글의 기존 댓글들을 먼저 분석하고, 그 스타일과 비슷하게 댓글을 작성해야 합니다.\n\n"
+                    few_shot_parts = ["\n\n📚 좋은 댓글 예시 (반드시 기존 댓글 스타일과 비슷하게 작성하세요):\n"]
+                    few_shot_parts.append("⚠️ 중요: 아래 예시들은 모두 기존 댓글들의 스타일을 따라 작성된 것입니다.\n")
+                    few_shot_parts.append("당신도 반드시 현재 게시글의 기존 댓글들을 먼저 분석하고, 그 스타일과 비슷하게 댓글을 작성해야 합니다.\n\n")
                     for i, example in enumerate(good_examples[:10], 1):  # 최대 10개로 확대
-                        few_shot_text += f"\n예시 {i}:\n"
+                        few_shot_parts.append(f"\n예시 {i}:\n")
                         existing = example.get('기존_댓글_예시', []) or example.get('기존_댓글', [])
                         if existing:
-                            few_shot_text += f"기존 댓글: {', '.join(existing[:3])}\n"
-                            few_shot_text += f"→ 좋은 댓글 (기존 댓글 스타일 반영): {example.get('좋은_댓글', '')}\n"
-                            few_shot_text += f"※ 이 댓글은 위 기존 댓글들의 말투, 스타일, 길이를 따라 작성되었습니다.\n"
+                            few_shot_parts.append(f"기존 댓글: {', '.join(existing[:3])}\n")
+                            few_shot_parts.append(f"→ 좋은 댓글 (기존 댓글 스타일 반영): {example.get('좋은_댓글', '')}\n")
+                            few_shot_parts.append(f"※ 이 댓글은 위 기존 댓글들의 말투, 스타일, 길이를 따라 작성되었습니다.\n")
                         else:
-                            few_shot_text += f"본문: {example.get('본문_예시', '')[:100]}...\n"
-                            few_shot_text += f"좋은 댓글: {example.get('좋은_댓글', '')}\n"
+                            few_shot_parts.append(f"본문: {example.get('본문_예시', '')[:100]}...\n")
+                            few_shot_parts.append(f"좋은 댓글: {example.get('좋은_댓글', '')}\n")
                         reason = example.get('이유', '')
                         if reason:
-                            few_shot_text += f"이유: {reason}\n"
+                            few_shot_parts.append(f"이유: {reason}\n")
+                    few_shot_text = "".join(few_shot_parts)
                 
                 # 나쁜 예시 추가
                 bad_examples = prompt_config.get('나쁜_댓글_예시', [])
                 if bad_examples:
-                    bad_examples_text = "\n\n❌ 피해야 할 댓글 예시:\n"
-                    for bad in bad_examples[:3]:  # 최대 3개
-                        bad_examples_text += f"- {bad.get('댓글', '')} (이유: {bad.get('이유', '')})\n"
+                    bad_examples_text = "\n\n❌ 피해야 할 댓글 예시:\n" + "".join(
+                        f"- {bad.get('댓글', '')} (이유: {bad.get('이유', '')})\n"
+                        for bad in bad_examples[:3]  # 최대 3개
+                    )
                 
                 # 개선된 프롬프트가 있으면 사용
                 improved_prompt = prompt_config.get('프롬프트_개선_내용', '')
@@ -2870,26 +3354,28 @@ class MacroBot:
                 # Few-shot 예시 추가 (기존 댓글 스타일 반영 필수)
                 few_shot_examples = self.learning_data.get('few_shot_examples', [])
                 if few_shot_examples:
-                    few_shot_text = "\n\n📚 좋은 댓글 예시 (반드시 기존 댓글 스타일과 비슷하게 작성하세요):\n"
-                    few_shot_text += "⚠️ 중요: 아래 예시들은 모두 기존 댓글들의 스타일을 따라 작성된 것입니다.\n"
-                    few_shot_text += "당신도 반드시 현재 게시글의 기존 댓글들을 먼저 분석하고, 그 스타일과 비슷하게 댓글을 작성해야 합니다.\n\n"
+                    few_shot_parts = ["\n\n📚 좋은 댓글 예시 (반드시 기존 댓글 스타일과 비슷하게 작성하세요):\n"]
+                    few_shot_parts.append("⚠️ 중요: 아래 예시들은 모두 기존 댓글들의 스타일을 따라 작성된 것입니다.\n")
+                    few_shot_parts.append("당신도 반드시 현재 게시글의 기존 댓글들을 먼저 분석하고, 그 스타일과 비슷하게 댓글을 작성해야 합니다.\n\n")
                     for i, example in enumerate(few_shot_examples[:10], 1):  # 최대 10개로 확대
-                        few_shot_text += f"\n예시 {i}:\n"
+                        few_shot_parts.append(f"\n예시 {i}:\n")
                         existing = example.get('existing', [])
                         if existing:
-                            few_shot_text += f"기존 댓글: {', '.join(existing[:3])}\n"
-                            few_shot_text += f"→ 좋은 댓글 (기존 댓글 스타일 반영): {example.get('good_comment', '')}\n"
-                            few_shot_text += f"※ 이 댓글은 위 기존 댓글들의 말투, 스타일, 길이를 따라 작성되었습니다.\n"
+                            few_shot_parts.append(f"기존 댓글: {', '.join(existing[:3])}\n")
+                            few_shot_parts.append(f"→ 좋은 댓글 (기존 댓글 스타일 반영): {example.get('good_comment', '')}\n")
+                            few_shot_parts.append(f"※ 이 댓글은 위 기존 댓글들의 말투, 스타일, 길이를 따라 작성되었습니다.\n")
                         else:
-                            few_shot_text += f"본문: {example.get('post', '')[:100]}...\n"
-                            few_shot_text += f"좋은 댓글: {example.get('good_comment', '')}\n"
+                            few_shot_parts.append(f"본문: {example.get('post', '')[:100]}...\n")
+                            few_shot_parts.append(f"좋은 댓글: {example.get('good_comment', '')}\n")
+                    few_shot_text = "".join(few_shot_parts)
                 
                 # 나쁜 예시 추가
                 bad_examples = self.learning_data.get('bad_examples', [])
                 if bad_examples:
-                    bad_examples_text = "\n\n❌ 피해야 할 댓글 예시:\n"
-                    for bad in bad_examples[:3]:  # 최대 3개
-                        bad_examples_text += f"- {bad.get('comment', '')} (이유: {bad.get('reason', '')})\n"
+                    bad_examples_text = "\n\n❌ 피해야 할 댓글 예시:\n" + "".join(
+                        f"- {bad.get('comment', '')} (이유: {bad.get('reason', '')})\n"
+                        for bad in bad_examples[:3]  # 최대 3개
+                    )
                 
                 # 개선된 프롬프트가 있으면 사용
                 improved_prompt = self.learning_data.get('improved_prompt', '')
@@ -2907,101 +3393,15 @@ class MacroBot:
                     max_length = basic_rules.get('최대_길이', '10글자 이내')
                     tone_matching = basic_rules.get('말투_매칭', '본문이 존댓말이면 댓글도 존댓말, 본문이 반말이면 댓글도 반말')
                     
-                    # 본문 및 댓글 분석 가이드 가져오기
-                    analysis_guide = ""
-                    if prompt_config:
-                        # 본문 분석 가이드
-                        post_analysis = prompt_config.get('본문_분석_가이드', {})
-                        if post_analysis:
-                            analysis_items = post_analysis.get('분석_항목', {})
-                            if analysis_items:
-                                analysis_guide += "\n\n📖 본문 분석 방법 (반드시 이 순서로 분석하세요):\n"
-                                # 말투 분석
-                                tone_analysis = analysis_items.get('1_말투_분석', {})
-                                if tone_analysis:
-                                    analysis_guide += f"\n1️⃣ 말투 분석:\n"
-                                    analysis_guide += f"- 목적: {tone_analysis.get('목적', '')}\n"
-                                    checklist = tone_analysis.get('체크리스트', [])
-                                    for item in checklist:
-                                        analysis_guide += f"  • {item}\n"
-                                
-                                # 감정 분석
-                                emotion_analysis = analysis_items.get('2_감정_분석', {})
-                                if emotion_analysis:
-                                    analysis_guide += f"\n2️⃣ 감정 분석:\n"
-                                    analysis_guide += f"- 목적: {emotion_analysis.get('목적', '')}\n"
-                                    categories = emotion_analysis.get('감정_카테고리', {})
-                                    for cat_name, cat_info in list(categories.items())[:3]:  # 최대 3개
-                                        keywords = cat_info.get('키워드', [])
-                                        tone = cat_info.get('댓글_톤', '')
-                                        example = cat_info.get('예시', '')
-                                        analysis_guide += f"  • {cat_name}: 키워드 {', '.join(keywords[:3])} → {tone}\n"
-                                
-                                # 핵심 키워드 추출
-                                keyword_analysis = analysis_items.get('3_핵심_키워드_추출', {})
-                                if keyword_analysis:
-                                    analysis_guide += f"\n3️⃣ 핵심 키워드 추출:\n"
-                                    analysis_guide += f"- 목적: {keyword_analysis.get('목적', '')}\n"
-                                    methods = keyword_analysis.get('방법', [])
-                                    for method in methods[:3]:  # 최대 3개
-                                        analysis_guide += f"  • {method}\n"
-                        
-                        # 댓글 흐름 분석 가이드
-                        comment_analysis = prompt_config.get('댓글_흐름_분석_가이드', {})
-                        if comment_analysis:
-                            analysis_items = comment_analysis.get('분석_항목', {})
-                            if analysis_items:
-                                analysis_guide += "\n\n💬 댓글 흐름 분석 방법 (기존 댓글들을 이렇게 분석하세요):\n"
-                                # 말투 패턴 분석
-                                tone_pattern = analysis_items.get('1_말투_패턴_분석', {})
-                                if tone_pattern:
-                                    analysis_guide += f"\n1️⃣ 말투 패턴 분석:\n"
-                                    analysis_guide += f"- 목적: {tone_pattern.get('목적', '')}\n"
-                                    checklist = tone_pattern.get('체크리스트', [])
-                                    for item in checklist[:3]:  # 최대 3개
-                                        analysis_guide += f"  • {item}\n"
-                                
-                                # 감정선 분석
-                                emotion_flow = analysis_items.get('2_감정선_분석', {})
-                                if emotion_flow:
-                                    analysis_guide += f"\n2️⃣ 감정선 분석:\n"
-                                    analysis_guide += f"- 목적: {emotion_flow.get('목적', '')}\n"
-                                    checklist = emotion_flow.get('체크리스트', [])
-                                    for item in checklist[:3]:  # 최대 3개
-                                        analysis_guide += f"  • {item}\n"
-                                
-                                # 이모티콘/기호 패턴
-                                emoji_pattern = analysis_items.get('3_이모티콘_및_기호_패턴', {})
-                                if emoji_pattern:
-                                    analysis_guide += f"\n3️⃣ 이모티콘/기호 패턴:\n"
-                                    analysis_guide += f"- 목적: {emoji_pattern.get('목적', '')}\n"
-                                    checklist = emoji_pattern.get('체크리스트', [])
-                                    for item in checklist[:3]:  # 최대 3개
-                                        analysis_guide += f"  • {item}\n"
-                        
-                        # 본문-댓글 관계 가이드
-                        relationship_guide = prompt_config.get('본문_댓글_관계_이해_가이드', {})
-                        if relationship_guide:
-                            relationship_types = relationship_guide.get('관계_유형', {})
-                            if relationship_types:
-                                analysis_guide += "\n\n🔗 본문-댓글 관계 이해:\n"
-                                for rel_name, rel_info in list(relationship_types.items())[:2]:  # 최대 2개
-                                    analysis_guide += f"\n• {rel_name}: {rel_info.get('설명', '')}\n"
-                    
                     # 본문이 의미 없는지 확인
                     is_meaningless = False
-                    if post_content:
-                        meaningless_patterns = [
-                            len(post_content.strip()) < 10,  # 너무 짧음
-                            post_content.strip() in ['', ' ', '.', '..', '...'],  # 거의 비어있음
-                            len(set(post_content.strip().split())) < 3,  # 단어가 너무 적음
-                        ]
-                        # 의미 없는 패턴 체크
-                        meaningless_keywords = ['ㅎ', 'ㅋ', 'ㅠ', 'ㅜ', '...', '..', '.']
-                        if len(post_content.strip()) < 20:
-                            meaningless_count = sum(1 for kw in meaningless_keywords if kw in post_content)
-                            if meaningless_count >= len(post_content.strip()) * 0.5:  # 50% 이상이 의미 없는 문자
-                                is_meaningless = True
+                    stripped_content = post_content.strip() if post_content else ""
+                    if stripped_content and len(stripped_content) < 20:
+                        # 의미 없는 문자(ㅎ, ㅋ, ㅠ, ㅜ, 마침표)의 실제 개수를 한 번의 스캔으로 셈
+                        char_counts = Counter(stripped_content)
+                        meaningless_count = sum(char_counts[ch] for ch in _MEANINGLESS_POST_CHARS)
+                        if meaningless_count >= len(stripped_content) * 0.5:  # 50% 이상이 의미 없는 문자
+                            is_meaningless = True
                     
                     meaningless_guide = ""
                     if is_meaningless:
@@ -3129,18 +3529,18 @@ class MacroBot:
 - 예: "화이팅ㅠㅠ 요" ❌ → "화이팅요" ✅
 
 게시글 본문:
-{post_content[:500]}{comments_text}{few_shot_text}{bad_examples_text}
+{post_excerpt}{comments_text}{few_shot_text}{bad_examples_text}
 
 댓글:"""
             
             # 본문에서 핵심 키워드 추출
-            keywords = self.extract_keywords_from_post(post_content, post_title)
+            keywords = prepared['keywords']
             keywords_text = ""
             if keywords:
                 keywords_text = f"\n\n🔑 본문 핵심 키워드: {', '.join(keywords)}\n- 위 키워드들을 댓글에 자연스럽게 활용하세요.\n- 예: 본문에 '야식'이 있으면 '야식 좋지요'처럼 키워드를 포함한 댓글을 작성하세요.\n- 예: 본문에 '형님'이 있으면 '형님도 굿나잇입니다'처럼 키워드를 활용하세요.\n"
             
             # 질문형 게시글 확인
-            is_question = any(q in post_content for q in ['?', '?', '어떻게', '뭐가', '어떤', '언제', '어디', '누가', '왜', '몇시', '몇시쯤'])
+            is_question = prepared['is_question']
             question_guide = ""
             if is_question:
                 question_guide = "\n\n⚠️ 질문형 게시글입니다:\n- 질문에 대한 답을 모르면 댓글을 작성하지 마세요.\n- 답을 알고 있거나 공감할 수 있는 내용만 댓글로 작성하세요.\n- 예: '축구 오늘 몇시쯤에 하나요?' → 답을 모르면 댓글 작성하지 않음\n"
@@ -3162,7 +3562,7 @@ class MacroBot:
 {comments_text}
 
 {title_section}게시글 본문 (참고용):
-{post_content[:500]}{keywords_text}{question_guide}{few_shot_text}{bad_examples_text}
+{post_excerpt}{keywords_text}{question_guide}{few_shot_text}{bad_examples_text}
 
 댓글:"""
             else:
@@ -3170,226 +3570,175 @@ class MacroBot:
                 prompt = f"""{base_prompt_section}{gambling_terms_text}{context_block}{length_instruction}{comments_priority_text}{keywords_text}{question_guide}
 
 {title_section}게시글 본문:
-{post_content[:500]}{comments_text}{few_shot_text}{bad_examples_text}
+{post_excerpt}{comments_text}{few_shot_text}{bad_examples_text}
 
 댓글:"""
 
             print("[AI] OpenAI API 호출 중...")
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bearer {api_key.strip()}',
-                    'Content-Type': 'application/json'
-                }
-                
-                system_prompt = (
-                    "당신은 도박 관련 사이트의 자유게시판에서 게시글 작성자의 톤과 내용에 맞춰 친근하지만 자연스러운 댓글을 작성하는 도우미입니다. "
-                    "자유게시판이므로 도박 관련 얘기뿐만 아니라 일상 수다도 올라올 수 있습니다. 페이스북, 네이버 등 일반 커뮤니티와 똑같은 스타일로 댓글을 작성해야 합니다. "
-                    "가장 중요한 것은: 1) ⭐ 기존 댓글들이 사용하는 핵심 단어/표현을 그대로 사용하세요. 예: 기존 댓글에 \"아이구\", \"에고\"가 있으면 당신도 \"아이고\", \"아이구\" 같은 표현 사용. "
-                    "2) 기존 댓글들의 스타일을 우선적으로 분석하고 그에 맞춰 작성하세요. 기존 댓글들이 특수 기호(~, !, ㅠ 등)를 사용한다면 당신도 사용하고, 사용하지 않는다면 사용하지 마세요. "
-                    "3) 본문의 말투를 정확히 분석하는 것입니다 (본문이 \"~할까요?\" 같은 존댓말이면 댓글도 \"~요\", \"~네요\" 같은 높임말 사용, 본문이 반말이면 댓글도 반말 사용). "
-                    "4) 본문의 핵심 키워드를 추출하여 댓글에 자연스럽게 활용하세요 (예: 본문에 \"야식\"이 있으면 \"야식 좋지요\"처럼 키워드를 포함). "
-                    "5) 마침표(.)는 절대 사용하지 마세요. 6) \"용\" 어미는 절대 사용하지 마세요 (예: \"힘내용\" ❌ → \"힘내요\" ✅). "
-                    "7) 질문형 게시글에서 답을 모르면 댓글을 작성하지 마세요. 8) 기존 댓글들의 말투와 스타일을 분석하여 최대한 비슷하게 작성하세요. "
-                    f"9) 반드시 {max_comment_length}글자 이내로 완성하고, 맞춤법을 정확하게 사용하세요. "
-                    "10) 절대 \"감사합니다\", \"감사해요\", \"감사\" 같은 단어를 사용하지 말고, 형식적인 댓글을 사용하지 마세요. "
-                    "11) 기존 댓글들이 말하는 핵심 내용과 키워드를 벗어나지 말고, 말투만 자연스럽게 바꿔 표현하세요. 새로운 정보나 다른 주제를 추가하지 마세요. "
-                    "12) ⚠️⚠️⚠️ 반드시 \"이유:\"와 \"댓글:\" 두 줄로 출력하세요. 댓글만 출력하면 안 됩니다! "
-                    "13) ⚠️⚠️⚠️ \"이유:\" 필드에는 반드시 논리적인 이유를 작성하세요. 예: \"기존 댓글들이 '아이구', '에고' 같은 공감 표현을 사용하므로 비슷한 공감 표현으로 작성\" 또는 \"기존 댓글들이 '천포', '냠냠' 같은 단어를 사용하므로 동일한 단어를 활용\" 등. 절대 \"이유 없음\"이라고 작성하지 마세요! "
-                    "14) ⚠️⚠️⚠️ 댓글은 반드시 완전한 문장으로 끝맺어야 합니다. 예: \"밖에 엄청\" ❌ → \"밖에 엄청 추워요\" ✅, \"한번씩 하시\" ❌ → \"한번씩 하시네요\" ✅. 댓글이 중간에 끊기거나 어눌하게 끝나면 안 됩니다!"
-                )
-                
-                data = {
-                    'model': 'gpt-3.5-turbo',
-                    'messages': [
-                        {
-                            'role': 'system',
-                            'content': system_prompt
-                        },
-                        {
-                            'role': 'user',
-                            'content': prompt
-                        }
-                    ],
-                    'max_tokens': 150,  # 이유 설명 포함하여 토큰 증가
-                    'temperature': 0.9  # 다양성 증가 (0.7 -> 0.9로 통일)
-                }
-                
-                async with session.post(
-                    'https://api.openai.com/v1/chat/completions',
-                    headers=headers,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
-                    response_text = await response.text()
+            system_prompt = _SYSTEM_PROMPT_TEMPLATE.format(max_comment_length=max_comment_length)
+            
+            data = {
+                'model': 'gpt-3.5-turbo',
+                'messages': [
+                    {
+                        'role': 'system',
+                        'content': system_prompt
+                    },
+                    {
+                        'role': 'user',
+                        'content': prompt
+                    }
+                ],
+                'max_tokens': 150,  # 이유 설명 포함하여 토큰 증가
+                'temperature': 0.9  # 다양성 증가 (0.7 -> 0.9로 통일)
+            }
+            
+            async with self._openai_post(data) as response:
+                if response.status == 200:
+                    # 바이트에서 바로 JSON 파싱 (text() + json.loads 이중 변환 제거)
+                    result = await response.json(content_type=None)
+                    ai_response = result['choices'][0]['message']['content'].strip()
                     
-                    if response.status == 200:
-                        result = json.loads(response_text)
-                        ai_response = result['choices'][0]['message']['content'].strip()
-                        
-                        print(f"[AI] 원본 응답: {ai_response}")
-                        
-                        # 이유와 댓글 파싱
-                        reason = ""
-                        comment = ""
-                        
-                        if "이유:" in ai_response and "댓글:" in ai_response:
-                            # 이유와 댓글이 모두 있는 경우
-                            parts = ai_response.split("댓글:")
-                            if len(parts) == 2:
-                                reason_part = parts[0].replace("이유:", "").strip()
-                                comment = parts[1].strip()
-                                reason = reason_part
-                                
-                                # 이유가 비어있거나 "이유 없음"이면 재시도
-                                if not reason or reason == "이유 없음" or len(reason.strip()) < 5:
-                                    print(f"[경고] AI가 이유를 제대로 작성하지 않았습니다: '{reason}'")
-                                    print(f"[경고] AI에게 다시 요청합니다...")
-                                    return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1)
-                        elif "댓글:" in ai_response:
-                            # 댓글만 있는 경우 - 재시도
-                            print(f"[경고] AI가 '이유:' 필드를 작성하지 않았습니다.")
-                            print(f"[경고] AI에게 다시 요청합니다...")
-                            return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1)
-                        else:
-                            # 기존 형식 (댓글만) - 재시도
-                            print(f"[경고] AI가 올바른 형식('이유:'와 '댓글:')으로 응답하지 않았습니다.")
-                            print(f"[경고] AI에게 다시 요청합니다...")
-                            return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1)
-                        
-                        # 댓글이 완전한 문장으로 끝맺어지는지 확인
-                        # 어미로 끝나지 않거나 중간에 끊긴 것처럼 보이는 경우 체크
-                        comment_clean = comment.rstrip('~!?ㅠㅜㅎㅋ').strip()
-                        # 한글 어미로 끝나는지 확인 (요, 네요, 어요, 해요, 되요, 다요, 세요, 까요, 나요, 지요, 죠, 다, 어, 해, 되, 까, 나, 세, 지, 야 등)
-                        has_proper_ending = bool(re.search(r'(요|네요|어요|해요|되요|다요|세요|까요|나요|지요|죠|다|어|해|되|까|나|세|지|야)$', comment_clean))
-                        
-                        # 댓글이 너무 짧거나(2글자 미만) 어미가 없으면 재시도
-                        if len(comment_clean) < 2 or (len(comment_clean) >= 3 and not has_proper_ending):
-                            print(f"[경고] 댓글이 완전한 문장으로 끝맺어지지 않았습니다: '{comment}'")
-                            print(f"[경고] AI에게 다시 요청합니다...")
-                            return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1)
-                        
-                        # 따옴표 제거
-                        comment = comment.strip('"').strip("'")
-                        
-                        # 로그 파일에 기록
-                        await self.log_ai_comment_process(
-                            post_content=post_content,
-                            post_title=post_title,
-                            existing_comments=existing_comments,
-                            prompt=prompt,
-                            ai_response=ai_response,
-                            reason=reason,
-                            final_comment=comment
-                        )
-                        
-                        # 형식적인 댓글 필터링
-                        forbidden_comments = [
-                            '좋은 글 감사합니다',
-                            '좋은 정보 감사합니다',
-                            '유용한 정보네요',
-                            '유용한 정보 감사합니다',
-                            '잘 읽었습니다',
-                            '도움이 되었어요',
-                            '도움이 됐어요',
-                            '도움이 되었습니다',
-                            '감사합니다',
-                            '감사해요',
-                            '감사',
-                            '좋은 글',
-                            '유용한 정보',
-                        ]
-                        
-                        comment_lower = comment.lower()
-                        
-                        # "감사" 단어가 포함된 댓글 필터링
-                        if '감사' in comment:
-                            print(f"[경고] '감사' 단어가 포함된 댓글 감지: {comment}")
-                            print(f"[경고] AI에게 다시 요청합니다...")
-                            return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1)
-                        
-                        # 형식적인 댓글 필터링
-                        for forbidden in forbidden_comments:
-                            if forbidden in comment_lower:
-                                print(f"[경고] 형식적인 댓글 감지: {comment}")
-                                print(f"[경고] AI에게 다시 요청합니다...")
-                                return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1)
-                        
-                        comment_lower = comment.lower()
-                        for forbidden in forbidden_comments:
-                            if forbidden in comment_lower:
-                                print(f"[경고] 형식적인 댓글 감지: {comment}")
+                    print(f"[AI] 원본 응답: {ai_response}")
+                    
+                    # 이유와 댓글 파싱
+                    reason = ""
+                    comment = ""
+                    
+                    if "이유:" in ai_response and "댓글:" in ai_response:
+                        # 이유와 댓글이 모두 있는 경우
+                        parts = ai_response.split("댓글:")
+                        if len(parts) == 2:
+                            reason_part = parts[0].replace("이유:", "").strip()
+                            comment = parts[1].strip()
+                            reason = reason_part
+                            
+                            # 이유가 비어있거나 "이유 없음"이면 재시도
+                            if not reason or reason == "이유 없음" or len(reason.strip()) < 5:
+                                print(f"[경고] AI가 이유를 제대로 작성하지 않았습니다: '{reason}'")
                                 print(f"[경고] AI에게 다시 요청합니다...")
-                                # 다시 시도 (한 번만)
-                                return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1)
-                        
-                        # 길이 초과 시 재시도 (잘라내지 말고 처음부터 제한 길이 이내로 작성하도록)
-                        if len(comment) > max_comment_length:
-                            print(f"[경고] 댓글이 최대 길이({max_comment_length}자)를 초과했습니다 ({len(comment)}자): {comment}")
-                            print(f"[경고] 길이 제한에 맞춰 재생성합니다...")
-                            return await self.generate_ai_comment_retry(post_content, existing_comments, 1, post_title=getattr(self, '_last_post_title', None))
-                        
-                        # ~입니다 체 제거 및 ~요 체로 변경
-                        comment = comment.replace('입니다', '요').replace('입니다.', '요').replace('입니다!', '요')
-                        
-                        # 중복 어미 및 불필요한 문자 제거
-                        comment = self.clean_comment(comment)
-                        
-                        # 최종 필터링: "감사" 단어 재확인 (절대 안전장치)
-                        if '감사' in comment:
-                            print(f"[경고] ⚠️⚠️ 최종 필터링: '감사' 단어가 포함된 댓글 감지: {comment}")
-                            print(f"[경고] AI 재시도 실패, 기존 댓글 스타일로 댓글 생성...")
-                            return self.generate_style_matched_comment(existing_comments or [], post_content)
-                        
-                        if existing_comments and self.is_comment_too_similar(comment, existing_comments):
-                            print(f"[경고] 최근 댓글과 유사도가 높아 재생성 시도: {comment}")
-                            regenerated = await self.generate_ai_comment_retry(
-                                post_content,
-                                existing_comments,
-                                retry_count=1,
-                                post_title=post_title
-                            )
-                            if regenerated and not self.is_comment_too_similar(regenerated, existing_comments):
-                                comment = regenerated
-                            else:
-                                print("[경고] 재생성 댓글도 비슷하거나 실패하여 기본 스타일 댓글로 전환합니다.")
-                                return self.generate_style_matched_comment(existing_comments or [], post_content)
-                        
-                        print(f"[AI] 댓글 생성 완료: {comment}")
-                        return comment
+                                return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1, prepared=prepared)
+                    elif "댓글:" in ai_response:
+                        # 댓글만 있는 경우 - 재시도
+                        print(f"[경고] AI가 '이유:' 필드를 작성하지 않았습니다.")
+                        print(f"[경고] AI에게 다시 요청합니다...")
+                        return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1, prepared=prepared)
                     else:
-                        print(f"[오류] AI 댓글 생성 실패!")
-                        print(f"[오류] 상태 코드: {response.status}")
-                        print(f"[오류] 응답 내용: {response_text[:500]}")
-                        
-                        # 401 오류 처리 (권한 문제)
-                        if response.status == 401:
-                            print(f"[경고] ⚠️ OpenAI API 권한 오류 (401)!")
-                            print(f"[경고] API 키에 모델 사용 권한이 없습니다.")
-                            print(f"[경고] 해결 방법:")
-                            print(f"[경고] 1. OpenAI 계정에 로그인: https://platform.openai.com")
-                            print(f"[경고] 2. API Keys 페이지로 이동: https://platform.openai.com/api-keys")
-                            print(f"[경고] 3. 새로운 API 키 생성 (Owner 또는 Writer 권한 필요)")
-                            print(f"[경고] 4. 생성한 새 API 키를 .env 파일에 입력")
-                            if api_key:
-                                print(f"[경고] 현재 API 키: {api_key[:20]}... (처음 20자)")
-                        
-                        # 할당량 초과 오류 처리
-                        if response.status == 429:
-                            if 'quota' in response_text.lower() or 'exceeded' in response_text.lower():
-                                print(f"[경고] ⚠️ OpenAI API 할당량이 초과되었습니다!")
-                                print(f"[경고] OpenAI 계정에서 크레딧을 충전하세요.")
-                                print(f"[경고] 할당량 확인: https://platform.openai.com/usage")
-                        
-                        if api_key:
-                            print(f"[오류] API 키 확인: {api_key[:20]}... (처음 20자)")
-                        else:
-                            print(f"[오류] API 키가 None입니다!")
-                        
-                        import traceback
-                        traceback.print_exc()
-                        print(f"[댓글] 기존 댓글 스타일을 참고하여 댓글 생성...")
+                        # 기존 형식 (댓글만) - 재시도
+                        print(f"[경고] AI가 올바른 형식('이유:'와 '댓글:')으로 응답하지 않았습니다.")
+                        print(f"[경고] AI에게 다시 요청합니다...")
+                        return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1, prepared=prepared)
+                    
+                    # 댓글이 완전한 문장으로 끝맺어지는지 확인
+                    # 어미로 끝나지 않거나 중간에 끊긴 것처럼 보이는 경우 체크
+                    comment_clean = comment.rstrip('~!?ㅠㅜㅎㅋ').strip()
+                    # 한글 어미로 끝나는지 확인 (요, 네요, 어요, 해요, 되요, 다요, 세요, 까요, 나요, 지요, 죠, 다, 어, 해, 되, 까, 나, 세, 지, 야 등)
+                    has_proper_ending = comment_clean.endswith(_COMMENT_ENDINGS)
+                    
+                    # 댓글이 너무 짧거나(2글자 미만) 어미가 없으면 재시도
+                    if len(comment_clean) < 2 or (len(comment_clean) >= 3 and not has_proper_ending):
+                        print(f"[경고] 댓글이 완전한 문장으로 끝맺어지지 않았습니다: '{comment}'")
+                        print(f"[경고] AI에게 다시 요청합니다...")
+                        return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1, prepared=prepared)
+                    
+                    # 따옴표 제거
+                    comment = comment.strip('"').strip("'")
+                    
+                    # 로그 파일에 기록
+                    await self.log_ai_comment_process(
+                        post_content=post_content,
+                        post_title=post_title,
+                        existing_comments=existing_comments,
+                        prompt=prompt,
+                        ai_response=ai_response,
+                        reason=reason,
+                        final_comment=comment
+                    )
+                    
+                    # 길이 초과 시 재시도 (잘라내지 말고 처음부터 제한 길이 이내로 작성하도록)
+                    # 어차피 재요청할 응답이므로 단어 필터보다 먼저 길이만으로 빠르게 걸러냄
+                    if len(comment) > max_comment_length:
+                        print(f"[경고] 댓글이 최대 길이({max_comment_length}자)를 초과했습니다 ({len(comment)}자): {comment}")
+                        print(f"[경고] 길이 제한에 맞춰 재생성합니다...")
+                        return await self.generate_ai_comment_retry(post_content, existing_comments, 1, prepared=prepared)
+                    
+                    # "감사" 단어가 포함된 댓글 필터링
+                    if '감사' in comment:
+                        print(f"[경고] '감사' 단어가 포함된 댓글 감지: {comment}")
+                        print(f"[경고] AI에게 다시 요청합니다...")
+                        return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1, prepared=prepared)
+                    
+                    # 형식적인 댓글 필터링 (모든 표현을 한 번의 스캔으로 확인)
+                    if _FORMAL_COMMENT_RE.search(comment):
+                        print(f"[경고] 형식적인 댓글 감지: {comment}")
+                        print(f"[경고] AI에게 다시 요청합니다...")
+                        # 다시 시도 (한 번만)
+                        return await self.generate_ai_comment_retry(post_content, existing_comments, retry_count=1, prepared=prepared)
+                    
+                    # ~입니다 체 제거 및 ~요 체로 변경
+                    comment = _IPNIDA_RE.sub('요', comment)
+                    
+                    # 중복 어미 및 불필요한 문자 제거
+                    comment = self.clean_comment(comment)
+                    
+                    # 최종 필터링: "감사" 단어 재확인 (절대 안전장치)
+                    if _FINAL_FORBIDDEN_RE.search(comment):
+                        print(f"[경고] ⚠️⚠️ 최종 필터링: '감사' 단어가 포함된 댓글 감지: {comment}")
+                        print(f"[경고] AI 재시도 실패, 기존 댓글 스타일로 댓글 생성...")
                         return self.generate_style_matched_comment(existing_comments or [], post_content)
-                        
+                    
+                    if existing_comments and self.is_comment_too_similar(comment, existing_comments):
+                        print(f"[경고] 최근 댓글과 유사도가 높아 재생성 시도: {comment}")
+                        regenerated = await self.generate_ai_comment_retry(
+                            post_content,
+                            existing_comments,
+                            retry_count=1,
+                            prepared=prepared
+                        )
+                        if regenerated and not self.is_comment_too_similar(regenerated, existing_comments):
+                            comment = regenerated
+                        else:
+                            print("[경고] 재생성 댓글도 비슷하거나 실패하여 기본 스타일 댓글로 전환합니다.")
+                            return self.generate_style_matched_comment(existing_comments or [], post_content)
+                    
+                    print(f"[AI] 댓글 생성 완료: {comment}")
+                    self._store_ai_comment(cache_key, comment)
+                    return comment
+                else:
+                    # 오류 진단용 원문은 실패한 경우에만 읽음
+                    response_text = await response.text()
+                    print(f"[오류] AI 댓글 생성 실패!")
+                    print(f"[오류] 상태 코드: {response.status}")
+                    print(f"[오류] 응답 내용: {response_text[:500]}")
+                    
+                    # 401 오류 처리 (권한 문제) - 안내 메시지는 1분에 한 번만 출력
+                    if response.status == 401 and time.time() - self._last_401_log >= 60:
+                        self._last_401_log = time.time()
+                        print(f"[경고] ⚠️ OpenAI API 권한 오류 (401)!")
+                        print(f"[경고] API 키에 모델 사용 권한이 없습니다.")
+                        print(f"[경고] 해결 방법:")
+                        print(f"[경고] 1. OpenAI 계정에 로그인: https://platform.openai.com")
+                        print(f"[경고] 2. API Keys 페이지로 이동: https://platform.openai.com/api-keys")
+                        print(f"[경고] 3. 새로운 API 키 생성 (Owner 또는 Writer 권한 필요)")
+                        print(f"[경고] 4. 생성한 새 API 키를 .env 파일에 입력")
+                        if api_key:
+                            print(f"[경고] 현재 API 키: {api_key[:20]}... (처음 20자)")
+                    
+                    # 할당량 초과 오류 처리
+                    if response.status == 429:
+                        if _QUOTA_RE.search(response_text):
+                            print(f"[경고] ⚠️ OpenAI API 할당량이 초과되었습니다!")
+                            print(f"[경고] OpenAI 계정에서 크레딧을 충전하세요.")
+                            print(f"[경고] 할당량 확인: https://platform.openai.com/usage")
+                    
+                    if api_key:
+                        print(f"[오류] API 키 확인: {api_key[:20]}... (처음 20자)")
+                    else:
+                        print(f"[오류] API 키가 None입니다!")
+                    
+                    print(f"[댓글] 기존 댓글 스타일을 참고하여 댓글 생성...")
+                    return self.generate_style_matched_comment(existing_comments or [], post_content)
+                    
         except asyncio.TimeoutError:
             print("[경고] AI 댓글 생성 시간 초과 (15초). 기존 댓글 스타일로 댓글 생성...")
             return self.generate_style_matched_comment(existing_comments or [], post_content)
@@ -3400,249 +3749,152 @@ class MacroBot:
                 print(f"[오류] API 키 확인: {api_key[:20]}... (처음 20자)")
             else:
                 print(f"[오류] API 키가 None입니다!")
-            import traceback
-            traceback.print_exc()
+            log.exception("[오류] AI 댓글 생성 실패")
             print(f"[댓글] 기존 댓글 스타일을 참고하여 댓글 생성...")
             return self.generate_style_matched_comment(existing_comments or [], post_content)
     
-    async def generate_ai_comment_retry(self, post_content: str, existing_comments: list = None, retry_count: int = 0, post_title: str = None) -> str:
-        """AI 댓글 생성 재시도 (형식적인 댓글 필터링 후)"""
+    def _build_retry_messages(self, prepared: dict, post_content: str, existing_comments: list) -> list:
+        """재시도 요청용 시스템/사용자 프롬프트 메시지 생성 (게시글 분석 결과가 같으면 캐시해서 재사용)"""
+        if existing_comments and len(existing_comments) > 0:
+            numbered_comments = prepared['numbered_comments']
+            comments_text = f"\n\n⭐⭐⭐ 가장 중요: 현재 댓글 흐름 (최근 {prepared['recent_comment_count']}개):\n{numbered_comments}\n\n위 댓글들을 우선적으로 분석하고, 위 댓글들과 최대한 비슷한 스타일로 댓글을 작성하세요. 본문보다 기존 댓글 스타일에 더 중점을 두세요.\n- 위 댓글들이 사용하는 핵심 단어와 감정을 그대로 유지하고, 말투만 자연스럽게 바꿔 작성하세요.\n- 새로운 정보나 다른 주제를 절대 추가하지 마세요.\n"
+        else:
+            comments_text = "\n\n현재 댓글 흐름: (댓글 없음)"
+
+        # 기존 댓글 우선 강조 텍스트
+        comments_priority_text = "\n\n⭐⭐⭐ 가장 중요: 기존 댓글들을 우선적으로 분석하고, 기존 댓글들과 최대한 비슷한 스타일로 댓글을 작성하세요. 본문보다 기존 댓글 스타일에 더 중점을 두세요. 기존 댓글의 핵심 내용과 키워드를 유지하고 말투만 자연스럽게 바꾸세요.\n" if existing_comments and len(existing_comments) > 0 else ""
+
+        max_comment_length = prepared['max_comment_length']
+        context_block = prepared['context_block']
+        length_instruction = f"\n- 현재 최대 길이: {max_comment_length}글자 (기본 10글자)\n"
+
+        # 더 강력한 프롬프트 (통일된 버전, 정적 부분은 모듈 템플릿 사용)
+        prompt = _RETRY_PROMPT_TEMPLATE.format_map({
+            'max_comment_length': max_comment_length,
+            'comments_priority_text': comments_priority_text,
+            'context_block': context_block,
+            'length_instruction': length_instruction,
+            'post_content': prepared['post_excerpt'],
+            'comments_text': comments_text,
+        })
+
+        system_prompt_retry = _SYSTEM_PROMPT_TEMPLATE.format(max_comment_length=max_comment_length)
+        
+        return [
+            {
+                'role': 'system',
+                'content': system_prompt_retry
+            },
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ]
+    
+    async def generate_ai_comment_retry(self, post_content: str, existing_comments: list = None, retry_count: int = 0, post_title: str = None, prepared: dict = None) -> str:
+        """AI 댓글 생성 재시도 (형식적인 댓글 필터링 후, prepared가 있으면 첫 요청의 게시글 분석 결과를 그대로 사용)"""
         if retry_count <= 0:
             # 재시도 횟수 초과 시 기존 댓글 스타일로 댓글 생성
             print("[경고] 재시도 횟수 초과. 기존 댓글 스타일로 댓글 생성...")
             return self.generate_style_matched_comment(existing_comments or [], post_content)
         
-        api_key = self.config.get('openai_api_key')
-        
         try:
-            if existing_comments and len(existing_comments) > 0:
-                numbered_comments = "\n".join(
-                    [f"{idx + 1}. {c}" for idx, c in enumerate(existing_comments[:8])]
-                )
-                comments_text = f"\n\n⭐⭐⭐ 가장 중요: 현재 댓글 흐름 (최근 {min(len(existing_comments), 8)}개):\n{numbered_comments}\n\n위 댓글들을 우선적으로 분석하고, 위 댓글들과 최대한 비슷한 스타일로 댓글을 작성하세요. 본문보다 기존 댓글 스타일에 더 중점을 두세요.\n- 위 댓글들이 사용하는 핵심 단어와 감정을 그대로 유지하고, 말투만 자연스럽게 바꿔 작성하세요.\n- 새로운 정보나 다른 주제를 절대 추가하지 마세요.\n"
+            # 첫 요청에서 계산한 게시글 분석 결과 재사용 (제목을 넘기지 않은 호출은 첫 요청의 제목으로 같은 캐시 키를 만듦)
+            if prepared is None:
+                if post_title is None:
+                    post_title = self._last_post_title
+                prepared = self._prepare_prompt_context(post_title, post_content, existing_comments)
+            max_comment_length = prepared['max_comment_length']
+            # 같은 게시글에 대한 재시도는 이미 만든 프롬프트 메시지를 그대로 재사용
+            cached = self._retry_messages_cache
+            if cached is not None and cached[0] is prepared:
+                messages = cached[1]
             else:
-                comments_text = "\n\n현재 댓글 흐름: (댓글 없음)"
-            
-            # 기존 댓글 우선 강조 텍스트
-            comments_priority_text = "\n\n⭐⭐⭐ 가장 중요: 기존 댓글들을 우선적으로 분석하고, 기존 댓글들과 최대한 비슷한 스타일로 댓글을 작성하세요. 본문보다 기존 댓글 스타일에 더 중점을 두세요. 기존 댓글의 핵심 내용과 키워드를 유지하고 말투만 자연스럽게 바꾸세요.\n" if existing_comments and len(existing_comments) > 0 else ""
-            
-            # 본문에서 핵심 키워드 추출
-            keywords = self.extract_keywords_from_post(post_content, post_title)
-            keywords_text = ""
-            if keywords:
-                keywords_text = f"\n\n🔑 본문 핵심 키워드: {', '.join(keywords)}\n- 위 키워드들을 댓글에 자연스럽게 활용하세요.\n- 예: 본문에 '야식'이 있으면 '야식 좋지요'처럼 키워드를 포함한 댓글을 작성하세요.\n"
+                messages = self._build_retry_messages(prepared, post_content, existing_comments)
+                self._retry_messages_cache = (prepared, messages)
+            
+            data = {
+                'model': self.config.get('retry_model', 'gpt-4o-mini'),
+                'messages': messages,
+                'max_tokens': 150,  # 이유 설명 포함하여 토큰 증가
+                'temperature': 0.9,  # 다양성 증가 (0.7 -> 0.9로 통일)
+                # 스트리밍으로 받아서 "댓글:" 줄이 끝나면 나머지 생성은 기다리지 않음
+                'stream': True,
+            }
             
-            # 질문형 게시글 확인
-            is_question = any(q in post_content for q in ['?', '?', '어떻게', '뭐가', '어떤', '언제', '어디', '누가', '왜', '몇시', '몇시쯤'])
-            question_guide = ""
-            if is_question:
-                question_guide = "\n\n⚠️ 질문형 게시글입니다:\n- 질문에 대한 답을 모르면 댓글을 작성하지 마세요.\n- 답을 알고 있거나 공감할 수 있는 내용만 댓글로 작성하세요.\n"
-            
-            post_emotion = self.analyze_post_emotion(post_content, post_title or "")
-            post_type = self.classify_post_type(post_content, post_title or "")
-            post_date = getattr(self, '_last_post_date', None)
-            temporal_context = self.get_temporal_context(post_date)
-            max_comment_length = self.get_optimal_comment_length(existing_comments)
-            community_terms = self.extract_community_terms(f"{post_title or ''}\n{post_content or ''}")
-            context_block = self.build_post_context_text(post_emotion, post_type, temporal_context, max_comment_length, community_terms)
-            length_instruction = f"\n- 현재 최대 길이: {max_comment_length}글자 (기본 10글자)\n"
-            
-            # 더 강력한 프롬프트 (통일된 버전)
-            prompt = f"""다음 게시글 본문을 읽고, 작성자의 감정에 공감하는 댓글을 작성해주세요.
-
-⚠️ 중요: 이 게시판은 도박 관련 사이트의 자유게시판입니다.
-- 자유게시판이기 때문에 도박과 관련된 얘기뿐만 아니라 일상 수다도 올라올 수 있습니다
-- 게시글 주제가 도박이든 일상이든 상관없이, 본문 내용과 기존 댓글 흐름에 맞춰 작성해야 합니다
-- 댓글은 페이스북, 네이버 등 일반 커뮤니티와 똑같은 스타일로 작성해야 합니다
-
-🎯 핵심 원칙 (우선순위 순 - 반드시 이 순서로 진행):
-1. ⭐⭐⭐ 가장 중요: 기존 댓글들을 먼저 분석하세요! (본문보다 우선!)
-   - 기존 댓글들의 말투, 스타일, 길이, 감정선을 정확히 파악
-   - 기존 댓글들과 최대한 비슷한 스타일로 댓글 작성
-   - 본문은 나중에 참고용으로만 사용
-2. ⭐⭐ 두 번째: 기존 댓글 스타일을 따라 댓글 설계
-   - 기존 댓글들의 말투 패턴을 우선 확인
-   - 기존 댓글이 대부분 존댓말이면 존댓말로, 반말이면 반말로 작성
-   - 본문 말투는 무시하고 기존 댓글 말투를 따라야 함
-3. 본문은 참고용으로만 사용 (기존 댓글 스타일 유지하면서)
-   - 본문의 핵심 키워드만 선택적으로 활용
-   - 본문 말투는 기존 댓글 말투와 다를 수 있으므로 무시
-4. 특수 기호 사용: 기존 댓글들이 특수 기호(~, !, ㅠ 등)를 사용한다면 그에 맞춰 사용하고, 사용하지 않는다면 사용하지 마세요
-5. 마침표(.) 절대 사용 금지
-6. "용" 어미 절대 사용 금지
-7. 질문형 게시글: 답을 모르면 댓글 작성하지 않음
-8. 반드시 {max_comment_length}글자 이내로 완성 (기본 10글자, 현재 한도 {max_comment_length}글자)
-
-절대 사용하지 말 것 (금지):
-- "좋은 글 감사합니다"
-- "유용한 정보 감사합니다"  
-- "유용한 정보네요"
-- "잘 읽었습니다"
-- "도움이 되었어요" (절대 금지)
-- "도움이 됐어요" (절대 금지)
-- "도움이 되었습니다" (절대 금지)
-- "감사합니다" (절대 금지)
-- "감사해요" (절대 금지)
-- "감사" (절대 금지)
-- "감사"라는 단어가 포함된 모든 댓글
-
-반드시 해야 할 것:
-- 작성자의 톤과 감정을 파악하고 그에 맞춰 댓글 작성
-- 친구처럼 편하게 쓴 글 → 친구처럼 편하게 반말이나 캐주얼한 댓글
-- 형식적인 글 → 형식적인 댓글 (하지만 "감사합니다" 같은 금지 단어는 사용하지 말 것)
-- 시답잖은 소리 → 그냥 맞춰주기만 하면 됨 (꼭 긍정적일 필요 없음)
-- 특수 기호 사용: 기존 댓글들이 특수 기호(~, !, ㅠ 등)를 사용한다면 그에 맞춰 사용하고, 사용하지 않는다면 사용하지 마세요
-- 예: "힘내요" → "힘내요", "좋아요" → "좋아요", "대박이네요" → "대박이네요", "아쉽네요" → "아쉽네요"
-- 기분 좋은 글이면 담담하게 축하하고, 힘든 글이면 현실적인 톤(예: "아 지치네요", "버텨야죠")도 괜찮음
-- 맞춤법을 반드시 정확하게 사용
-- 게시판이 도박 관련이라는 맥락을 고려
-- 게시글 내용과 기존 댓글 흐름 모두에 자연스럽게 이어지는 댓글
-- 댓글 길이는 {max_comment_length}글자 이내로 작성 (기본 10글자)
-- ~요 체나 반말체를 적절히 섞어서 사용 (너무 반말만 쓰지 않기)
-
-추론 절차 (반드시 내부적으로 거친 뒤 마지막에 댓글 한 줄만 출력):
-1. ⭐⭐⭐ 가장 먼저: 기존 댓글들을 정확히 분석합니다 (본문보다 우선!)
-   - 기존 댓글들의 말투 패턴을 파악합니다 (존댓말/반말, 어미 패턴)
-   - 기존 댓글들의 스타일과 길이를 분석합니다
-   - 기존 댓글들의 감정선과 톤을 파악합니다
-   - 기존 댓글들이 어떤 패턴으로 작성되었는지 정확히 이해합니다. (생각만, 출력 금지)
-2. ⭐⭐ 두 번째: 기존 댓글 스타일을 따라 댓글을 설계합니다
-   - 기존 댓글들의 말투 패턴을 따라 작성합니다
-   - 기존 댓글들의 길이와 스타일을 따라 작성합니다
-   - 기존 댓글들의 감정선을 자연스럽게 이어갑니다. (생각만, 출력 금지)
-3. 본문은 참고용으로만 사용합니다 (기존 댓글 스타일을 유지하면서)
-   - 본문의 핵심 키워드만 참고합니다 (말투는 기존 댓글 말투를 우선)
-   - 기존 댓글 말투와 본문 말투가 다를 수 있으므로, 기존 댓글 말투를 우선합니다. (생각만, 출력 금지)
-4. 위 정보를 합쳐 {max_comment_length}글자 이내 댓글을 설계합니다. 기존 댓글들이 특수 기호를 사용한다면 그에 맞춰 사용하세요.
-최종 출력은 댓글 한 줄만 해야 하며, 다른 문장은 포함하면 안 됩니다.
-
-{comments_priority_text}{context_block}{length_instruction}
-
-게시글 본문:
-{post_content[:500]}{comments_text}
-
-댓글:"""
-
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bearer {api_key.strip()}',
-                    'Content-Type': 'application/json'
-                }
-                
-                system_prompt_retry = (
-                    "당신은 도박 관련 사이트의 자유게시판에서 게시글 작성자의 톤과 내용에 맞춰 친근하지만 자연스러운 댓글을 작성하는 도우미입니다. "
-                    "자유게시판이므로 도박 관련 얘기뿐만 아니라 일상 수다도 올라올 수 있습니다. 페이스북, 네이버 등 일반 커뮤니티와 똑같은 스타일로 댓글을 작성해야 합니다. "
-                    "가장 중요한 것은: 1) ⭐ 기존 댓글들이 사용하는 핵심 단어/표현을 그대로 사용하세요. 예: 기존 댓글에 \"아이구\", \"에고\"가 있으면 당신도 \"아이고\", \"아이구\" 같은 표현 사용. "
-                    "2) 기존 댓글들의 스타일을 우선적으로 분석하고 그에 맞춰 작성하세요. 기존 댓글들이 특수 기호(~, !, ㅠ 등)를 사용한다면 당신도 사용하고, 사용하지 않는다면 사용하지 마세요. "
-                    "3) 본문의 말투를 정확히 분석하는 것입니다 (본문이 \"~할까요?\" 같은 존댓말이면 댓글도 \"~요\", \"~네요\" 같은 높임말 사용, 본문이 반말이면 댓글도 반말 사용). "
-                    "4) 본문의 핵심 키워드를 추출하여 댓글에 자연스럽게 활용하세요 (예: 본문에 \"야식\"이 있으면 \"야식 좋지요\"처럼 키워드를 포함). "
-                    "5) 마침표(.)는 절대 사용하지 마세요. 6) \"용\" 어미는 절대 사용하지 마세요 (예: \"힘내용\" ❌ → \"힘내요\" ✅). "
-                    "7) 질문형 게시글에서 답을 모르면 댓글을 작성하지 마세요. 8) 기존 댓글들의 말투와 스타일을 분석하여 최대한 비슷하게 작성하세요. "
-                    f"9) 반드시 {max_comment_length}글자 이내로 완성하고, 맞춤법을 정확하게 사용하세요. "
-                    "10) 절대 \"감사합니다\", \"감사해요\", \"감사\" 같은 단어를 사용하지 말고, 형식적인 댓글을 사용하지 마세요. "
-                    "11) 기존 댓글들이 말하는 핵심 내용과 키워드를 벗어나지 말고, 말투만 자연스럽게 바꿔 표현하세요. 새로운 정보나 다른 주제를 추가하지 마세요. "
-                    "12) ⚠️⚠️⚠️ 반드시 \"이유:\"와 \"댓글:\" 두 줄로 출력하세요. 댓글만 출력하면 안 됩니다! "
-                    "13) ⚠️⚠️⚠️ \"이유:\" 필드에는 반드시 논리적인 이유를 작성하세요. 예: \"기존 댓글들이 '아이구', '에고' 같은 공감 표현을 사용하므로 비슷한 공감 표현으로 작성\" 또는 \"기존 댓글들이 '천포', '냠냠' 같은 단어를 사용하므로 동일한 단어를 활용\" 등. 절대 \"이유 없음\"이라고 작성하지 마세요! "
-                    "14) ⚠️⚠️⚠️ 댓글은 반드시 완전한 문장으로 끝맺어야 합니다. 예: \"밖에 엄청\" ❌ → \"밖에 엄청 추워요\" ✅, \"한번씩 하시\" ❌ → \"한번씩 하시네요\" ✅. 댓글이 중간에 끊기거나 어눌하게 끝나면 안 됩니다!"
-                )
-                
-                data = {
-                    'model': 'gpt-3.5-turbo',
-                    'messages': [
-                        {
-                            'role': 'system',
-                            'content': system_prompt_retry
-                        },
-                        {
-                            'role': 'user',
-                            'content': prompt
-                        }
-                    ],
-                    'max_tokens': 150,  # 이유 설명 포함하여 토큰 증가
-                    'temperature': 0.9  # 다양성 증가 (0.7 -> 0.9로 통일)
-                }
-                
-                async with session.post(
-                    'https://api.openai.com/v1/chat/completions',
-                    headers=headers,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
-                    if response.status == 200:
-                        result = json.loads(await response.text())
-                        ai_response = result['choices'][0]['message']['content'].strip()
-                        
-                        print(f"[AI] 재시도 원본 응답: {ai_response}")
-                        
-                        # 이유와 댓글 파싱
-                        reason = ""
-                        comment = ""
-                        
-                        if "이유:" in ai_response and "댓글:" in ai_response:
-                            # 이유와 댓글이 모두 있는 경우
-                            parts = ai_response.split("댓글:")
-                            if len(parts) == 2:
-                                reason_part = parts[0].replace("이유:", "").strip()
-                                comment = parts[1].strip()
-                                reason = reason_part
-                                
-                                # 이유가 비어있거나 "이유 없음"이면 재시도
-                                if not reason or reason == "이유 없음" or len(reason.strip()) < 5:
-                                    print(f"[경고] 재시도: AI가 이유를 제대로 작성하지 않았습니다: '{reason}'")
-                                    print(f"[경고] 기존 댓글 스타일로 댓글 생성...")
-                                    return self.generate_style_matched_comment(existing_comments or [], post_content)
-                        elif "댓글:" in ai_response:
-                            # 댓글만 있는 경우
-                            parts = ai_response.split("댓글:")
-                            if len(parts) == 2:
-                                comment = parts[1].strip()
-                                reason = "이유 없음"
-                        else:
-                            # 기존 형식 (댓글만)
-                            comment = ai_response
+            async with self._openai_post(data) as response:
+                if response.status == 200:
+                    ai_response = (await self._read_openai_stream(response, _STREAM_COMMENT_DONE_RE.search)).strip()
+                    
+                    print(f"[AI] 재시도 원본 응답: {ai_response}")
+                    
+                    # 이유와 댓글 파싱
+                    reason = ""
+                    comment = ""
+                    
+                    if "이유:" in ai_response and "댓글:" in ai_response:
+                        # 이유와 댓글이 모두 있는 경우
+                        parts = ai_response.split("댓글:")
+                        if len(parts) == 2:
+                            reason_part = parts[0].replace("이유:", "").strip()
+                            comment = parts[1].strip()
+                            reason = reason_part
+                            
+                            # 이유가 비어있거나 "이유 없음"이면 재시도
+                            if not reason or reason == "이유 없음" or len(reason.strip()) < 5:
+                                print(f"[경고] 재시도: AI가 이유를 제대로 작성하지 않았습니다: '{reason}'")
+                                print(f"[경고] 기존 댓글 스타일로 댓글 생성...")
+                                return self.generate_style_matched_comment(existing_comments or [], post_content)
+                    elif "댓글:" in ai_response:
+                        # 댓글만 있는 경우
+                        parts = ai_response.split("댓글:")
+                        if len(parts) == 2:
+                            comment = parts[1].strip()
                             reason = "이유 없음"
-                        
-                        # 댓글이 완전한 문장으로 끝맺어지는지 확인
-                        comment_clean = comment.rstrip('~!?ㅠㅜㅎㅋ').strip()
-                        has_proper_ending = bool(re.search(r'(요|네요|어요|해요|되요|다요|세요|까요|나요|지요|죠|다|어|해|되|까|나|세|지|야)$', comment_clean))
-                        
-                        # 댓글이 너무 짧거나(2글자 미만) 어미가 없으면 기존 스타일 사용
-                        if len(comment_clean) < 2 or (len(comment_clean) >= 3 and not has_proper_ending):
-                            print(f"[경고] 재시도: 댓글이 완전한 문장으로 끝맺어지지 않았습니다: '{comment}'")
-                            print(f"[경고] 기존 댓글 스타일로 댓글 생성...")
-                            return self.generate_style_matched_comment(existing_comments or [], post_content)
-                        
-                        # 따옴표 제거
-                        comment = comment.strip('"').strip("'")
-                        
-                        # 중복 어미 및 불필요한 문자 제거
-                        comment = self.clean_comment(comment)
-                        
-                        # 길이 초과 시 기존 스타일 사용
-                        if len(comment) > max_comment_length:
-                            print(f"[경고] 재시도 댓글이 최대 길이({max_comment_length}자)를 초과했습니다 ({len(comment)}자): {comment}")
-                            print(f"[경고] 기존 댓글 스타일로 댓글 생성...")
-                            return self.generate_style_matched_comment(existing_comments or [], post_content)
-                        
-                        comment = comment.replace('입니다', '요').replace('입니다.', '요')
-                        # 다시 한 번 정리 (replace 후에도 중복이 생길 수 있음)
-                        comment = self.clean_comment(comment)
-                        print(f"[AI] 재시도 댓글 생성 완료: {comment}")
-                        return comment
                     else:
-                        print(f"[댓글] 기존 댓글 스타일을 참고하여 댓글 생성...")
+                        # 기존 형식 (댓글만)
+                        comment = ai_response
+                        reason = "이유 없음"
+                    
+                    # 댓글이 완전한 문장으로 끝맺어지는지 확인
+                    comment_clean = comment.rstrip('~!?ㅠㅜㅎㅋ').strip()
+                    has_proper_ending = comment_clean.endswith(_COMMENT_ENDINGS)
+                    
+                    # 댓글이 너무 짧거나(2글자 미만) 어미가 없으면 기존 스타일 사용
+                    if len(comment_clean) < 2 or (len(comment_clean) >= 3 and not has_proper_ending):
+                        print(f"[경고] 재시도: 댓글이 완전한 문장으로 끝맺어지지 않았습니다: '{comment}'")
+                        print(f"[경고] 기존 댓글 스타일로 댓글 생성...")
+                        return self.generate_style_matched_comment(existing_comments or [], post_content)
+                    
+                    # 따옴표 제거
+                    comment = comment.strip('"').strip("'")
+                    
+                    # 중복 어미 및 불필요한 문자 제거
+                    comment = self.clean_comment(comment)
+                    
+                    # 길이 초과 시 기존 스타일 사용
+                    if len(comment) > max_comment_length:
+                        print(f"[경고] 재시도 댓글이 최대 길이({max_comment_length}자)를 초과했습니다 ({len(comment)}자): {comment}")
+                        print(f"[경고] 기존 댓글 스타일로 댓글 생성...")
                         return self.generate_style_matched_comment(existing_comments or [], post_content)
+                    
+                    comment = _IPNIDA_RE.sub('요', comment)
+                    # 다시 한 번 정리 (replace 후에도 중복이 생길 수 있음)
+                    comment = self.clean_comment(comment)
+                    print(f"[AI] 재시도 댓글 생성 완료: {comment}")
+                    return comment
+                else:
+                    print(f"[댓글] 기존 댓글 스타일을 참고하여 댓글 생성...")
+                    return self.generate_style_matched_comment(existing_comments or [], post_content)
         except Exception as e:
-            print(f"[오류] OpenAI 재시도 오류: {e}")
+            log.exception(f"[오류] OpenAI 재시도 오류: {e}")
             print(f"[댓글] 기존 댓글 스타일을 참고하여 댓글 생성...")
             return self.generate_style_matched_comment(existing_comments or [], post_content)
     
     async def write_comment(self, post_url: str):
         """게시글에 댓글 작성"""
-        print(f"[댓글] ========================================")
-        print(f"[댓글] write_comment 함수 시작: {post_url}")
-        print(f"[댓글] 현재 페이지 URL: {self.page.url}")
-        print(f"[댓글] ========================================")
+        log.debug(f"[디버깅] write_comment 시작: {post_url} (현재 페이지 URL: {self.page.url})")
+        self._delay_spent = 0.0
         try:
             # 페이지가 닫혔는지 확인 (Frame과 Page 구분)
             page_closed = False
@@ -3665,45 +3917,67 @@ class MacroBot:
             
             print(f"[댓글] {post_url} 접속 중...")
             try:
-                await self.page.goto(post_url, wait_until='networkidle', timeout=30000)
+                await self._goto_post(post_url)
                 # 페이지 로드 후 추가 대기
                 await self.random_delay(2, 3)
                 # 스크롤하여 댓글 영역이 보이도록
                 await self.page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await self.random_delay(1, 2)
             except AttributeError as attr_err:
                 if "_object" in str(attr_err):
                     print("[오류] 페이지 객체가 손상되었습니다. 브라우저를 재시작합니다.")
                     await self.reset_browser(headless=False)
-                    await self.page.goto(post_url, wait_until='networkidle', timeout=30000)
+                    await self._goto_post(post_url)
                     await self.random_delay(2, 3)
                     await self.page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                    await self.random_delay(1, 2)
                 else:
                     raise
             except Exception as goto_error:
                 if "_object" in str(goto_error):
                     print("[오류] 페이지 이동 중 Playwright 채널 오류가 발생했습니다. 브라우저를 재시작합니다.")
                     await self.reset_browser(headless=False)
-                    await self.page.goto(post_url, wait_until='networkidle', timeout=30000)
+                    await self._goto_post(post_url)
                     await self.random_delay(2, 3)
                     await self.page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                    await self.random_delay(1, 2)
                 else:
                     raise
-            await self.random_delay(2, 4)
+            # 스크롤 후 대기와 로드 대기를 한 번에 처리
+            await self.coalesced_delay((1, 2), (2, 4))
             
             # 페이지 로드 확인
             current_url = self.page.url
-            print(f"[댓글] 현재 페이지 URL: {current_url}")
+            log.debug(f"[디버깅] 현재 페이지 URL: {current_url}")
             
-            # 게시글 작성 시간 확인 (24시간 이내인지 체크)
-            print("[댓글] ========================================")
-            print("[댓글] 게시글 작성 시간 확인 중...")
-            print("[댓글] ========================================")
+            # 댓글 영역까지 스크롤하여 모든 댓글이 로드되도록 보장 (동시에 읽기 전에 한 번만)
             try:
-                # 현재 페이지에서 작성 시간 가져오기
-                post_date = await self.get_post_date_from_current_page()
+                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+                await self.random_delay(1, 2)
+            except Exception:
+                pass
+            
+            # 작성 시간, 제목, 본문, 기존 댓글은 서로 독립적이므로 동시에 읽기
+            print("[댓글] 작성 시간, 제목, 본문, 기존 댓글을 읽는 중...")
+            # 제목과 본문은 한 번의 evaluate로 함께 읽음
+            post_date, title_and_content, existing_comments = await asyncio.gather(
+                self.get_post_date_from_current_page(),
+                self.get_post_title_and_content(),
+                self.get_existing_comments(),
+                return_exceptions=True
+            )
+            if isinstance(title_and_content, Exception):
+                print(f"[경고] 게시글 제목/본문을 가져오는 중 오류: {title_and_content}")
+                post_title, post_content = "", ""
+            else:
+                post_title, post_content = title_and_content
+            if isinstance(existing_comments, Exception):
+                print(f"[경고] 기존 댓글을 가져오는 중 오류: {existing_comments}")
+                existing_comments = []
+            
+            # 게시글 작성 시간 확인 (24시간 이내인지 체크)
+            if isinstance(post_date, Exception):
+                print(f"[경고] 게시글 작성 시간 확인 중 오류: {post_date}\n"
+                      "[경고] 댓글을 작성합니다.")
+                self._last_post_date = None
+            else:
                 self._last_post_date = post_date
                 if post_date:
                     now = datetime.now()
@@ -3713,83 +3987,46 @@ class MacroBot:
                     print(f"[댓글] 게시글 작성 시간: {post_date.strftime('%Y-%m-%d %H:%M')} ({hours_ago:.1f}시간 전)")
                     
                     if hours_ago > 24:
-                        print(f"[건너뛰기] 게시글이 24시간을 초과했습니다. ({hours_ago:.1f}시간 전)")
-                        print(f"[댓글] 댓글 작성을 건너뜁니다.")
+                        print(f"[건너뛰기] 게시글이 24시간을 초과했습니다. ({hours_ago:.1f}시간 전)\n"
+                              f"[댓글] 댓글 작성을 건너뜁니다.")
                         return False
                     else:
                         print(f"[확인] 게시글이 24시간 이내입니다. ({hours_ago:.1f}시간 전) - 댓글 작성 진행")
                 else:
                     print("[경고] 게시글 작성 시간을 확인할 수 없습니다. 댓글을 작성합니다.")
-                    self._last_post_date = None
-            except Exception as e:
-                print(f"[경고] 게시글 작성 시간 확인 중 오류: {e}")
-                import traceback
-                traceback.print_exc()
-                print("[경고] 댓글을 작성합니다.")
-            
-            # 게시글 제목 가져오기
-            print("[댓글] ========================================")
-            print("[댓글] 게시글 제목을 읽는 중...")
-            print("[댓글] ========================================")
-            post_title = await self.get_post_title()
+            
             if post_title:
                 print(f"[댓글] ✅ 제목 읽기 성공: {post_title}")
             else:
                 print(f"[경고] 제목을 찾을 수 없습니다.")
             
-            # 게시글 본문 가져오기
-            print("[댓글] ========================================")
-            print("[댓글] 게시글 본문을 읽는 중...")
-            print("[댓글] ========================================")
-            post_content = await self.get_post_content()
-            
-            print("[댓글] ========================================")
-            print(f"[댓글] 본문 읽기 결과: 길이={len(post_content) if post_content else 0}자")
             if post_content and len(post_content.strip()) > 10:
-                print(f"[댓글] ✅ 본문 읽기 성공!")
-                print(f"[댓글] 본문 전체 내용 (처음 500자):")
-                print(f"  {post_content[:500]}")
-                print(f"[댓글] ========================================")
+                log.debug(f"[디버깅] 본문 전체 내용 (처음 500자):\n  {post_content[:500]}")
             else:
-                print(f"[경고] ⚠️⚠️⚠️ 본문이 비어있거나 너무 짧습니다!")
-                print(f"[경고] 본문 내용: '{post_content}'")
-                print(f"[경고] 본문 읽기 함수를 확인하세요!")
-                print(f"[경고] ========================================")
-            
-            # 기존 댓글들 가져오기
-            print("[댓글] ========================================")
-            print("[댓글] 기존 댓글들을 확인하는 중...")
-            print("[댓글] ========================================")
-            # 댓글 영역까지 스크롤하여 모든 댓글이 로드되도록 보장
-            try:
-                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                await self.random_delay(1, 2)
-            except Exception:
-                pass
+                print(f"[경고] ⚠️⚠️⚠️ 본문이 비어있거나 너무 짧습니다!\n"
+                      f"[경고] 본문 내용: '{post_content}'\n"
+                      f"[경고] 본문 읽기 함수를 확인하세요!\n"
+                      f"[경고] ========================================")
             
-            existing_comments = await self.get_existing_comments()
-            
-            print("[댓글] ========================================")
-            print(f"[댓글] 댓글 읽기 결과: {len(existing_comments) if existing_comments else 0}개 발견")
             if existing_comments and len(existing_comments) > 0:
                 print(f"[댓글] ✅ 기존 댓글 {len(existing_comments)}개 발견")
-                for i, comment in enumerate(existing_comments[:5], 1):
-                    print(f"  {i}. {comment[:100]}")
-                print(f"[댓글] ========================================")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("\n".join(f"  {i}. {comment[:100]}" for i, comment in enumerate(existing_comments[:5], 1)))
             else:
-                print(f"[경고] ⚠️⚠️⚠️ 기존 댓글이 없습니다!")
-                print(f"[경고] 댓글이 없는 게시글에는 댓글을 작성하지 않습니다.")
-                print(f"[경고] ========================================")
+                print(f"[경고] ⚠️⚠️⚠️ 기존 댓글이 없습니다!\n"
+                      f"[경고] 댓글이 없는 게시글에는 댓글을 작성하지 않습니다.\n"
+                      f"[경고] ========================================")
                 # 댓글이 없는 게시글은 댓글 작성하지 않음
-                # 재방문 방지를 위해 URL 저장
-                current_url = self.page.url
+                # 재방문 방지를 위해 URL 저장 (게시글 로드 후 확인한 URL 재사용)
                 self.save_commented_post(current_url)
                 print(f"[중복방지] 댓글이 없는 게시글을 기록했습니다: {current_url}")
                 return False
             
             if post_content and len(post_content.strip()) > 10:
-                print(f"[댓글] 본문 읽기 성공! (길이: {len(post_content)}자)")
-                print(f"[댓글] 본문 미리보기: {post_content[:100]}...")
+                print(f"[댓글] ✅ 본문 읽기 성공! (길이: {len(post_content)}자)")
+                
+                # 게시글 분석은 한 번만 계산 (AI 재시도에서 재사용)
+                self._prepare_prompt_context(post_title, post_content, existing_comments)
                 
                 # AI로 댓글 생성 (제목 + 본문 + 기존 댓글 고려)
                 print("[댓글] ⭐ AI 댓글 생성 시작...")
@@ -3797,9 +4034,9 @@ class MacroBot:
                 print(f"[댓글] AI 생성 댓글: {comment_text}")
                 
                 # 최종 확인: "감사" 단어가 있으면 기본 댓글 사용 (절대 안전장치)
-                if '감사' in comment_text:
-                    print(f"[경고] ⚠️⚠️⚠️ 최종 확인: '감사' 단어가 포함된 댓글 감지: {comment_text}")
-                    print(f"[경고] AI가 '감사' 단어를 사용했습니다. 기존 댓글 스타일로 댓글 생성")
+                if _FINAL_FORBIDDEN_RE.search(comment_text):
+                    print(f"[경고] ⚠️⚠️⚠️ 최종 확인: '감사' 단어가 포함된 댓글 감지: {comment_text}\n"
+                          f"[경고] AI가 '감사' 단어를 사용했습니다. 기존 댓글 스타일로 댓글 생성")
                     # 기존 댓글 스타일에 맞춰 댓글 생성
                     comment_text = self.generate_style_matched_comment(existing_comments, post_content)
             else:
@@ -3815,9 +4052,9 @@ class MacroBot:
             while not self.has_meaningful_content(comment_text) and clean_attempts < 3:
                 print(f"[경고] 내용이 부족한 댓글 감지: {comment_text}")
                 if clean_attempts == 0:
-                    comment_text = await self.generate_ai_comment_retry(post_content, existing_comments, 1)
+                    comment_text = await self.generate_ai_comment_retry(post_content, existing_comments, 1, post_title=post_title)
                 elif clean_attempts == 1:
-                    comment_text = await self.generate_ai_comment_retry(post_content, existing_comments, 2)
+                    comment_text = await self.generate_ai_comment_retry(post_content, existing_comments, 2, post_title=post_title)
                 else:
                     comment_text = self.generate_style_matched_comment(existing_comments or [], post_content or '')
                 clean_attempts += 1
@@ -3831,10 +4068,9 @@ class MacroBot:
             
             # 댓글이 본문/제목과 관련이 있는지 확인
             if not self.is_comment_relevant_to_post(comment_text, post_content, post_title):
-                print("[경고] ⚠️⚠️⚠️ 댓글이 게시글 제목/본문과 관련이 없거나 이해하지 못한 것으로 판단됩니다.")
-                print("[경고] 이 게시글에는 댓글을 작성하지 않고 건너뜁니다.")
+                print("[경고] ⚠️⚠️⚠️ 댓글이 게시글 제목/본문과 관련이 없거나 이해하지 못한 것으로 판단됩니다.\n"
+                      "[경고] 이 게시글에는 댓글을 작성하지 않고 건너뜁니다.")
                 # 이해할 수 없는 게시글도 기록하여 재방문 방지
-                current_url = self.page.url
                 self.save_commented_post(current_url)
                 print(f"[중복방지] 이해할 수 없는 게시글을 기록했습니다: {current_url}")
                 return False  # 댓글 작성하지 않고 건너뛰기
@@ -3902,37 +4138,13 @@ class MacroBot:
             
             # 댓글 입력 필드 찾기 - 여러 선택자 시도
             comment_input_selector = self.config.get('comment_input_selector', 'textarea[name="wr_content"]')
-            print(f"[댓글] 댓글 입력 필드 찾는 중: {comment_input_selector}")
+            log.debug(f"[디버깅] 댓글 입력 필드 찾는 중: {comment_input_selector}")
             
             # 여러 선택자 시도 (실제 사이트 구조에 맞게 우선순위 조정)
             possible_comment_selectors = [
-                # 실제 사이트의 정확한 선택자 (최우선)
-                'textarea[name="wr_content"]',
-                'textarea#wr_content',
-                'textarea.wr_content',
-                # 일반적인 댓글 필드 선택자
+                *_COMMENT_INPUT_SELECTORS[:3],
                 comment_input_selector,
-                'textarea[name="comment"]',
-                'textarea[id*="comment"]',
-                'textarea[id*="reply"]',
-                'textarea[name*="comment"]',
-                'textarea[name*="reply"]',
-                'textarea[name*="content"]',  # wr_content도 매칭됨
-                'textarea.comment',
-                'textarea#comment',
-                'textarea#reply',
-                'textarea[placeholder*="댓글"]',
-                'textarea[placeholder*="comment"]',
-                'textarea[placeholder*="reply"]',
-                # 폴백 선택자
-                'textarea',
-                'input[name="comment"]',
-                'input[id*="comment"]',
-                'input[type="text"][name*="comment"]',
-                'input[type="text"][id*="comment"]',
-                'div[contenteditable="true"]',  # contenteditable div
-                'div[contenteditable="true"][id*="comment"]',
-                'div[contenteditable="true"][class*="comment"]',
+                *_COMMENT_INPUT_SELECTORS[3:],
             ]
             
             found_comment_selector = None
@@ -3942,130 +4154,131 @@ class MacroBot:
             if self.main_page is None:
                 self.main_page = self.page
             
-            try:
-                # main_page가 있으면 그것을 사용, 없으면 현재 page 사용
-                page_to_check = self.main_page if self.main_page else self.page
-                frames = page_to_check.frames
-                print(f"[디버깅] 페이지에 {len(frames)}개의 frame이 있습니다.")
-                for i, frame in enumerate(frames):
+            # 이전 게시글에서 성공한 선택자가 있으면 먼저 시도
+            found_comment_selector = await self._try_learned_selector('_learned_comment_selector')
+            if found_comment_selector:
+                print(f"[댓글] 학습된 선택자로 댓글 입력 필드 찾음: {found_comment_selector}")
+            else:
+                try:
+                    # main_page가 있으면 그것을 사용, 없으면 현재 page 사용
+                    page_to_check = self.main_page if self.main_page else self.page
+                    frames = page_to_check.frames
+                    log.debug(f"[디버깅] 페이지에 {len(frames)}개의 frame이 있습니다.")
+                
+                    async def probe_frame(i, frame):
+                        # 처음 5개만 iframe에서 복합 선택자로 한 번에 시도
+                        selector = await self._wait_for_any_selector(
+                            possible_comment_selectors[:5], timeout=1000, page=frame
+                        )
+                        return i, frame, selector
+                
+                    # 모든 frame을 동시에 탐색하고 가장 먼저 찾은 frame 사용
+                    pending = {asyncio.create_task(probe_frame(i, frame)) for i, frame in enumerate(frames)}
                     try:
-                        for selector in possible_comment_selectors[:5]:  # 처음 5개만 iframe에서 시도
-                            try:
-                                await frame.wait_for_selector(selector, timeout=1000, state='visible')
-                                found_comment_selector = selector
-                                print(f"[댓글] 댓글 입력 필드를 iframe {i}에서 찾음: {selector}")
-                                # iframe에서 찾았으면 해당 frame 사용 (하지만 main_page는 유지)
-                                self.page = frame
-                                break
-                            except:
-                                continue
-                        if found_comment_selector:
-                            break
-                    except:
-                        continue
-            except:
-                pass
+                        while pending and not found_comment_selector:
+                            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                            for task in done:
+                                if task.exception() is not None:
+                                    continue
+                                i, frame, selector = task.result()
+                                if selector and not found_comment_selector:
+                                    found_comment_selector = selector
+                                    if frame is page_to_check.main_frame:
+                                        # frames에는 메인 frame도 들어 있으므로 메인 frame이면 원래 page를 그대로 사용 (선택자 학습 대상)
+                                        print(f"[댓글] 댓글 입력 필드를 메인 페이지에서 찾음: {selector}")
+                                        self.page = page_to_check
+                                    else:
+                                        print(f"[댓글] 댓글 입력 필드를 iframe {i}에서 찾음: {selector}")
+                                        # iframe에서 찾았으면 해당 frame 사용 (하지만 main_page는 유지)
+                                        self.page = frame
+                    finally:
+                        for task in pending:
+                            task.cancel()
+                except:
+                    pass
             
             # 메인 페이지에서 찾기
             if not found_comment_selector:
-                for selector in possible_comment_selectors:
-                    try:
-                        # visible 상태로 찾기 시도
-                        await self.page.wait_for_selector(selector, timeout=2000, state='visible')
-                        found_comment_selector = selector
-                        print(f"[댓글] 댓글 입력 필드 찾음: {selector}")
-                        break
-                    except:
+                # DOM에 일치하는 요소가 없는 선택자는 미리 제외
+                candidate_selectors = possible_comment_selectors
+                try:
+                    candidate_selectors = await self._filter_selectors_by_dom(possible_comment_selectors)
+                except Exception:
+                    pass
+                
+                # visible 상태로 모든 후보를 한 번에 찾기 시도
+                found_comment_selector = await self._wait_for_any_selector(candidate_selectors, timeout=2000)
+                if found_comment_selector:
+                    print(f"[댓글] 댓글 입력 필드 찾음: {found_comment_selector}")
+                else:
+                    # visible이 실패하면 attached 상태로 시도
+                    selector = await self._wait_for_any_selector(candidate_selectors, timeout=1000, state='attached')
+                    if selector:
                         try:
-                            # visible이 실패하면 attached 상태로 시도
-                            await self.page.wait_for_selector(selector, timeout=1000, state='attached')
                             # 요소가 숨겨져 있을 수 있으니 강제로 보이게 만들기
-                            element = await self.page.query_selector(selector)
-                            if element:
-                                await self.page.evaluate("""
-                                    (el) => {
-                                        el.style.display = 'block';
-                                        el.style.visibility = 'visible';
-                                        el.style.opacity = '1';
-                                    }
-                                """, element)
-                                found_comment_selector = selector
-                                print(f"[댓글] 댓글 입력 필드 찾음 (숨겨진 요소 활성화): {selector}")
-                                break
-                        except:
-                            continue
+                            await self.page.locator(selector).first.evaluate(
+                                "(el) => window.__kasino.forceVisible(el)", timeout=1000
+                            )
+                            found_comment_selector = selector
+                            print(f"[댓글] 댓글 입력 필드 찾음 (숨겨진 요소 활성화): {selector}")
+                        except Exception:
+                            pass
             
             if not found_comment_selector:
-                # 모든 선택자 실패 시 페이지 HTML 확인
-                print("[디버깅] 페이지의 모든 textarea 요소 확인 중...")
-                textareas = await self.page.query_selector_all('textarea')
-                print(f"[디버깅] 발견된 textarea 요소 수: {len(textareas)}")
-                for i, ta in enumerate(textareas[:10]):  # 처음 10개
-                    try:
-                        textarea_info = await ta.evaluate('el => ({type: el.type, name: el.name, id: el.id, class: el.className, placeholder: el.placeholder, visible: el.offsetParent !== null})')
-                        print(f"[디버깅] Textarea {i+1}: {textarea_info}")
-                    except:
-                        pass
-                
-                # input 요소도 확인
-                print("[디버깅] 페이지의 모든 input 요소 확인 중...")
-                inputs = await self.page.query_selector_all('input')
-                print(f"[디버깅] 발견된 input 요소 수: {len(inputs)}")
-                for i, inp in enumerate(inputs[:10]):  # 처음 10개
-                    try:
-                        input_info = await inp.evaluate('el => ({type: el.type, name: el.name, id: el.id, class: el.className, placeholder: el.placeholder, visible: el.offsetParent !== null})')
-                        print(f"[디버깅] Input {i+1}: {input_info}")
-                    except:
-                        pass
+                # 모든 선택자 실패 시 페이지의 textarea/input 요소를 한 번에 확인
+                log.debug("[디버깅] 페이지의 모든 textarea/input 요소 확인 중...")
+                await self._print_debug_elements({'Textarea': 'textarea', 'Input': 'input'})
                 
                 # 페이지 HTML 일부 저장
                 try:
-                    page_html = await self.page.content()
-                    # 댓글 관련 부분만 추출
-                    import re
-                    comment_section = re.search(r'(?i)(<form[^>]*>.*?</form>|<div[^>]*(?:comment|reply|댓글)[^>]*>.*?</div>)', page_html, re.DOTALL)
+                    page_html = await self._get_page_html()
+                    # 댓글 관련 부분만 추출 (form 태그는 문자열 검색으로 바로 자르기)
+                    comment_section = None
+                    lowered_html = page_html.lower()
+                    form_start = lowered_html.find('<form')
+                    if form_start != -1:
+                        form_end = lowered_html.find('</form>', form_start)
+                        if form_end != -1:
+                            comment_section = page_html[form_start:form_end + len('</form>')]
+                    if comment_section is None:
+                        match = _COMMENT_SECTION_RE.search(page_html)
+                        comment_section = match.group(0) if match else None
                     if comment_section:
                         with open('comment_section_debug.html', 'w', encoding='utf-8') as f:
-                            f.write(comment_section.group(0))
-                        print("[디버깅] 댓글 섹션 HTML 저장: comment_section_debug.html")
+                            f.write(comment_section)
+                        log.debug("[디버깅] 댓글 섹션 HTML 저장: comment_section_debug.html")
                     else:
                         # 전체 HTML 저장 (크기가 클 수 있음)
                         with open('page_debug.html', 'w', encoding='utf-8') as f:
                             f.write(page_html[:50000])  # 처음 50KB만
-                        print("[디버깅] 페이지 HTML 일부 저장: page_debug.html")
+                        log.debug("[디버깅] 페이지 HTML 일부 저장: page_debug.html")
                 except Exception as html_error:
-                    print(f"[디버깅] HTML 저장 실패: {html_error}")
+                    log.debug(f"[디버깅] HTML 저장 실패: {html_error}")
                 
                 # 스크린샷 저장
-                try:
-                    await self.page.screenshot(path='comment_field_debug.png', full_page=True)
-                    print("[디버깅] 스크린샷 저장: comment_field_debug.png")
-                except:
-                    pass
+                await self._save_debug_screenshot('comment_field_debug')
                 
                 raise Exception(f"댓글 입력 필드를 찾을 수 없습니다. 시도한 선택자: {possible_comment_selectors}")
             
             comment_input_selector = found_comment_selector
+            # 찾은 요소를 Locator로 잡아두고 이후 클릭/입력/확인에 재사용
+            comment_input = self.page.locator(comment_input_selector).first
             
             # 찾은 필드가 실제로 댓글 필드인지 확인 (wr_content 또는 comment 관련)
             try:
-                element_info = await self.page.evaluate(f"""
-                    (selector) => {{
-                        const el = document.querySelector(selector);
-                        if (!el) return null;
-                        return {{
-                            name: el.name,
-                            id: el.id,
-                            placeholder: el.placeholder,
-                            className: el.className,
-                            isVisible: el.offsetParent !== null,
-                            isInForm: el.closest('form') !== null
-                        }};
-                    }}
-                """, comment_input_selector)
+                element_info = await comment_input.evaluate("""
+                    (el) => ({
+                        name: el.name,
+                        id: el.id,
+                        placeholder: el.placeholder,
+                        className: el.className,
+                        isVisible: el.offsetParent !== null,
+                        isInForm: el.closest('form') !== null
+                    })
+                """, timeout=1000)
                 
                 if element_info:
-                    print(f"[댓글] 찾은 필드 정보: name={element_info.get('name')}, id={element_info.get('id')}")
+                    log.debug(f"[디버깅] 찾은 필드 정보: name={element_info.get('name')}, id={element_info.get('id')}")
                     # wr_content가 아니고 comment도 아닌 경우 경고
                     if 'wr_content' not in element_info.get('name', '') and 'wr_content' not in element_info.get('id', ''):
                         if 'comment' not in element_info.get('name', '').lower() and 'comment' not in element_info.get('id', '').lower():
@@ -4074,17 +4287,22 @@ class MacroBot:
                 pass
             
             # 댓글 입력 필드 클릭해서 포커스 주기
-            await self.page.click(comment_input_selector)
+            await comment_input.click()
             await self.random_delay(0.3, 0.5)
             
             # 댓글 입력
-            await self.page.fill(comment_input_selector, '')
-            await self.page.type(comment_input_selector, comment_text, delay=100)
+            if self.config.get('humanize_typing', False):
+                # 사람처럼 한 글자씩 입력 (느림)
+                await comment_input.fill('')
+                await comment_input.type(comment_text, delay=100)
+            else:
+                # 한 번에 입력하고 input/change 이벤트만 발생시키기
+                await comment_input.evaluate("(el, text) => window.__kasino.setValue(el, text)", comment_text)
             await self.random_delay(1, 2)
             
             # 입력 확인
             try:
-                input_value = await self.page.input_value(comment_input_selector)
+                input_value = await comment_input.input_value(timeout=1000)
                 if input_value and comment_text in input_value:
                     print(f"[댓글] 댓글 입력 확인 완료: '{input_value[:50]}...'")
                 else:
@@ -4094,54 +4312,27 @@ class MacroBot:
             
             # 댓글 작성 버튼 찾기 및 클릭 - 여러 선택자 시도
             submit_button_selector = self.config.get('submit_button_selector', '#btn_submit')
-            print(f"[댓글] 댓글 등록 버튼 찾는 중: {submit_button_selector}")
+            log.debug(f"[디버깅] 댓글 등록 버튼 찾는 중: {submit_button_selector}")
             
             # 여러 선택자 시도
-            possible_submit_selectors = [
-                submit_button_selector,
-                '#btn_submit',
-                'input#btn_submit',
-                'button#btn_submit',
-                'input.btn_submit',
-                'button.btn_submit',
-                'input[type="submit"]',
-                'button[type="submit"]',
-                'input[value*="등록"]',
-                'input[value*="댓글"]',
-                'button:has-text("등록")',
-                'button:has-text("댓글")',
-                'input[value="댓글등록"]',
-                'input[value="등록"]',
-                'button[value*="등록"]',
-                'a.btn_submit',
-                'a:has-text("등록")',
-            ]
+            possible_submit_selectors = [submit_button_selector, *_SUBMIT_BUTTON_SELECTORS]
             
             found_submit_selector = None
             submit_button = None
             
-            for selector in possible_submit_selectors:
-                try:
-                    await self.page.wait_for_selector(selector, timeout=2000, state='visible')
-                    submit_button = await self.page.query_selector(selector)
-                    if submit_button:
-                        found_submit_selector = selector
-                        print(f"[댓글] 댓글 등록 버튼 찾음: {selector}")
-                        break
-                except:
-                    continue
+            selector = await self._try_learned_selector('_learned_submit_selector')
+            if not selector:
+                selector = await self._wait_for_any_selector(possible_submit_selectors, timeout=2000)
+            if selector:
+                # 이미 찾은 선택자이므로 다시 조회하지 않고 Locator로 잡아둠
+                submit_button = self.page.locator(selector).first
+                found_submit_selector = selector
+                print(f"[댓글] 댓글 등록 버튼 찾음: {selector}")
             
             if not submit_button or not found_submit_selector:
                 # 모든 선택자 실패 시 페이지 HTML 확인
-                print("[디버깅] 페이지의 모든 버튼/input 요소 확인 중...")
-                buttons = await self.page.query_selector_all('button, input[type="submit"], input[type="button"]')
-                print(f"[디버깅] 발견된 버튼 요소 수: {len(buttons)}")
-                for i, btn in enumerate(buttons[:10]):  # 처음 10개만
-                    try:
-                        btn_info = await btn.evaluate('el => ({tag: el.tagName, type: el.type, id: el.id, name: el.name, value: el.value, class: el.className, text: el.textContent?.substring(0, 20)})')
-                        print(f"[디버깅] Button/Input {i+1}: {btn_info}")
-                    except:
-                        pass
+                log.debug("[디버깅] 페이지의 모든 버튼/input 요소 확인 중...")
+                await self._print_debug_elements({'Button/Input': 'button, input[type="submit"], input[type="button"]'})
                 raise RuntimeError(f"댓글 등록 버튼을 찾을 수 없습니다. 시도한 선택자: {possible_submit_selectors}")
             
             submit_button_selector = found_submit_selector
@@ -4152,113 +4343,72 @@ class MacroBot:
             
             # 현재 URL 저장 (제출 후 변경 확인용)
             url_before_submit = self.page.url
-            print(f"[댓글] 제출 전 URL: {url_before_submit}")
+            log.debug(f"[디버깅] 제출 전 URL: {url_before_submit}")
             
             # 폼 제출 방법 1: 버튼 클릭
-            print("[댓글] 등록 버튼 클릭 시도...")
+            log.debug("[디버깅] 등록 버튼 클릭 시도...")
             try:
-                # 버튼이 disabled 상태인지 확인하고 해제
-                is_disabled = await self.page.evaluate("""(selector) => {
-                    const btn = document.querySelector(selector);
-                    return btn ? btn.disabled : false;
-                }""", submit_button_selector)
+                # 버튼이 disabled 상태인지 확인하고 한 번의 호출로 바로 해제
+                was_disabled = await submit_button.evaluate("(btn) => window.__kasino.enableButton(btn)")
                 
-                if is_disabled:
-                    print("[댓글] 버튼이 disabled 상태입니다. 해제 중...")
-                    await self.page.evaluate("""(selector) => {
-                        const btn = document.querySelector(selector);
-                        if (btn) btn.disabled = false;
-                    }""", submit_button_selector)
+                if was_disabled:
+                    print("[댓글] 버튼이 disabled 상태여서 해제했습니다.")
                 
                 # 버튼 클릭
                 await submit_button.click(timeout=5000)
-                print("[댓글] 버튼 클릭 완료")
+                log.debug("[디버깅] 버튼 클릭 완료")
             except Exception as click_error:
-                print(f"[경고] 버튼 클릭 실패: {click_error}")
-                print("[댓글] JavaScript로 폼 제출 시도...")
+                print(f"[경고] 버튼 클릭 실패: {click_error}\n"
+                      "[댓글] JavaScript로 폼 제출 시도...")
                 
                 # 폼 제출 방법 2: JavaScript로 직접 제출
-                await self.page.evaluate("""(selector) => {
-                    const btn = document.querySelector(selector);
-                    if (btn) {
-                        // disabled 해제
-                        btn.disabled = false;
-                        // 폼 찾기
-                        const form = btn.closest('form');
-                        if (form) {
-                            // 폼 제출
-                            form.submit();
-                        } else if (btn.type === 'submit') {
-                            // 버튼이 form 안에 없으면 클릭 이벤트 발생
-                            btn.click();
-                        }
-                    }
-                }""", submit_button_selector)
-                print("[댓글] JavaScript 폼 제출 완료")
+                status = await submit_button.evaluate("(btn) => window.__kasino.forceSubmit(btn)")
+                print(f"[댓글] JavaScript 폼 제출 완료 ({status})")
             
-            # 폼 제출 후 대기 (페이지 변경 또는 댓글 등록 확인)
-            print("[댓글] 댓글 등록 대기 중...")
-            await self.random_delay(2, 3)
-            
-            # 댓글 등록 확인: 입력 필드가 비워졌는지 확인
-            try:
-                input_value = await self.page.input_value(comment_input_selector)
-                if input_value and input_value.strip() != '':
-                    print(f"[경고] 입력 필드가 아직 비워지지 않았습니다: '{input_value}'")
-                    # 추가 대기
-                    await self.random_delay(1, 2)
-                    input_value = await self.page.input_value(comment_input_selector)
-                    if input_value and input_value.strip() != '':
-                        print("[경고] 댓글 등록이 완료되지 않은 것 같습니다. 폼을 다시 제출합니다.")
-                        # 폼 강제 제출
-                        await self.page.evaluate("""(selector) => {
-                            const input = document.querySelector(selector);
-                            if (input) {
-                                const form = input.closest('form');
-                                if (form) form.submit();
-                            }
-                        }""", comment_input_selector)
-                        await self.random_delay(2, 3)
-                else:
-                    print("[댓글] ✅ 입력 필드가 비워졌습니다. 댓글 등록 성공으로 추정.")
-            except Exception as check_error:
-                print(f"[경고] 입력 필드 확인 중 오류: {check_error}")
+            # 폼 제출 후 입력 필드가 비워질 때까지 짧은 간격으로 확인 (성공하면 바로 진행)
+            log.debug("[디버깅] 댓글 등록 대기 중...")
+            submit_state = await self._wait_submit_done(comment_input, url_before_submit, comment_text)
+            comment_registered = submit_state == 'done'
+            if comment_registered:
+                print("[댓글] ✅ 입력 필드가 비워졌습니다. 댓글 등록 성공으로 추정.")
+            elif submit_state == 'filled':
+                # 입력 필드에 작성한 댓글이 그대로 남아 있을 때만 다시 제출 (중복 등록 방지)
+                print("[경고] 댓글 등록이 완료되지 않은 것 같습니다. 폼을 다시 제출합니다.")
+                try:
+                    # 폼 강제 제출
+                    await comment_input.evaluate("(input) => window.__kasino.submitForm(input)", timeout=1000)
+                    submit_state = await self._wait_submit_done(comment_input, url_before_submit, comment_text, deadline=4.0)
+                    comment_registered = submit_state == 'done'
+                except Exception as check_error:
+                    print(f"[경고] 폼 재제출 중 오류: {check_error}")
+            else:
+                # 필드 상태를 알 수 없으면 다시 제출하지 않고 아래에서 댓글 목록으로 확인
+                log.debug("[디버깅] 입력 필드 상태를 확인할 수 없어 재제출하지 않습니다.")
             
             # 페이지 URL 변경 확인
             url_after_submit = self.page.url
             if url_after_submit != url_before_submit:
-                print(f"[댓글] ✅ 페이지 URL이 변경되었습니다: {url_after_submit}")
-                print("[댓글] 댓글 등록 성공으로 추정.")
+                print(f"[댓글] ✅ 페이지 URL이 변경되었습니다: {url_after_submit}\n"
+                      "[댓글] 댓글 등록 성공으로 추정.")
             else:
-                print(f"[댓글] 페이지 URL 변경 없음 (현재: {url_after_submit})")
-            
-            # 추가 대기 (서버 처리 시간)
-            await self.random_delay(2, 3)
+                log.debug(f"[디버깅] 페이지 URL 변경 없음 (현재: {url_after_submit})")
             
             # 댓글 등록 최종 확인
-            print("[댓글] 댓글 등록 최종 확인 중...")
-            comment_registered = False
-            
-            # 방법 1: 입력 필드가 비워졌는지 확인
-            try:
-                input_value = await self.page.input_value(comment_input_selector)
-                if not input_value or input_value.strip() == '':
-                    comment_registered = True
-                    print("[댓글] ✅ 입력 필드가 비워졌습니다.")
-            except Exception:
-                pass
+            log.debug("[디버깅] 댓글 등록 최종 확인 중...")
             
-            # 방법 2: 새 댓글이 목록에 추가되었는지 확인
+            # 입력 필드로 확인하지 못했으면 새 댓글이 목록에 추가되었는지 확인
             if not comment_registered:
                 try:
-                    comments_after = await self.get_existing_comments()
-                    if comments_after:
-                        # 댓글 개수 증가 확인
-                        if len(comments_after) > len(existing_comments or []):
-                            comment_registered = True
-                            print(f"[댓글] ✅ 새 댓글이 추가되었습니다! (이전: {len(existing_comments or [])}개, 현재: {len(comments_after)}개)")
+                    # 댓글 개수 증가 확인 (목록을 가져오지 않고 개수만 비교)
+                    count_before = len(existing_comments or [])
+                    count_after = await self.get_existing_comments(count_only=True)
+                    if count_after > count_before:
+                        comment_registered = True
+                        print(f"[댓글] ✅ 새 댓글이 추가되었습니다! (이전: {count_before}개, 현재: {count_after}개)")
+                    else:
                         # 작성한 댓글 내용이 목록에 있는지 확인
-                        elif comment_text in str(comments_after):
+                        comments_after = await self.get_existing_comments()
+                        if any(comment_text in c for c in comments_after):
                             comment_registered = True
                             print("[댓글] ✅ 작성한 댓글이 목록에 있습니다!")
                 except Exception:
@@ -4267,13 +4417,18 @@ class MacroBot:
             if comment_registered:
                 print(f"[댓글] ✅ 댓글 등록 성공: {comment_text}")
             else:
-                print(f"[경고] ⚠️ 댓글 등록 확인 실패")
-                print("[경고] 하지만 계속 진행합니다. (다음 게시글에서 다시 시도 가능)")
+                print(f"[경고] ⚠️ 댓글 등록 확인 실패\n"
+                      "[경고] 하지만 계속 진행합니다. (다음 게시글에서 다시 시도 가능)")
             
             # 추가 안전 대기
-            await self.random_delay(1, 2)
+            await self.random_delay(0.5, 1)
+            
+            log.debug(f"[디버깅] 댓글 작성 프로세스 완료: {comment_text}")
             
-            print(f"[댓글] 댓글 작성 프로세스 완료: {comment_text}")
+            # 메인 페이지에서 성공한 선택자는 다음 게시글에서 먼저 시도하도록 기억
+            if not self.main_page or self.page == self.main_page:
+                self._learned_comment_selector = comment_input_selector
+                self._learned_submit_selector = submit_button_selector
             
             # Frame을 사용했다면 원본 page로 복원
             if self.main_page and self.page != self.main_page:
@@ -4288,10 +4443,63 @@ class MacroBot:
             return True
             
         except Exception as e:
-            print(f"[오류] 댓글 작성 실패 ({post_url}): {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"[오류] 댓글 작성 실패 ({post_url}): {e}")
             return False
+        finally:
+            # 누적 대기 상한은 이 댓글 작성에만 적용
+            self._delay_spent = None
+    
+    async def _wait_submit_done(self, comment_input, url_before: str, comment_text: str, deadline: float = 6.0) -> str:
+        """제출 후 입력 필드가 비워질 때까지 점점 늘어나는 간격으로 확인 (최대 deadline초)
+        
+        반환값: 'done' (비워짐/페이지 이동), 'filled' (아직 작성한 댓글이 남아 있음), 'unknown' (필드를 읽을 수 없음)
+        """
+        start = time.monotonic()
+        interval = 0.2
+        state = 'unknown'
+        while time.monotonic() - start < deadline:
+            try:
+                # contenteditable 필드는 value가 없으므로 textContent로 확인
+                value = await comment_input.evaluate(
+                    "(el) => el.isContentEditable ? el.textContent : el.value", timeout=1000
+                )
+                if not value or not value.strip():
+                    return 'done'
+                state = 'filled' if comment_text.strip() in value else 'unknown'
+            except Exception:
+                # 제출로 페이지가 이동해 필드가 사라진 경우는 등록된 것으로 봄
+                try:
+                    if self.page.url != url_before:
+                        return 'done'
+                except Exception:
+                    pass
+                state = 'unknown'
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, 1.0)
+        return state
+    
+    async def _goto_board(self, page, url: str):
+        """게시판 목록으로 이동 (networkidle 대신 DOM 로드 후 게시글 링크가 생길 때까지만 대기)"""
+        await page.goto(url, wait_until='domcontentloaded', timeout=15000)
+        try:
+            await page.wait_for_selector(
+                self.config.get('post_link_selector', 'a.post-link'), timeout=5000, state='attached'
+            )
+        except Exception:
+            # 선택자가 사이트와 맞지 않아도 목록 수집 단계에서 다른 방법으로 찾으므로 계속 진행
+            pass
+    
+    async def _goto_post(self, post_url: str):
+        """게시글로 이동 (networkidle 대신 DOM 로드 후 본문 요소가 생길 때까지만 대기)"""
+        await self.page.goto(post_url, wait_until='domcontentloaded', timeout=30000)
+        try:
+            await self.page.wait_for_selector(
+                self.config.get('post_content_selector') or ', '.join(_POST_CONTENT_SELECTORS),
+                timeout=8000, state='attached'
+            )
+        except Exception:
+            # 본문 선택자가 맞지 않아도 get_post_content가 body로 대체하므로 계속 진행
+            pass
     
     async def go_back_to_board(self):
         """게시판으로 돌아가기"""
@@ -4321,7 +4529,7 @@ class MacroBot:
                 # main_page가 있으면 그것을 사용, 없으면 현재 page 사용
                 page_to_use = self.main_page if self.main_page else self.page
                 if page_to_use and hasattr(page_to_use, 'goto'):
-                    await page_to_use.goto(board_url, wait_until='networkidle', timeout=30000)
+                    await self._goto_board(page_to_use, board_url)
                     self.page = page_to_use  # 원본 page로 복원
                     await self.random_delay(2, 3)
                     print(f"[게시판] 게시판 복귀 완료: {self.page.url}")
@@ -4330,20 +4538,51 @@ class MacroBot:
             else:
                 print("[경고] 페이지가 이미 닫혔습니다.")
         except Exception as e:
-            print(f"[경고] 게시판으로 돌아가는 중 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"[경고] 게시판으로 돌아가는 중 오류: {e}")
     
-    async def random_delay(self, min_sec: float = None, max_sec: float = None):
-        """랜덤 대기 시간"""
-        min_sec = min_sec if min_sec is not None else self.config.get('delay_min', 1)
-        max_sec = max_sec if max_sec is not None else self.config.get('delay_max', 3)
+    def _delay_bounds(self, min_sec: float = None, max_sec: float = None) -> tuple:
+        """랜덤 대기 범위를 설정 기본값과 최대 대기 제한에 맞게 보정"""
+        if self._zero_delay:
+            return 0.0, 0.0
+        min_sec = min_sec if min_sec is not None else self._delay_min
+        max_sec = max_sec if max_sec is not None else self._delay_max
         min_sec = max(1, min(min_sec, self.max_delay_seconds))
         max_sec = max(1, min(max_sec, self.max_delay_seconds))
         if min_sec >= max_sec:
             max_sec = min(self.max_delay_seconds, min_sec + 1)
-        delay = random.uniform(min_sec, max_sec)
-        print(f"[대기] {delay:.2f}초 대기 (무작위)")
+        return min_sec, max_sec
+    
+    def _spend_delay(self, delay: float) -> float:
+        """댓글 1개당 누적 대기 상한에 맞게 대기 시간을 줄이고 누적값에 반영"""
+        if self._delay_spent is None:
+            return delay
+        budget = self.max_comment_delay_seconds
+        if budget > 0:
+            delay = min(delay, max(0.0, budget - self._delay_spent))
+        self._delay_spent += delay
+        return delay
+    
+    async def random_delay(self, min_sec: float = None, max_sec: float = None):
+        """랜덤 대기 시간"""
+        min_sec, max_sec = self._delay_bounds(min_sec, max_sec)
+        if max_sec <= 0.001:
+            return
+        delay = self._spend_delay(random.uniform(min_sec, max_sec))
+        if delay <= 0.001:
+            return
+        if self._verbose:
+            print(f"[대기] {delay:.2f}초 대기 (무작위)")
+        await asyncio.sleep(delay)
+    
+    async def coalesced_delay(self, *ranges):
+        """연속된 여러 랜덤 대기를 합쳐 한 번만 대기 (범위마다 random_delay와 같은 보정 적용)"""
+        uniform = random.uniform
+        bounds = self._delay_bounds
+        delay = self._spend_delay(sum(uniform(*bounds(min_sec, max_sec)) for min_sec, max_sec in ranges))
+        if delay <= 0.001:
+            return
+        if self._verbose:
+            print(f"[대기] {delay:.2f}초 대기 (무작위)")
         await asyncio.sleep(delay)
     
     async def run(self, headless: bool = False):
@@ -4363,10 +4602,15 @@ class MacroBot:
             await self.navigate_to_board_page(self.current_page)
             
             # 처리한 게시글 URL 추적
-            processed_urls = set(self.commented_posts)  # 이번 실행에서 처리한 게시글 추적
+            # 처리한 게시글은 save_commented_post가 같은 set에 추가하므로 복사하지 않고 공유
+            processed_urls = self.commented_posts
             success_count = 0
             max_posts = self.config.get('max_posts', 10)
             max_board_pages = max(1, self.config.get('max_board_pages', 1))
+            # 반복문 안에서 매번 조회하지 않도록 미리 읽어둠
+            board_url = self.config['board_url']
+            post_delay_min = self.config.get('delay_min', 3)
+            post_delay_max = self.config.get('delay_max', 6)
             # 안전장치: 모든 페이지를 여러 번 순회했는데도 댓글을 달 수 없으면 종료
             max_attempts = max_posts * max_board_pages * 5
             attempts = 0
@@ -4387,10 +4631,11 @@ class MacroBot:
                     continue
                 
                 # 게시글에 댓글 작성
+                current_url = self.page.url
                 print(f"[진행] ========================================")
                 print(f"[진행] 게시글 댓글 작성 시도: {post_url}")
-                print(f"[진행] 현재 URL 확인: {self.page.url}")
-                print(f"[진행] 게시판 페이지인지 확인: {'게시판' if self.config['board_url'] in self.page.url else '게시판 아님'}")
+                print(f"[진행] 현재 URL 확인: {current_url}")
+                print(f"[진행] 게시판 페이지인지 확인: {'게시판' if self._is_board_url(current_url) else '게시판 아님'}")
                 print(f"[진행] ========================================")
                 
                 # 댓글 작성 함수 호출
@@ -4400,7 +4645,6 @@ class MacroBot:
                 
                 if comment_result:
                     success_count += 1
-                    processed_urls.add(post_url)
                     print(f"[성공] 댓글 작성 완료! (성공: {success_count}/{max_posts})")
                 else:
                     print(f"[경고] 댓글 작성에 실패했습니다. 다음 게시글을 시도합니다. (실패한 URL: {post_url})")
@@ -4408,20 +4652,18 @@ class MacroBot:
                 # 댓글 작성 후 반드시 게시판으로 돌아가기
                 print(f"[게시판] 댓글 작성 후 게시판 복귀 전 URL: {self.page.url}")
                 await self.go_back_to_board()
-                print(f"[게시판] 게시판 복귀 후 URL: {self.page.url}")
+                current_url = self.page.url
+                print(f"[게시판] 게시판 복귀 후 URL: {current_url}")
                 
                 # 게시판 복귀 확인
-                if self.config['board_url'] not in self.page.url:
+                if not self._is_board_url(current_url):
                     print(f"[경고] 게시판 복귀 실패! 강제로 게시판으로 이동합니다.")
-                    await self.page.goto(self.config['board_url'], wait_until='networkidle')
+                    await self._goto_board(self.page, board_url)
                     await self.random_delay(2, 4)
                 
                 # 다음 게시글 전 대기
                 if success_count < max_posts:
-                    await self.random_delay(
-                        self.config.get('delay_min', 3),
-                        self.config.get('delay_max', 6)
-                    )
+                    await self.random_delay(post_delay_min, post_delay_max)
             
             if attempts >= max_attempts and success_count < max_posts:
                 print("[경고] 여러 페이지를 순환했지만 게시글을 충분히 처리하지 못했습니다. 새 게시글이 올라오면 다시 실행해주세요.")
@@ -4431,20 +4673,41 @@ class MacroBot:
         except Exception as e:
             print(f"[오류] 실행 중 오류 발생: {e}")
         finally:
+            await self.close()
+            if self.context and not self.browser:
+                # 프로필 사용 시에는 컨텍스트를 닫아야 브라우저가 종료되고 프로필이 저장됨
+                await self.context.close()
             if self.browser:
                 await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
 
 
+def _env_number(env, key: str, default, cast=int):
+    """숫자 환경 변수를 한 번만 변환 (잘못된 값이면 경고 후 기본값, 음수는 0으로 보정)"""
+    raw = env.get(key)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = cast(raw.strip())
+    except ValueError:
+        print(f"[경고] {key} 값이 숫자가 아닙니다: '{raw}' → 기본값 {default} 사용")
+        return default
+    return max(value, 0)
+
+
+@lru_cache(maxsize=1)
 def load_config():
-    """환경 변수에서 설정 로드"""
-    return {
-        'url': os.getenv('SITE_URL', 'https://example.com'),
-        'login_url': os.getenv('LOGIN_URL', 'https://example.com/login'),
-        'username': os.getenv('LOGIN_USERNAME', ''),
-        'password': os.getenv('PASSWORD', ''),
-        'board_url': os.getenv('BOARD_URL', 'https://example.com/board'),
+    """환경 변수에서 설정 로드 (한 번만 만들고 재사용, 환경 변수를 바꾼 뒤 다시 읽으려면 load_config.cache_clear() 호출)"""
+    # os.environ 매핑을 한 번만 참조해서 모든 키를 조회
+    env = os.environ
+    # 캐시된 설정을 실수로 바꾸지 않도록 읽기 전용 매핑으로 반환
+    return MappingProxyType({
+        'url': env.get('SITE_URL', 'https://example.com'),
+        'login_url': env.get('LOGIN_URL', 'https://example.com/login'),
+        'username': env.get('LOGIN_USERNAME', ''),
+        'password': env.get('PASSWORD', ''),
+        'board_url': env.get('BOARD_URL', 'https://example.com/board'),
         'comment_texts': [
             '좋아요!',
             '응원해요!',
@@ -4452,26 +4715,42 @@ def load_config():
             '힘내세요!',
             '좋아요~',
         ],
-        'delay_min': float(os.getenv('DELAY_MIN', '1')),
-        'delay_max': float(os.getenv('DELAY_MAX', '10')),
-        'max_posts': int(os.getenv('MAX_POSTS', '10')),
-        'max_board_pages': int(os.getenv('MAX_BOARD_PAGES', '3')),
-        'comment_gap_min': int(os.getenv('COMMENT_GAP_MIN', '1')),
-        'comment_gap_max': int(os.getenv('COMMENT_GAP_MAX', '10')),
-        'min_repeat_interval_sec': int(os.getenv('MIN_REPEAT_INTERVAL_SEC', '900')),
+        'delay_min': _env_number(env, 'DELAY_MIN', 1.0, float),
+        'delay_max': _env_number(env, 'DELAY_MAX', 10.0, float),
+        'max_posts': _env_number(env, 'MAX_POSTS', 10),
+        'max_board_pages': _env_number(env, 'MAX_BOARD_PAGES', 3),
+        'comment_gap_min': _env_number(env, 'COMMENT_GAP_MIN', 1),
+        'comment_gap_max': _env_number(env, 'COMMENT_GAP_MAX', 10),
+        'min_repeat_interval_sec': _env_number(env, 'MIN_REPEAT_INTERVAL_SEC', 900),
+        # 로그 수준: DEBUG면 대기/디버깅 로그까지 모두 출력, INFO 이상이면 생략
+        'log_level': env.get('LOG_LEVEL', 'DEBUG'),
+        # 댓글 1개당 누적 랜덤 대기 상한(초). 0이면 제한 없음
+        'max_comment_delay': _env_number(env, 'MAX_COMMENT_DELAY', 0.0, float),
+        # 이미지/폰트/광고 스크립트 차단 여부 (false면 모든 리소스를 받음)
+        'block_resources': env.get('BLOCK_RESOURCES', 'true').strip().lower() in ('1', 'true', 'yes'),
+        # Playwright 동작 사이 지연(ms). 디버깅할 때만 설정 (예: 500), 기본은 지연 없음
+        'slow_mo': _env_number(env, 'SLOW_MO', 0),
+        # 로그인 상태 저장 파일 (지정하면 로그인 후 쿠키를 저장하고 다음 실행 때 불러옴, 비우면 사용 안 함)
+        'storage_state_file': env.get('STORAGE_STATE_FILE', ''),
+        # 브라우저 프로필 폴더 (지정하면 로그인 상태를 저장해서 다음 실행 때 로그인 생략, 비우면 사용 안 함)
+        'browser_profile_dir': env.get('BROWSER_PROFILE_DIR', ''),
+        # 댓글을 한 글자씩 입력할지 여부 (true면 사람처럼 입력, 기본은 한 번에 입력)
+        'humanize_typing': env.get('HUMANIZE_TYPING', 'false').strip().lower() in ('1', 'true', 'yes'),
         # 게시글 처리 순서: 'latest' (최신순), 'oldest' (오래된순), 또는 'random' (랜덤)
-        'post_order': os.getenv('POST_ORDER', 'random'),
+        'post_order': env.get('POST_ORDER', 'random'),
         # OpenAI API 키 (선택사항, 없으면 기본 댓글 사용)
-        'openai_api_key': os.getenv('OPENAI_API_KEY', ''),
+        'openai_api_key': env.get('OPENAI_API_KEY', ''),
+        # 재시도 댓글 생성에 사용할 OpenAI 모델 (첫 요청 모델은 그대로 유지)
+        'retry_model': env.get('RETRY_MODEL', '').strip() or 'gpt-4o-mini',
         # Gemini API 키 제거됨 - OpenAI만 사용
         # CSS 선택자들 (실제 사이트에 맞게 수정 필요)
-        'username_selector': os.getenv('USERNAME_SELECTOR', 'input[name="username"]'),
-        'password_selector': os.getenv('PASSWORD_SELECTOR', 'input[name="password"]'),
-        'login_button_selector': os.getenv('LOGIN_BUTTON_SELECTOR', 'button[type="submit"]'),
-        'post_link_selector': os.getenv('POST_LINK_SELECTOR', 'a.post-link'),
-        'comment_input_selector': os.getenv('COMMENT_INPUT_SELECTOR', 'textarea[name="comment"]'),
-        'submit_button_selector': os.getenv('SUBMIT_BUTTON_SELECTOR', 'input#btn_submit, #btn_submit, input.btn_submit, button.btn_submit, button[type="submit"], input[type="submit"]'),
-    }
+        'username_selector': env.get('USERNAME_SELECTOR', 'input[name="username"]'),
+        'password_selector': env.get('PASSWORD_SELECTOR', 'input[name="password"]'),
+        'login_button_selector': env.get('LOGIN_BUTTON_SELECTOR', 'button[type="submit"]'),
+        'post_link_selector': env.get('POST_LINK_SELECTOR', 'a.post-link'),
+        'comment_input_selector': env.get('COMMENT_INPUT_SELECTOR', 'textarea[name="comment"]'),
+        'submit_button_selector': env.get('SUBMIT_BUTTON_SELECTOR', _DEFAULT_SUBMIT_BUTTON_SELECTOR),
+    })
 
 
 async def main():
@@ -4508,6 +4787,15 @@ async def main():
     
     config = load_config()
     
+    # 로그 설정 (LOG_LEVEL이 DEBUG가 아니면 [디버깅] 로그는 출력하지 않음, print와 순서가 섞이지 않도록 stdout 사용)
+    # 이 모듈의 로거만 설정 (루트 로거를 DEBUG로 두면 asyncio/aiohttp/openai 등 라이브러리 로그까지 모두 출력됨)
+    log.setLevel(getattr(logging, str(config.get('log_level', 'DEBUG')).upper(), logging.DEBUG))
+    if not log.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+    log.propagate = False
+    
     # 설정 검증
     if not config['username'] or not config['password']:
         print("[오류] LOGIN_USERNAME과 PASSWORD를 .env 파일에 설정해주세요.")
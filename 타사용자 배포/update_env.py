@@ -1,7 +1,6 @@
 """
 .env 파일의 MAX_POSTS와 OPENAI_API_KEY를 업데이트하는 스크립트
 """
-import re
 import os
 
 def update_env_file():
@@ -11,29 +10,40 @@ def update_env_file():
         print(f"[오류] {env_file} 파일을 찾을 수 없습니다.")
         return False
     
-    # 파일 읽기
-    with open(env_file, 'r', encoding='utf-8') as f:
+    # 파일 읽기 (바이트 그대로 다루므로 인코딩 변환 없이 기존 줄바꿈 형식도 유지)
+    with open(env_file, 'rb') as f:
         content = f.read()
+    newline = b'\r\n' if b'\r\n' in content else b'\n'
     
-    # MAX_POSTS 업데이트
-    if re.search(r'^MAX_POSTS=', content, re.MULTILINE):
-        content = re.sub(r'^MAX_POSTS=.*', 'MAX_POSTS=8400', content, flags=re.MULTILINE)
-    else:
-        # MAX_POSTS가 없으면 추가
-        content += '\nMAX_POSTS=8400\n'
+    # 줄 단위로 한 번만 훑으면서 MAX_POSTS와 OPENAI_API_KEY 줄 처리 (.env는 한 줄에 KEY=VALUE 하나)
+    found = set()
+    lines = content.split(b'\n')
+    for i, line in enumerate(lines):
+        if line.startswith(b'MAX_POSTS='):
+            found.add('MAX_POSTS')
+            lines[i] = b'MAX_POSTS=8400\r' if line.endswith(b'\r') else b'MAX_POSTS=8400'
+        elif line.startswith(b'OPENAI_API_KEY='):
+            # 실제 API 키는 사용자가 직접 입력해야 하므로 기존 값 유지
+            found.add('OPENAI_API_KEY')
     
-    # OPENAI_API_KEY 업데이트 (env.example에서 기본값 가져오기)
-    # 실제 API 키는 사용자가 직접 입력해야 함
-    if re.search(r'^OPENAI_API_KEY=', content, re.MULTILINE):
-        # 기존 키가 있으면 유지, 없으면 플레이스홀더 추가
-        pass
-    else:
-        # OPENAI_API_KEY가 없으면 플레이스홀더 추가
-        content += '\nOPENAI_API_KEY=INPUT_YOUR_OPENAI_API_KEY_HERE\n'
+    # 없는 키는 끝에 추가 (OPENAI_API_KEY는 플레이스홀더로)
+    parts = [b'\n'.join(lines)]
+    if 'MAX_POSTS' not in found:
+        parts += [newline, b'MAX_POSTS=8400', newline]
+    if 'OPENAI_API_KEY' not in found:
+        parts += [newline, b'OPENAI_API_KEY=INPUT_YOUR_OPENAI_API_KEY_HERE', newline]
+    new_content = b''.join(parts)
     
-    # 파일 쓰기
-    with open(env_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # 이미 최신 상태면 파일을 다시 쓰지 않음
+    if new_content == content:
+        print("이미 최신 상태입니다. (MAX_POSTS=8400, OPENAI_API_KEY 있음)")
+        return True
+    
+    # 파일 쓰기 (임시 파일에 한 번에 쓴 뒤 교체해서, 중간에 종료되어도 기존 .env가 깨지지 않음)
+    tmp_file = env_file + '.tmp'
+    with open(tmp_file, 'wb', buffering=1 << 16) as f:
+        f.write(new_content)
+    os.replace(tmp_file, env_file)
     
     print("업데이트 완료!")
     print("- MAX_POSTS=8400")